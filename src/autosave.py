@@ -0,0 +1,106 @@
+"""Background autosave that keeps disk I/O out of the REPL loop."""
+
+import pickle
+import queue
+import threading
+import time
+
+AUTOSAVE_CHANGES = 50
+AUTOSAVE_INTERVAL = 5.0
+
+_STOP = object()
+
+
+class AutoSaver:
+    """
+    Wraps a journaled storage and writes changes from a background thread.
+
+    write() only copies the changed records and queues them. The worker
+    writes them to the storage once max_changes changes are pending or
+    interval seconds have passed since the first pending change.
+    """
+
+    # The book is kept in memory, changes can wait until the next save
+    write_through = False
+
+    def __init__(self, storage, max_changes=AUTOSAVE_CHANGES, interval=AUTOSAVE_INTERVAL):
+        self.storage = storage
+        self.max_changes = max_changes
+        self.interval = interval
+        self.error = None
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def load(self):
+        return self.storage.load()
+
+    def save(self, book):
+        self.flush()
+        self.storage.save(book)
+
+    def write(self, changes: dict):
+        """Queue changed contacts (name -> Record, or None if the contact was deleted)."""
+        if not changes:
+            return
+        # The REPL keeps changing the records, so the worker gets frozen copies
+        frozen = {
+            name: pickle.loads(pickle.dumps(record)) if record is not None else None
+            for name, record in changes.items()
+        }
+        self._queue.put(frozen)
+
+    def flush(self):
+        """Block until everything queued so far is written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write what is still pending and stop, raising the last write error if it failed."""
+        self._queue.put(_STOP)
+        self._worker.join()
+        self.storage.close()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        pending = {}
+        mutations = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, dict):
+                pending.update(item)
+                mutations += len(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.interval
+                if mutations < self.max_changes:
+                    continue
+
+            if pending and self._write(pending):
+                pending = {}
+                mutations = 0
+                deadline = None
+            elif pending:
+                # Retry on the next tick instead of spinning on a failing disk
+                deadline = time.monotonic() + self.interval
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, changes):
+        try:
+            self.storage.write(changes)
+        except OSError as e:
+            self.error = e
+            return False
+        self.error = None
+        return True
@@ -0,0 +1,54 @@
+"""
+Compare substring search by a full scan with the trigram indexes of find name / find address.
+
+Run from the src directory:
+    python -m benchmarks.find_benchmark
+"""
+
+import time
+
+from classes.address_book import AddressBook
+from classes.record import Record
+
+BOOK_SIZES = (10_000, 100_000)
+CITIES = ("London", "Kyiv", "Lviv", "Paris", "Berlin", "Warsaw", "Prague", "Vienna")
+QUERIES = (("address", "london"), ("address", "street 4242"), ("name", "contact12345"))
+
+
+def build_book(size):
+    book = AddressBook()
+    for i in range(size):
+        record = Record(f"Contact{i}")
+        record.add_address(f"{i} Street {i % 10_000}, {CITIES[i % len(CITIES)]}")
+        book.add_record(record)
+    book.pop_changes()
+    return book
+
+
+def scan(book, field, string):
+    if field == "name":
+        return [r for key, r in book.data.items() if string in key.lower()]
+    return [r for r in book.data.values() if any(string in a.value.lower() for a in r.addresses)]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{'contacts':>10} {'query':>22} {'matches':>8} {'scan, s':>9} {'build, s':>9} {'index, s':>9}")
+    for size in BOOK_SIZES:
+        book = build_book(size)
+        build, _ = timed(lambda: (book._names(), book._addresses()))
+        for field, string in QUERIES:
+            scanned, expected = timed(lambda: scan(book, field, string))
+            indexed, found = timed(lambda: book.find_by_any_arg(field, string))
+            assert len(found) == len(expected)
+            query = f"{field} {string}"
+            print(f"{size:>10} {query:>22} {len(found):>8} {scanned:>9.4f} {build:>9.3f} {indexed:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure the memory a contact takes in an address book and in its pickle.
+
+Run from the src directory:
+    python -m benchmarks.memory_benchmark
+"""
+
+import pickle
+import tracemalloc
+
+from classes.address_book import AddressBook
+from classes.record import Record
+
+BOOK_SIZES = (10_000, 100_000)
+TAGS = ("work", "family", "call", "todo")
+
+
+def build_book(size):
+    book = AddressBook()
+    for i in range(size):
+        record = Record(f"Contact{i}")
+        record.add_phone(f"{i:010d}")
+        record.add_phone(f"{i + size:010d}")
+        record.add_address(f"{i} Street {i % 10_000}, Kyiv")
+        record.add_email(f"contact{i}@example.com")
+        record.add_birthday("01.01.1990")
+        for number in range(2):
+            note = record.add_note(f"Note number {number} of contact {i}")
+            note.add_tag(TAGS[(i + number) % len(TAGS)])
+        book.add_record(record)
+    book.pop_changes()
+    return book
+
+
+def main():
+    print(f"{'contacts':>10} {'memory, B/contact':>18} {'pickle, B/contact':>18}")
+    for size in BOOK_SIZES:
+        tracemalloc.start()
+        book = build_book(size)
+        # Note ID index built by add_note is not part of the contacts themselves
+        book._reset_indexes()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        pickled = len(pickle.dumps(book))
+        print(f"{size:>10} {memory / size:>18.0f} {pickled / size:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
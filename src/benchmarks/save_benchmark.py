@@ -0,0 +1,63 @@
+"""
+Compare a full snapshot save with an incremental journal save.
+
+Run from the src directory:
+    python -m benchmarks.save_benchmark
+"""
+
+import os
+import tempfile
+import time
+
+from classes.address_book import AddressBook
+from classes.record import Record
+from journal import Journal
+
+BOOK_SIZES = (10_000, 50_000, 100_000)
+EDIT_COUNTS = (10, 100, 1_000)
+
+
+def build_book(size):
+    book = AddressBook()
+    for i in range(size):
+        record = Record(f"Contact{i}")
+        record.add_phone(f"{i:010d}")
+        record.add_birthday("01.01.1990")
+        record.add_note(f"Note number {i}")
+        book.add_record(record)
+    book.pop_changes()
+    return book
+
+
+def edit_contacts(book, count):
+    for i in range(count):
+        book.find(f"Contact{i}").add_address(f"Street {i}")
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'contacts':>10} {'edits':>8} {'full save, s':>14} {'incremental, s':>16}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in BOOK_SIZES:
+            book = build_book(size)
+            for edits in EDIT_COUNTS:
+                filename = os.path.join(directory, f"book_{size}_{edits}.pkl")
+                journal = Journal(filename)
+
+                edit_contacts(book, edits)
+                full = timed(lambda: journal.save(book))
+
+                edit_contacts(book, edits)
+                incremental = timed(lambda: journal.write(book.pop_changes()))
+                journal.close()
+
+                print(f"{size:>10} {edits:>8} {full:>14.4f} {incremental:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
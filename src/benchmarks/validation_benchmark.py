@@ -0,0 +1,42 @@
+"""
+Throughput of row validation for bulk imports with different worker counts.
+
+Run from the src directory:
+    python -m benchmarks.validation_benchmark [rows]
+"""
+
+import os
+import sys
+import time
+
+from bulk_validation import validate_rows
+
+DEFAULT_ROWS = 200_000
+
+
+def generate_rows(count):
+    for i in range(count):
+        yield i + 2, {
+            "name": f"Contact{i}",
+            "phones": [f"{i:010d}"],
+            "birthday": f"{i % 28 + 1:02d}.{i % 12 + 1:02d}.19{i % 90 + 10}",
+            # Every tenth row is invalid, like a real dump
+            "email": f"contact{i}@example.com" if i % 10 else "broken-email",
+            "addresses": [f"Street {i}"],
+        }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    print(f"{count} rows, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>10} {'rows/s':>12} {'valid':>10}")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        valid = sum(1 for _, record, _ in validate_rows(generate_rows(count), workers) if record)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>10.3f} {count / elapsed:>12.0f} {valid:>10}")
+
+
+if __name__ == "__main__":
+    main()
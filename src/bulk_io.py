@@ -0,0 +1,276 @@
+"""Streaming import and export of contacts in CSV, JSONL and vCard formats."""
+
+import csv
+import json
+import os
+from datetime import datetime
+
+from bulk_validation import validate_rows
+
+FORMATS = ("csv", "jsonl", "vcard")
+EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".vcf": "vcard",
+    ".vcard": "vcard",
+}
+CSV_FIELDS = ["name", "phones", "birthday", "email", "addresses"]
+# Phones and addresses share one CSV column each
+LIST_SEPARATOR = ";"
+BATCH_SIZE = 1000
+REPORTED_ERRORS = 5
+
+
+class ImportReport:
+    """Counts of an import and the first errors, the full list goes to error_file."""
+
+    def __init__(self, error_file=None):
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.error_file = error_file
+        self._error_stream = None
+        # Errors of a previous import of the same file are stale now
+        if error_file and os.path.exists(error_file):
+            os.remove(error_file)
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < REPORTED_ERRORS:
+            self.errors.append((line, message))
+        if self.error_file:
+            if self._error_stream is None:
+                self._error_stream = open(self.error_file, "w", encoding="utf-8")
+            self._error_stream.write(f"line {line}: {message}\n")
+
+    def close(self):
+        if self._error_stream is not None:
+            self._error_stream.close()
+            self._error_stream = None
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == "vcf":
+            fmt = "vcard"
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format: {fmt}. Expected formats are: {', '.join(FORMATS)}.")
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Cannot detect the format of {path}. Expected formats are: {', '.join(FORMATS)}.")
+    return EXTENSIONS[extension]
+
+
+def _split_list(value):
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in str(value).split(LIST_SEPARATOR) if item.strip()]
+
+
+def _normalize_row(row):
+    return {
+        "name": (row.get("name") or "").strip(),
+        "phones": _split_list(row.get("phones")),
+        "birthday": (row.get("birthday") or "").strip(),
+        "email": (row.get("email") or "").strip(),
+        "addresses": _split_list(row.get("addresses")),
+    }
+
+
+def read_csv(f):
+    reader = csv.DictReader(f)
+    while True:
+        start = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # The reader goes on with the next line, like read_jsonl after bad JSON
+            yield start, ValueError(f"Invalid CSV: {e}")
+            continue
+        yield reader.line_num, _normalize_row(row)
+
+
+def read_jsonl(f):
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        if not isinstance(row, dict):
+            yield line_no, ValueError("Each line must be a JSON object")
+            continue
+        nested = [field for field in CSV_FIELDS if isinstance(row.get(field), dict)
+                  or (field not in ("phones", "addresses") and isinstance(row.get(field), list))]
+        if nested:
+            yield line_no, ValueError(f"Field '{nested[0]}' must be a string")
+            continue
+        # Numbers such as a phone or 19900101 are read as text, validation decides if they fit
+        row = {field: value if value is None or isinstance(value, (str, list)) else str(value)
+               for field, value in row.items()}
+        yield line_no, _normalize_row(row)
+
+
+def _vcard_birthday(value):
+    """vCard dates are YYYY-MM-DD or YYYYMMDD, the bot uses DD.MM.YYYY."""
+    for date_format in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(value, date_format).strftime("%d.%m.%Y")
+        except ValueError:
+            pass
+    return value
+
+
+def read_vcard(f):
+    row = None
+    start = 0
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        key, _, value = line.partition(":")
+        # Drop parameters like TEL;TYPE=CELL
+        key = key.split(";")[0].upper()
+        if key == "BEGIN" and value.upper() == "VCARD":
+            row = {"name": "", "phones": [], "birthday": "", "email": "", "addresses": []}
+            start = line_no
+        elif row is None:
+            continue
+        elif key == "END" and value.upper() == "VCARD":
+            yield start, row
+            row = None
+        elif key == "FN":
+            row["name"] = value.strip()
+        elif key == "TEL":
+            row["phones"].append(value.strip())
+        elif key == "EMAIL" and not row["email"]:
+            row["email"] = value.strip()
+        elif key == "BDAY":
+            row["birthday"] = _vcard_birthday(value.strip())
+        elif key == "ADR":
+            # ADR parts are separated by ';', empty ones are skipped
+            address = ", ".join(part.strip() for part in value.split(";") if part.strip())
+            if address:
+                row["addresses"].append(address)
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "vcard": read_vcard}
+
+
+def iter_rows(path, fmt=None):
+    """Yield (line number, row dict or ValueError) from a contacts file, one row at a time."""
+    reader = READERS[detect_format(path, fmt)]
+    with open(path, encoding="utf-8", newline="") as f:
+        yield from reader(f)
+
+
+def iter_records(rows, report, workers=1):
+    """Turn rows into (line, Record) pairs, reporting the invalid ones instead of stopping."""
+    for line, record, error in validate_rows(rows, workers):
+        report.rows += 1
+        if error is None:
+            yield line, record
+        else:
+            report.add_error(line, error)
+
+
+def _add_batch(book, batch, report):
+    lines = {id(record): line for line, record in batch}
+    refused = book.add_records(record for _, record in batch)
+    for record, reason in refused:
+        report.add_error(lines[id(record)], reason)
+    report.imported += len(batch) - len(refused)
+
+
+def import_contacts(book, path, fmt=None, batch_size=BATCH_SIZE, workers=1):
+    """
+    Stream contacts from a file into the book in batches.
+
+    Rows are validated by `workers` processes (0 means one per CPU).
+    Contacts that already exist are merged. Invalid rows, and rows with a
+    phone number of another contact, are counted and written to
+    <path>.errors.txt.
+    """
+    report = ImportReport(error_file=path + ".errors.txt")
+    records = iter_records(iter_rows(path, fmt), report, workers)
+    try:
+        batch = []
+        for line, record in records:
+            batch.append((line, record))
+            if len(batch) >= batch_size:
+                _add_batch(book, batch, report)
+                batch = []
+        if batch:
+            _add_batch(book, batch, report)
+    finally:
+        report.close()
+    return report
+
+
+def _record_row(record):
+    return {
+        "name": record.name.value,
+        "phones": [p.value for p in record.phones],
+        "birthday": record.birthday.value.strftime("%d.%m.%Y") if record.birthday else "",
+        "email": record.email.value if record.email else "",
+        "addresses": [a.value for a in record.addresses],
+    }
+
+
+def write_csv(f, rows):
+    writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        row["phones"] = LIST_SEPARATOR.join(row["phones"])
+        row["addresses"] = LIST_SEPARATOR.join(row["addresses"])
+        writer.writerow(row)
+
+
+def write_jsonl(f, rows):
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def write_vcard(f, rows):
+    for row in rows:
+        f.write("BEGIN:VCARD\nVERSION:3.0\n")
+        f.write(f"FN:{row['name']}\nN:{row['name']};;;;\n")
+        for phone in row["phones"]:
+            f.write(f"TEL;TYPE=CELL:{phone}\n")
+        if row["email"]:
+            f.write(f"EMAIL:{row['email']}\n")
+        if row["birthday"]:
+            birthday = datetime.strptime(row["birthday"], "%d.%m.%Y").strftime("%Y-%m-%d")
+            f.write(f"BDAY:{birthday}\n")
+        for address in row["addresses"]:
+            f.write(f"ADR:;;{address};;;;\n")
+        f.write("END:VCARD\n")
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "vcard": write_vcard}
+
+
+def export_contacts(book, path, fmt=None):
+    """Stream every contact of the book to a file, returns the number of contacts written."""
+    writer = WRITERS[detect_format(path, fmt)]
+    count = 0
+
+    def rows():
+        nonlocal count
+        for record in book.data.values():
+            count += 1
+            yield _record_row(record)
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer(f, rows())
+    return count
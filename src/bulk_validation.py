@@ -0,0 +1,95 @@
+"""Validation of imported rows, optionally spread over a process pool."""
+
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from classes.record import Record
+
+CHUNK_SIZE = 2000
+
+
+def build_record(row) -> Record:
+    """Create a Record from an imported row, validated by the field classes."""
+    record = Record(row["name"])
+    for phone in row["phones"]:
+        if not record.find_phone(phone):
+            record.add_phone(phone)
+    if row["birthday"]:
+        record.add_birthday(row["birthday"])
+    if row["email"]:
+        record.add_email(row["email"])
+    for address in row["addresses"]:
+        record.add_address(address)
+    return record
+
+
+def validate_chunk(chunk):
+    """
+    Validate a list of (line, row) pairs.
+
+    Returns (line, Record, None) for valid rows and (line, None, message)
+    for invalid ones, in input order.
+    """
+    results = []
+    for line, row in chunk:
+        if isinstance(row, Exception):
+            results.append((line, None, str(row)))
+            continue
+        try:
+            results.append((line, build_record(row), None))
+        except ValueError as e:
+            results.append((line, None, str(e)))
+    return results
+
+
+def _chunks(rows, size):
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def resolve_workers(workers):
+    """0 or None means one worker per CPU."""
+    if not workers:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _start_method():
+    # The autosave and compaction threads are running by now, and a forked
+    # child could inherit a lock one of them holds; forkserver and spawn
+    # start workers from a clean process
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def validate_rows(rows, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Yield validation results of (line, row) pairs in input order.
+
+    With more than one worker the rows are validated in chunks by a
+    ProcessPoolExecutor. Only two chunks per worker are in flight at a
+    time, so memory stays bounded however long the input is.
+    """
+    workers = resolve_workers(workers)
+    if workers == 1:
+        for chunk in _chunks(rows, chunk_size):
+            yield from validate_chunk(chunk)
+        return
+
+    context = multiprocessing.get_context(_start_method())
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        in_flight = deque()
+        for chunk in _chunks(rows, chunk_size):
+            in_flight.append(pool.submit(validate_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
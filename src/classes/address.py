@@ -1,6 +1,8 @@
 from classes.field import Field
 
 class Address(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         value = value.strip()
         if not value:
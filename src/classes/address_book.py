@@ -1,114 +1,665 @@
 from collections import UserDict
+from itertools import islice
 from datetime import datetime, timedelta
+from classes.birthday_calendar import BirthdayCalendar
+from classes.birthday_columns import BirthdayColumns
+from classes.name import normalize_name
 from classes.record import Record
+from classes.fuzzy_index import FuzzyIndex
+from classes.lazy_records import LazyRecords
+from classes.note import Note, new_note_id
+from classes.prefix_index import PrefixIndex
+from classes.query import IndexLookup, Predicate, describe_plan, execute
+from classes.skip_list import SkipList
+from classes.text_index import TextIndex
+from classes.trigram_index import TrigramIndex
+from exceptions import AmbiguousContactError
+
+
+def _index_add(index, key, name):
+    # Indexes map a key to an ordered set (dict) of contact names
+    if index is not None and key is not None:
+        index.setdefault(key, {})[name] = None
+
+
+def _index_remove(index, key, name):
+    if index is not None and key is not None:
+        names = index.get(key)
+        if names is not None:
+            names.pop(name, None)
+            if not names:
+                del index[key]
+
+
+def _email_key(email):
+    return email.lower() if email is not None else None
+
+
+def _birthday_date(value):
+    return value.date() if value is not None else None
+
+
+SORT_ORDERS = ("name", "birthday", "notes")
+# Sorts after every character a name can contain
+_MAX_CHAR = "\U0010ffff"
+
+
+def _name_order(name):
+    return normalize_name(name), name
+
+
+def _notes_order(name, count):
+    # Most notes first, then by name
+    return -count, normalize_name(name), name
+
 
 class AddressBook(UserDict):
+    # Attributes rebuilt after loading instead of being pickled
+    _TRANSIENT = (
+        "_changes", "_phone_index", "_email_index", "_note_index", "_tag_index", "_birthday_index",
+        "_text_index", "_name_index", "_address_index", "_phone_prefixes", "_name_keys",
+        "_fuzzy_names", "_sorted_by_name", "_sorted_by_notes", "_birthday_columns",
+        "_name_prefixes", "_note_id_prefixes", "_tag_prefixes",
+    )
+
+    def __init__(self, *args, **kwargs):
+        # Contacts changed since the last save: name -> Record, or None for deleted ones
+        self._changes = {}
+        self._reset_indexes()
+        super().__init__(*args, **kwargs)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attribute in self._TRANSIENT:
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._changes = {}
+        self._reset_indexes()
+        for record in self.data.values():
+            record._book = self
+
+    def _reset_indexes(self):
+        """Secondary indexes are built on first use and kept up to date afterwards."""
+        # normalized name -> names, for lookups that ignore case and spacing
+        self._name_keys = None
+        # Normalized names within a few typos, for "did you mean" suggestions
+        self._fuzzy_names = None
+        # Sorted normalized names, note IDs and tags for tab completion
+        self._name_prefixes = None
+        self._note_id_prefixes = None
+        self._tag_prefixes = None
+        self._phone_index = None
+        self._email_index = None
+        # Sorted distinct phones for prefix search, built on top of _phone_index
+        self._phone_prefixes = None
+        # note ID -> Note, the owning record is note._owner
+        self._note_index = None
+        # tag -> ordered set (dict) of the Notes that have it
+        self._tag_index = None
+        self._birthday_index = None
+        # The same birthdays as integer columns for range queries and statistics
+        self._birthday_columns = None
+        # Words of the note contents for search_notes
+        self._text_index = None
+        # Trigrams of names and addresses for substring search
+        self._name_index = None
+        self._address_index = None
+        # Contacts kept in "all --sort" order
+        self._sorted_by_name = None
+        self._sorted_by_notes = None
+
+    def set_records(self, records):
+        """Use a lazily loaded mapping (see LazyRecords) as the book's storage."""
+        records.on_load = self._attach
+        self.data = records
+        self._reset_indexes()
+
+    def _attach(self, record: Record):
+        record._book = self
+
+    def _mark_dirty(self, record: Record):
+        self._changes[record.name.value] = record
+        if isinstance(self.data, LazyRecords):
+            self.data.pin(record.name.value, record)
+
+    def _record_changed(self, record: Record, field=None, old=None, new=None, note=None):
+        """
+        Called by records on every change, old/new are the changed values of field.
+        Tag changes also pass the note they were made on.
+        """
+        self._mark_dirty(record)
+        name = record.name.value
+        if field == "phone":
+            _index_remove(self._phone_index, old, name)
+            _index_add(self._phone_index, new, name)
+            self._sync_phone_prefix(old)
+            self._sync_phone_prefix(new)
+        elif field == "email":
+            _index_remove(self._email_index, _email_key(old), name)
+            _index_add(self._email_index, _email_key(new), name)
+        elif field == "note":
+            if old is not None:
+                self._unindex_note(old)
+            if new is not None:
+                self._index_note(new)
+            if self._sorted_by_notes is not None:
+                count = len(record.notes)
+                before = count + (old is not None) - (new is not None)
+                self._sorted_by_notes.remove(_notes_order(name, before))
+                self._sorted_by_notes.add(_notes_order(name, count))
+        elif field == "address" and self._address_index is not None:
+            self._address_index.set(name, [a.value for a in record.addresses])
+        elif field == "birthday":
+            if self._birthday_index is not None:
+                if old is not None:
+                    self._birthday_index.remove(name, _birthday_date(old))
+                if new is not None:
+                    self._birthday_index.add(name, _birthday_date(new))
+            if self._birthday_columns is not None:
+                if new is None:
+                    self._birthday_columns.remove(name)
+                else:
+                    self._birthday_columns.set(name, _birthday_date(new))
+        elif field == "content" and self._text_index is not None:
+            self._text_index.add(note)
+        elif field == "tag":
+            _index_remove(self._tag_index, old, note)
+            _index_add(self._tag_index, new, note)
+            self._sync_tag_prefix(old)
+            self._sync_tag_prefix(new)
+
+    def _index_record(self, record: Record):
+        name = record.name.value
+        _index_add(self._name_keys, normalize_name(name), name)
+        self._sync_fuzzy_name(normalize_name(name))
+        self._sync_name_prefix(normalize_name(name))
+        if self._sorted_by_name is not None:
+            self._sorted_by_name.add(_name_order(name))
+        if self._sorted_by_notes is not None:
+            self._sorted_by_notes.add(_notes_order(name, len(record.notes)))
+        if self._name_index is not None:
+            self._name_index.set(name, [name])
+        if self._address_index is not None:
+            self._address_index.set(name, [a.value for a in record.addresses])
+        for phone in record.phones:
+            _index_add(self._phone_index, phone.value, name)
+            self._sync_phone_prefix(phone.value)
+        if record.email:
+            _index_add(self._email_index, _email_key(record.email.value), name)
+        if record.birthday and self._birthday_index is not None:
+            self._birthday_index.add(name, _birthday_date(record.birthday.value))
+        if record.birthday and self._birthday_columns is not None:
+            self._birthday_columns.set(name, _birthday_date(record.birthday.value))
+        for note in record.notes:
+            self._index_note(note)
+
+    def _unindex_record(self, record: Record):
+        name = record.name.value
+        _index_remove(self._name_keys, normalize_name(name), name)
+        self._sync_fuzzy_name(normalize_name(name))
+        self._sync_name_prefix(normalize_name(name))
+        if self._sorted_by_name is not None:
+            self._sorted_by_name.remove(_name_order(name))
+        if self._sorted_by_notes is not None:
+            self._sorted_by_notes.remove(_notes_order(name, len(record.notes)))
+        if self._name_index is not None:
+            self._name_index.remove(name)
+        if self._address_index is not None:
+            self._address_index.remove(name)
+        for phone in record.phones:
+            _index_remove(self._phone_index, phone.value, name)
+            self._sync_phone_prefix(phone.value)
+        if record.email:
+            _index_remove(self._email_index, _email_key(record.email.value), name)
+        if record.birthday and self._birthday_index is not None:
+            self._birthday_index.remove(name, _birthday_date(record.birthday.value))
+        if self._birthday_columns is not None:
+            self._birthday_columns.remove(name)
+        for note in record.notes:
+            self._unindex_note(note)
+
+    def _sync_fuzzy_name(self, key):
+        if self._fuzzy_names is None:
+            return
+        if key in self._name_keys:
+            self._fuzzy_names.add(key)
+        else:
+            self._fuzzy_names.remove(key)
+
+    def _sync_name_prefix(self, key):
+        if self._name_prefixes is None:
+            return
+        if key in self._name_keys:
+            self._name_prefixes.add(key)
+        else:
+            self._name_prefixes.remove(key)
+
+    def _sync_tag_prefix(self, tag):
+        if self._tag_prefixes is None or tag is None:
+            return
+        if tag in self._tag_index:
+            self._tag_prefixes.add(tag)
+        else:
+            self._tag_prefixes.remove(tag)
+
+    def _sync_phone_prefix(self, phone):
+        if self._phone_prefixes is None or phone is None:
+            return
+        if phone in self._phone_index:
+            self._phone_prefixes.add(phone)
+        else:
+            self._phone_prefixes.remove(phone)
+
+    def _index_note(self, note: Note):
+        if self._note_index is not None:
+            self._add_note_id(note, self._note_index)
+            if self._note_id_prefixes is not None:
+                self._note_id_prefixes.add(note.id)
+        for tag in note.tags:
+            _index_add(self._tag_index, tag, note)
+            self._sync_tag_prefix(tag)
+        if self._text_index is not None:
+            self._text_index.add(note)
+
+    def _unindex_note(self, note: Note):
+        if self._note_index is not None and self._note_index.get(note.id) is note:
+            del self._note_index[note.id]
+            if self._note_id_prefixes is not None:
+                self._note_id_prefixes.remove(note.id)
+        for tag in note.tags:
+            _index_remove(self._tag_index, tag, note)
+            self._sync_tag_prefix(tag)
+        if self._text_index is not None:
+            self._text_index.remove(note)
+
+    def _add_note_id(self, note: Note, index: dict):
+        taken = index.get(note.id)
+        if taken is not None and taken is not note:
+            # IDs given out without the index (older books, merged files) can collide,
+            # the note coming in gets a fresh one
+            note.id = self._unused_note_id(index)
+            if note._owner is not None:
+                self._mark_dirty(note._owner)
+        index[note.id] = note
+
+    def _unused_note_id(self, index: dict) -> str:
+        while True:
+            note_id = new_note_id()
+            if note_id not in index:
+                return note_id
+
+    def _phones(self) -> dict:
+        if self._phone_index is None:
+            index = {}
+            for record in self.data.values():
+                for phone in record.phones:
+                    _index_add(index, phone.value, record.name.value)
+            self._phone_index = index
+        return self._phone_index
+
+    def _prefixes(self) -> PrefixIndex:
+        if self._phone_prefixes is None:
+            self._phone_prefixes = PrefixIndex(self._phones())
+        return self._phone_prefixes
+
+    def _emails(self) -> dict:
+        if self._email_index is None:
+            index = {}
+            for record in self.data.values():
+                if record.email:
+                    _index_add(index, _email_key(record.email.value), record.name.value)
+            self._email_index = index
+        return self._email_index
+
+    def _notes(self) -> dict:
+        if self._note_index is None:
+            index = {}
+            for record in self.data.values():
+                for note in record.notes:
+                    self._add_note_id(note, index)
+            self._note_index = index
+        return self._note_index
+
+    def _tags(self) -> dict:
+        if self._tag_index is None:
+            index = {}
+            for record in self.data.values():
+                for note in record.notes:
+                    for tag in note.tags:
+                        _index_add(index, tag, note)
+            self._tag_index = index
+        return self._tag_index
+
+    def _name_lookup(self) -> dict:
+        if self._name_keys is None:
+            index = {}
+            for name in self.data:
+                _index_add(index, normalize_name(name), name)
+            self._name_keys = index
+        return self._name_keys
+
+    def _fuzzy(self) -> FuzzyIndex:
+        if self._fuzzy_names is None:
+            self._fuzzy_names = FuzzyIndex(self._name_lookup())
+        return self._fuzzy_names
+
+    def _name_keys_sorted(self) -> PrefixIndex:
+        if self._name_prefixes is None:
+            self._name_prefixes = PrefixIndex(self._name_lookup())
+        return self._name_prefixes
+
+    def _names(self) -> TrigramIndex:
+        if self._name_index is None:
+            index = TrigramIndex()
+            for name in self.data:
+                index.set(name, [name])
+            self._name_index = index
+        return self._name_index
+
+    def _addresses(self) -> TrigramIndex:
+        if self._address_index is None:
+            index = TrigramIndex()
+            for record in self.data.values():
+                index.set(record.name.value, [a.value for a in record.addresses])
+            self._address_index = index
+        return self._address_index
+
+    def _records_with_notes(self):
+        return (record for record in self.data.values() if record.notes)
+
+    def _texts(self) -> TextIndex:
+        if self._text_index is None:
+            index = TextIndex()
+            for record in self._records_with_notes():
+                for note in record.notes:
+                    index.add(note)
+            self._text_index = index
+        return self._text_index
+
+    def _birthday_rows(self):
+        """(name, birthday date) of every contact that has a birthday."""
+        return (
+            (record.name.value, _birthday_date(record.birthday.value))
+            for record in self.data.values() if record.birthday
+        )
+
+    def _birthdays(self) -> BirthdayCalendar:
+        if self._birthday_index is None:
+            calendar = BirthdayCalendar()
+            for name, birthday in self._birthday_rows():
+                calendar.add(name, birthday)
+            self._birthday_index = calendar
+        return self._birthday_index
+
+    def _birthday_table(self) -> BirthdayColumns:
+        if self._birthday_columns is None:
+            columns = BirthdayColumns()
+            for name, birthday in self._birthday_rows():
+                columns.set(name, birthday)
+            self._birthday_columns = columns
+        return self._birthday_columns
+
+    def _by_name(self) -> SkipList:
+        if self._sorted_by_name is None:
+            self._sorted_by_name = SkipList(_name_order(name) for name in self.data)
+        return self._sorted_by_name
+
+    def _note_counts(self):
+        """(name, number of notes) of every contact."""
+        return ((record.name.value, len(record.notes)) for record in self.data.values())
+
+    def _by_notes(self) -> SkipList:
+        if self._sorted_by_notes is None:
+            self._sorted_by_notes = SkipList(_notes_order(name, count) for name, count in self._note_counts())
+        return self._sorted_by_notes
+
+    def new_note_id(self) -> str:
+        """A note ID no note of the book uses yet."""
+        return self._unused_note_id(self._notes())
+
+    def pop_changes(self) -> dict:
+        """Return contacts changed since the last call (None for deleted ones) and forget them."""
+        changes, self._changes = self._changes, {}
+        return changes
+
     def add_record(self, record: Record):
+        old = self.data.get(record.name.value)
+        if old is not None and old is not record:
+            self._unindex_record(old)
+            old._book = None
         self.data[record.name.value] = record
+        self._attach(record)
+        if old is not record:
+            self._index_record(record)
+        self._mark_dirty(record)
+
+    def phone_conflict(self, record: Record):
+        """Why record cannot be added or merged: one of its phones belongs to another contact. None if it can."""
+        for phone in record.phones:
+            for owner in self.find_by_phone(phone.value):
+                if owner.name.value != record.name.value:
+                    return f"Phone number {phone.value} already belongs to {owner.name.value}"
+        return None
+
+    def add_records(self, records) -> list[tuple]:
+        """
+        Add a batch of records, merging those whose contact already exists.
+        Records with a phone number of another contact are left out, returns (record, reason) of those.
+        """
+        refused = []
+        for record in records:
+            conflict = self.phone_conflict(record)
+            if conflict is not None:
+                refused.append((record, conflict))
+                continue
+            existing = self.data.get(record.name.value)
+            if existing is None:
+                self.add_record(record)
+            else:
+                existing.merge(record)
+        return refused
 
     def find(self, name: str) -> Record:
-        return self.data.get(name)
+        """
+        The contact with this name, ignoring case and extra spaces if there is no exact match.
+        Raises AmbiguousContactError if several contacts match that way.
+        """
+        record = self.data.get(name)
+        if record is not None:
+            return record
+        names = self._name_lookup().get(normalize_name(name))
+        if not names:
+            return None
+        if len(names) > 1:
+            raise AmbiguousContactError(
+                f"'{name}' matches several contacts: {', '.join(names)}. Use the exact name."
+            )
+        return self.data[next(iter(names))]
+
+    def suggest_names(self, name: str, limit=3) -> list[str]:
+        """Names of the contacts closest to a mistyped name, at most two edits away."""
+        key = normalize_name(name)
+        # One typo is all a very short name can take before everything matches
+        max_distance = 1 if len(key) <= 4 else 2
+        lookup = self._name_lookup()
+        names = []
+        for _, similar in self._fuzzy().search(key, max_distance):
+            names.extend(lookup[similar])
+        return names[:limit]
+
+    def complete_names(self, prefix: str, limit=None) -> list[str]:
+        """Contact names starting with prefix, ignoring case and Unicode form, in sorted order."""
+        lookup = self._name_lookup()
+        names = []
+        for key in self._name_keys_sorted().keys(normalize_name(prefix), limit):
+            names.extend(lookup[key])
+        return names if limit is None else names[:limit]
+
+    def complete_note_ids(self, prefix: str, limit=None) -> list[str]:
+        """Note IDs starting with prefix, in sorted order."""
+        if self._note_id_prefixes is None:
+            self._note_id_prefixes = PrefixIndex(self._notes())
+        return self._note_id_prefixes.keys(prefix, limit)
+
+    def complete_tags(self, prefix: str, limit=None) -> list[str]:
+        """Tags starting with prefix, in sorted order."""
+        if self._tag_prefixes is None:
+            self._tag_prefixes = PrefixIndex(self._tags())
+        return self._tag_prefixes.keys(prefix.lower(), limit)
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        """Contacts that have exactly this phone number."""
+        return [self.data[name] for name in self._phones().get(phone, ())]
+
+    def _phone_prefix_names(self, prefix: str, limit=None) -> list[str]:
+        phones = self._phones()
+        names = {}
+        for phone in self._prefixes().keys(prefix, limit):
+            names.update(phones[phone])
+        names = list(names)
+        return names if limit is None else names[:limit]
+
+    def find_by_phone_prefix(self, prefix: str, limit=None) -> list[Record]:
+        """Contacts with a phone starting with prefix, in phone order, at most limit of them."""
+        return [self.data[name] for name in self._phone_prefix_names(prefix, limit)]
+
+    def count_phone_prefix(self, prefix: str) -> int:
+        """Number of phone numbers starting with prefix."""
+        return self._prefixes().count(prefix)
+
+    def find_by_email(self, email: str) -> list[Record]:
+        """Contacts that have exactly this email, ignoring case."""
+        return [self.data[name] for name in self._emails().get(_email_key(email), ())]
 
     def delete(self, name):
         if name in self.data:
+         record = self.data[name]
+         self._unindex_record(record)
+         record._book = None
          del self.data[name]
+         self._changes[name] = None
          return True
         return False
 
     def get_upcoming_birthdays(self):
         current_day = datetime.today().date()
-        birthdays_list = []
-
-        for record in self.data.values():
-            if record.birthday:
-                birthday = record.birthday.value.date()
-                birthday_this_year = birthday.replace(year=current_day.year)
-
-                # Check if the birthday has passed, if so, postpone it to next year
-                if birthday_this_year < current_day:
-                   birthday_this_year = birthday_this_year.replace(year=current_day.year + 1)
 
-                days_till_birthday = (birthday_this_year - current_day).days
+        birthdays_list = []
 
-                # Check if birthday is in the next 7 days
-                if 0 <= days_till_birthday <= 7:
-                     celebration_date = birthday_this_year
+        # Birthdays in the next 7 days, soonest first
+        for name, birthday, birthday_date in self._birthdays().upcoming(current_day, 7):
+            celebration_date = birthday_date
 
-                     # Check if celebration_date is on a weekend
-                     if celebration_date.weekday() == 5:  # субота
-                        celebration_date += timedelta(days=2)
-                     elif celebration_date.weekday() == 6:  # неділя
-                        celebration_date += timedelta(days=1)
+            # Check if celebration_date is on a weekend
+            if celebration_date.weekday() == 5:  # субота
+                celebration_date += timedelta(days=2)
+            elif celebration_date.weekday() == 6:  # неділя
+                celebration_date += timedelta(days=1)
 
-                     birthdays_list.append({
-                              "name": record.name.value,
-                              "congratulation_date": celebration_date.strftime("%d.%m.%Y")
-                     })
+            birthdays_list.append({
+                "name": name,
+                "congratulation_date": celebration_date.strftime("%d.%m.%Y")
+            })
 
         return birthdays_list
 
     def get_birthdays_in_range(self, days: int):
         current_day = datetime.today().date()
-        birthdays_list = []
-
-        for record in self.data.values():
-            if record.birthday:
-                birthday = record.birthday.value.date()
+        return [
+            {"name": name, "birthday": birthday.strftime("%d.%m.%Y")}
+            for name, birthday, _ in self._birthdays().upcoming(current_day, days)
+        ]
 
-                birthday_this_year = birthday.replace(year=current_day.year)
+    def birthday_stats(self, days: int, by="week") -> list[tuple]:
+        """Number of birthdays within days from today per week or month, as (first day, last day, count)."""
+        return self._birthday_table().histogram(datetime.today().date(), days, by)
 
-                if birthday_this_year < current_day:
-                    birthday_this_year = birthday_this_year.replace(year=current_day.year + 1)
+    def iter_sorted(self, order="name", start=None, end=None, offset=0):
+        """
+        Yield contact names in order: "name", "birthday" (next birthday first,
+        contacts without one last by name) or "notes" (most notes first).
+        start and end limit the name order to names from start up to
+        those beginning with end. The first offset names are skipped.
+        """
+        if order not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {order}. Expected one of: {', '.join(SORT_ORDERS)}.")
+        if order != "name" and (start is not None or end is not None):
+            raise ValueError("A name range only works with the name order")
+        if order == "name":
+            view = self._by_name()
+            first = view.bisect_left((normalize_name(start),)) if start is not None else 0
+            last = (normalize_name(end) + _MAX_CHAR,) if end is not None else None
+            return (key[-1] for key in view.iter_from(first + offset, last))
+        if order == "notes":
+            return (key[-1] for key in self._by_notes().iter_from(offset))
+        return islice(self._by_birthday(), offset, None)
 
-                days_till_birthday = (birthday_this_year - current_day).days
+    def _by_birthday(self):
+        calendar = self._birthdays()
+        today = datetime.today().date()
+        for name, _, _ in calendar.upcoming(today, 366):
+            yield name
+        for _, name in self._by_name():
+            if name not in calendar:
+                yield name
 
-                if 0 <= days_till_birthday <= days:
-                    birthdays_list.append({
-                        "name": record.name.value,
-                        "birthday": birthday.strftime("%d.%m.%Y"),
-                    })
+    def find_all_notes_by_tag(self, tag: str):
+        # Group the tagged notes by contact, contacts in the order their first note was tagged
+        by_contact = {}
+        for note in self._tags().get(tag.lower(), ()):
+            by_contact.setdefault(note._owner.name.value, []).append(note)
+        return [{'contact': name, 'notes': notes} for name, notes in by_contact.items()]
 
-        return birthdays_list
+    def search_notes(self, query: str, match_all=True, limit=None) -> list[tuple]:
+        """
+        Notes of all contacts containing the words of the query as (record, note, score), best match first.
+        match_all requires every word, otherwise any of them is enough.
+        """
+        return [
+            (note._owner, note, score)
+            for note, score in self._texts().search(query, match_all, limit)
+        ]
 
-    def find_all_notes_by_tag(self, tag: str):
-        results = []
-        for record in self.data.values():
-            notes = record.find_notes_by_tag(tag)
-            if notes:
-                results.append({
-                    'contact': record.name.value,
-                    'notes': notes
-                })
-        return results
+    def tag_counts(self) -> dict:
+        """Every tag with the number of notes that have it."""
+        return {tag: len(notes) for tag, notes in self._tags().items()}
     
     def find_note_by_id(self, note_id: str):
-        for record in self.data.values():
-            note = record.find_note_by_id(note_id)
-            if note:
-                return record, note
-        return None, None
+        note = self._notes().get(note_id)
+        if note is None:
+            return None, None
+        return note._owner, note
         
+    def _index_lookup(self, predicate: Predicate):
+        """How an index answers a query predicate, None if the predicate needs a scan."""
+        value = predicate.value
+        if predicate.field in ("name", "address") and len(value) >= 3:
+            index = self._names() if predicate.field == "name" else self._addresses()
+            return IndexLookup(f"trigram({predicate.field})", index.estimate(value), lambda: index.search(value))
+        if predicate.field == "phone" and predicate.prefix is not None:
+            return IndexLookup(
+                "phone prefix",
+                self._prefixes().count(predicate.prefix),
+                lambda: self._phone_prefix_names(predicate.prefix),
+            )
+        if predicate.field == "phone" and len(value) == 10 and value.isdigit():
+            names = self._phones().get(value, {})
+            return IndexLookup("phone hash", len(names), lambda: names)
+        return None
+
+    def iter_query(self, predicates: list[Predicate]):
+        """Yield the contacts matching every predicate (see classes.query) one at a time."""
+        return execute(self, predicates)
+
+    def query(self, predicates: list[Predicate]) -> list[Record]:
+        return list(self.iter_query(predicates))
+
+    def explain_query(self, predicates: list[Predicate]) -> list[str]:
+        """The plan query() follows for these predicates, with its estimated cost."""
+        return describe_plan(self, predicates)
+
     def find_by_any_arg(self, field: str, string: str) -> list[Record]:
-        field=field.lower()
-        string=string.lower()
-        result: list[Record] = []
-        for key, record in self.data.items():
-            match field:
-                case "name":
-                    if string in key.lower():
-                        result.append(record)
-                case "phone":
-                    if any(string in p.value for p in record.phones):
-                        result.append(record)
-                case "address":
-                    if record.addresses and any(string in p.value.lower() for p in record.addresses):
-                        result.append(record)
-                case "birthday":
-                    if record.birthday and string in record.birthday.value.strftime("%d.%m.%Y"):
-                        result.append(record)
-                case "email":
-                    if record.email and string in record.email.value:
-                        result.append(record)
-                case _:
-                    raise ValueError(f"Unknown field: {field}. Expected fields to search are: name, phone, birthday, address.")
-        return result
+        return self.query([Predicate(field, string)])
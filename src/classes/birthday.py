@@ -2,6 +2,8 @@ from datetime import datetime
 from classes.field import Field
 
 class Birthday(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         try:
             date = datetime.strptime(value, "%d.%m.%Y")
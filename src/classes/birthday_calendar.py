@@ -0,0 +1,68 @@
+from bisect import bisect_left, insort
+from calendar import isleap
+from datetime import date, timedelta
+
+
+def birthday_in_year(birthday: date, year: int) -> date:
+    """The birthday in a given year, Feb 29 birthdays are celebrated on Feb 28 in common years."""
+    if birthday.month == 2 and birthday.day == 29 and not isleap(year):
+        return date(year, 2, 28)
+    return birthday.replace(year=year)
+
+
+class BirthdayCalendar:
+    """
+    Contacts' birthdays grouped by day of the year.
+
+    The days that have birthdays are kept sorted, so a query for the next
+    N days bisects to today and walks forward (wrapping past Dec 31),
+    touching only the days that have birthdays.
+    """
+
+    def __init__(self):
+        # (month, day) -> {name: birthday}
+        self._days = {}
+        self._keys = []
+        # name -> (month, day)
+        self._names = {}
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def add(self, name: str, birthday: date):
+        key = (birthday.month, birthday.day)
+        names = self._days.get(key)
+        if names is None:
+            names = self._days[key] = {}
+            insort(self._keys, key)
+        names[name] = birthday
+        self._names[name] = key
+
+    def remove(self, name: str, birthday: date):
+        key = (birthday.month, birthday.day)
+        names = self._days.get(key)
+        if names is None:
+            return
+        names.pop(name, None)
+        self._names.pop(name, None)
+        if not names:
+            del self._days[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def upcoming(self, today: date, days: int):
+        """Yield (name, birthday, date of the next birthday) for birthdays from today to today + days, soonest first."""
+        if days < 0 or not self._keys:
+            return
+        last_day = today + timedelta(days=days)
+        start = bisect_left(self._keys, (today.month, today.day))
+        count = len(self._keys)
+        # One pass over the year starting from today, keys before today fall into next year
+        for i in range(count):
+            position = start + i
+            key = self._keys[position % count]
+            year = today.year if position < count else today.year + 1
+            for name, birthday in self._days[key].items():
+                next_birthday = birthday_in_year(birthday, year)
+                if next_birthday > last_day:
+                    return
+                yield name, birthday, next_birthday
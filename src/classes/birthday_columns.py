@@ -0,0 +1,151 @@
+"""
+Birthdays of the whole book as integer columns, for statistics.
+
+Every contact with a birthday is one row: its name in a list and the
+year, month and day in compact arrays. A query turns today into a table
+of "days until the next birthday" for each (month, day), looks every row
+up in it and counts the resulting integers, without creating a date
+object per contact. Listing birthdays is left to BirthdayCalendar, which
+only touches the days in the range.
+
+With NumPy installed the columns are processed as vectors, without it
+the same arithmetic runs over the arrays in Python.
+"""
+
+from array import array
+from calendar import monthrange
+from datetime import date, timedelta
+
+from classes.birthday_calendar import birthday_in_year
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Row key of a birthday is month * _DAY_SLOTS + day
+_DAY_SLOTS = 32
+WEEK = "week"
+MONTH = "month"
+
+
+def _offset_table(today: date) -> list[int]:
+    """Days from today to the next birthday for every (month, day) key, Feb 29 included."""
+    table = [0] * (13 * _DAY_SLOTS)
+    for month in range(1, 13):
+        for day in range(1, monthrange(2000, month)[1] + 1):
+            birthday = date(2000, month, day)
+            next_birthday = birthday_in_year(birthday, today.year)
+            if next_birthday < today:
+                next_birthday = birthday_in_year(birthday, today.year + 1)
+            table[month * _DAY_SLOTS + day] = (next_birthday - today).days
+    return table
+
+
+class BirthdayColumns:
+    """Birthdays by row: name, year, month and day columns aligned by position."""
+
+    def __init__(self):
+        self._names = []
+        # name -> row, rows are kept dense by moving the last row into a removed one
+        self._rows = {}
+        self._years = array("H")
+        self._months = array("B")
+        self._days = array("B")
+
+    def __len__(self):
+        return len(self._names)
+
+    def set(self, name: str, birthday: date):
+        row = self._rows.get(name)
+        if row is None:
+            self._rows[name] = len(self._names)
+            self._names.append(name)
+            self._years.append(birthday.year)
+            self._months.append(birthday.month)
+            self._days.append(birthday.day)
+        else:
+            self._years[row] = birthday.year
+            self._months[row] = birthday.month
+            self._days[row] = birthday.day
+
+    def remove(self, name: str):
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        last = len(self._names) - 1
+        if row != last:
+            moved = self._names[last]
+            self._names[row] = moved
+            self._rows[moved] = row
+            self._years[row] = self._years[last]
+            self._months[row] = self._months[last]
+            self._days[row] = self._days[last]
+        self._names.pop()
+        self._years.pop()
+        self._months.pop()
+        self._days.pop()
+
+    def _offsets(self, today: date):
+        """Days until the next birthday of every row."""
+        table = _offset_table(today)
+        if numpy is not None:
+            keys = numpy.frombuffer(self._months, dtype=numpy.uint8).astype(numpy.int32) * _DAY_SLOTS
+            keys += numpy.frombuffer(self._days, dtype=numpy.uint8)
+            return numpy.array(table, dtype=numpy.int32)[keys]
+        return [table[month * _DAY_SLOTS + day] for month, day in zip(self._months, self._days)]
+
+    def histogram(self, today: date, days: int, by=WEEK) -> list[tuple]:
+        """
+        Number of birthdays within days from today per week (starting today) or per calendar month,
+        as (first day, last day, count) for every week or month of the range.
+        """
+        if days < 0:
+            return []
+        last_day = today + timedelta(days=days)
+        if by == WEEK:
+            bounds = [
+                (today + timedelta(days=start), min(today + timedelta(days=start + 6), last_day))
+                for start in range(0, days + 1, 7)
+            ]
+        else:
+            bounds = []
+            first = today
+            while first <= last_day:
+                end = date(first.year, first.month, monthrange(first.year, first.month)[1])
+                bounds.append((first, min(end, last_day)))
+                first = end + timedelta(days=1)
+        counts = self._bucket_counts(today, days, by, len(bounds))
+        return [(first, last, count) for (first, last), count in zip(bounds, counts)]
+
+    def _bucket_counts(self, today: date, days: int, by, buckets: int) -> list[int]:
+        counts = [0] * buckets
+        if not self._names:
+            return counts
+        # A birthday comes round at most once in 365 days, so longer ranges
+        # are counted a 365-day window at a time
+        for start in range(0, days + 1, 365):
+            first = today + timedelta(days=start)
+            window = min(365, days + 1 - start)
+            offsets = self._offsets(first)
+            # Months of the year of first come after this many days, later ones are a year on
+            rest_of_year = (date(first.year, 12, 31) - first).days
+            months_on = 12 * (first.year - today.year) - today.month
+            if numpy is not None:
+                within = offsets < window
+                if by == WEEK:
+                    bucket = (offsets[within] + start) // 7
+                else:
+                    months = numpy.frombuffer(self._months, dtype=numpy.uint8).astype(numpy.int32)[within]
+                    bucket = months + months_on + 12 * (offsets[within] > rest_of_year)
+                window_counts = numpy.bincount(bucket, minlength=buckets)[:buckets].tolist()
+                counts = [total + count for total, count in zip(counts, window_counts)]
+                continue
+            for offset, month in zip(offsets, self._months):
+                if offset >= window:
+                    continue
+                if by == WEEK:
+                    counts[(offset + start) // 7] += 1
+                else:
+                    counts[month + months_on + 12 * (offset > rest_of_year)] += 1
+        return counts
@@ -4,6 +4,8 @@ from classes.field import Field
 EMAIL_REGEXP = re.compile(r"^[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}$")
 
 class Email(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         if EMAIL_REGEXP.match(value):
             super().__init__(value)
@@ -1,6 +1,16 @@
 class Field:
+    # No per-instance __dict__, a contact holds many small fields
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
+    def __getstate__(self):
+        # Same state as before fields had slots, so old and new pickles load either way
+        return {"value": self.value}
+
+    def __setstate__(self, state):
+        self.value = state["value"]
+
     def __str__(self):
-        return str(self.value)
\ No newline at end of file
+        return str(self.value)
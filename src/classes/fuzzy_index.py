@@ -0,0 +1,139 @@
+def edit_distance(a: str, b: str, limit=None) -> int:
+    """
+    Edit distance counting insertions, deletions, substitutions and
+    swaps of two neighbouring letters, the usual typos, as one edit each.
+    With a limit, only letters at most limit positions apart are compared
+    and limit + 1 is returned as soon as the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    # Letters both words start or end with cost nothing, names often share most of them
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if limit is None:
+        limit = max(len(a), len(b))
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = None
+    row = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        before, previous = previous, row
+        row = [over] * (len(b) + 1)
+        if i <= limit:
+            row[0] = i
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+            if before is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            row[j] = min(value, over)
+        # A swap looks two rows back, so both must be over the limit
+        if min(row) > limit and min(previous) > limit:
+            return over
+    return row[-1]
+
+
+def _deletes(word: str, depth: int) -> set[str]:
+    """word and every string made by deleting up to depth letters from it."""
+    found = {word}
+    level = {word}
+    for _ in range(depth):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+        found |= level
+    return found
+
+
+class FuzzyIndex:
+    """
+    Symmetric delete index (as in SymSpell) for finding words within a few typos.
+
+    Two words are close when deleting a few letters from both gives the
+    same string. Every word is stored under the strings made by deleting
+    up to stored_deletes letters from the whole word; a query looks up the
+    deletions of up to max_distance letters of its own and checks the
+    words it finds with edit_distance. Deletions of whole words are
+    shared only by words that really are a few letters apart, so however
+    many words start the same way a lookup checks a handful of them, and
+    never more than max_candidates. Storing one deletion per word keeps
+    memory at about one entry per letter; it finds every single typo and
+    the double typos where at most one letter of the stored word is
+    missing or replaced.
+    """
+
+    def __init__(self, words=(), max_distance=2, stored_deletes=1, max_candidates=100):
+        self.max_distance = max_distance
+        self.stored_deletes = stored_deletes
+        self.max_candidates = max_candidates
+        # deletion -> word, or list of words when several share it
+        self._deletes = {}
+        self._words = set()
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word in self._words
+
+    def add(self, word: str):
+        if word in self._words:
+            return
+        self._words.add(word)
+        for key in _deletes(word, self.stored_deletes):
+            entry = self._deletes.get(key)
+            if entry is None:
+                self._deletes[key] = word
+            elif isinstance(entry, list):
+                entry.append(word)
+            else:
+                self._deletes[key] = [entry, word]
+
+    def remove(self, word: str):
+        if word not in self._words:
+            return
+        self._words.discard(word)
+        for key in _deletes(word, self.stored_deletes):
+            entry = self._deletes.get(key)
+            if entry == word:
+                del self._deletes[key]
+            elif isinstance(entry, list):
+                entry.remove(word)
+                if len(entry) == 1:
+                    self._deletes[key] = entry[0]
+
+    def search(self, word: str, max_distance=None) -> list[tuple[int, str]]:
+        """(distance, word) for the stored words within max_distance of word, closest first."""
+        if max_distance is None:
+            max_distance = self.max_distance
+        found = []
+        seen = set()
+        level = {word}
+        # Words one typo away share deletions of fewer letters, so they are checked first
+        for depth in range(max_distance + 1):
+            if depth:
+                level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+            for key in level:
+                entry = self._deletes.get(key)
+                if entry is None:
+                    continue
+                for candidate in entry if isinstance(entry, list) else (entry,):
+                    # Words whose lengths differ by more than max_distance cannot be close
+                    if candidate in seen or abs(len(candidate) - len(word)) > max_distance:
+                        continue
+                    if len(seen) >= self.max_candidates:
+                        found.sort()
+                        return found
+                    seen.add(candidate)
+                    distance = edit_distance(word, candidate, max_distance)
+                    if distance <= max_distance:
+                        found.append((distance, candidate))
+        found.sort()
+        return found
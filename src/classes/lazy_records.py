@@ -0,0 +1,137 @@
+import weakref
+from collections.abc import ItemsView, MutableMapping, ValuesView
+
+
+class _ItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _ValuesView(ValuesView):
+    def __iter__(self):
+        return (record for _, record in self._mapping._iter_items())
+
+
+class LazyRecords(MutableMapping):
+    """
+    Name -> Record mapping that decodes records from a storage backend on first access.
+
+    Subclasses describe what is stored (_stored_names, _stored_contains,
+    _stored_len) and how to decode one record (_load). values() and items()
+    decode the stored records in one walk over _stored_entries. Records added,
+    replaced, changed (see pin) or deleted during the session are kept in
+    memory on top of the stored ones, so the storage itself is never
+    modified here. Other decoded records are only shared while something
+    still uses them, so a pass over the whole book does not keep it in memory.
+    on_load is called with every record decoded from the storage.
+    """
+
+    def __init__(self):
+        self.on_load = None
+        self._loaded = {}
+        # Unchanged records handed out, the same object comes back while it is alive
+        self._decoded = weakref.WeakValueDictionary()
+        self._new = {}
+        self._deleted = set()
+
+    def _load(self, name):
+        raise NotImplementedError
+
+    def _stored_names(self):
+        raise NotImplementedError
+
+    def _stored_contains(self, name) -> bool:
+        raise NotImplementedError
+
+    def _stored_len(self) -> int:
+        raise NotImplementedError
+
+    def _stored_entries(self):
+        """(name, entry) of every stored record in book order, _decode(entry) gives the record."""
+        for name in self._stored_names():
+            yield name, name
+
+    def _decode(self, entry):
+        return self._load(entry)
+
+    def _is_stored(self, name) -> bool:
+        return name not in self._deleted and self._stored_contains(name)
+
+    def __getitem__(self, name):
+        record = self._loaded.get(name)
+        if record is None:
+            record = self._decoded.get(name)
+        if record is not None:
+            return record
+        if not self._is_stored(name):
+            raise KeyError(name)
+        return self._remember(name, self._load(name))
+
+    def _remember(self, name, record):
+        self._decoded[name] = record
+        if self.on_load is not None:
+            self.on_load(record)
+        return record
+
+    def __setitem__(self, name, record):
+        if name not in self._new and not self._is_stored(name):
+            self._new[name] = None
+        self._loaded[name] = record
+        self._decoded.pop(name, None)
+
+    def pin(self, name, record):
+        """Keep a changed record in memory, the storage only has its old version."""
+        self._loaded[name] = record
+
+    def is_changed(self, name) -> bool:
+        """True if the stored version of name is out of date: it was added, replaced, changed or deleted."""
+        return name in self._loaded or name in self._deleted
+
+    def changed_records(self):
+        """The records added, replaced or changed so far."""
+        return self._loaded.values()
+
+    def __delitem__(self, name):
+        if name in self._new:
+            del self._new[name]
+        elif self._is_stored(name):
+            self._deleted.add(name)
+        else:
+            raise KeyError(name)
+        self._loaded.pop(name, None)
+        self._decoded.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._loaded or name in self._new or self._is_stored(name)
+
+    def __iter__(self):
+        for name in self._stored_names():
+            if name not in self._deleted:
+                yield name
+        yield from list(self._new)
+
+    def _iter_items(self):
+        for name, entry in self._stored_entries():
+            if name in self._deleted:
+                continue
+            record = self._loaded.get(name)
+            if record is None:
+                record = self._decoded.get(name)
+            if record is None:
+                record = self._remember(name, self._decode(entry))
+            yield name, record
+        for name in list(self._new):
+            yield name, self._loaded[name]
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def __len__(self):
+        return self._stored_len() - len(self._deleted) + len(self._new)
+
+    def loaded_count(self) -> int:
+        """Number of records kept in memory because they were added, replaced or changed."""
+        return len(self._loaded)
@@ -1,6 +1,15 @@
+import unicodedata
 from classes.field import Field
 
+
+def normalize_name(name: str) -> str:
+    """Lookup key of a name: Unicode NFKC, case folded, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", name).casefold().split())
+
+
 class Name(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         if not value:
             raise ValueError("Name cannot be empty")
@@ -1,18 +1,46 @@
-import uuid
+import os
+import sys
+
+
+def new_note_id() -> str:
+    # 8 random hex digits, as the uuid4 based IDs were
+    return os.urandom(4).hex()
+
 
 class Note:
-    def __init__(self, content: str):
+    __slots__ = ("id", "content", "tags", "_owner")
+
+    def __init__(self, content: str, note_id: str = None):
         if not content or not content.strip():
             raise ValueError("Content cannot be empty")
         
-        self.id = uuid.uuid4().hex[:8]
+        # The address book passes an ID it checked to be unused
+        self.id = note_id or new_note_id()
         self.content = content.strip()
         self.tags = []
+        # Record the note belongs to
+        self._owner = None
+
+    def __getstate__(self):
+        # The owning record sets itself as _owner when it is loaded
+        return {"id": self.id, "content": self.content, "tags": self.tags}
+
+    def __setstate__(self, state):
+        self.id = state["id"]
+        self.content = state["content"]
+        self.tags = [sys.intern(tag) for tag in state.get("tags", [])]
+        self._owner = None
+    
+    def _touch(self, field=None, old=None, new=None):
+        if self._owner is not None:
+            self._owner._touch(field, old, new, self)
     
     def edit(self, new_content: str):
         if not new_content.strip():
             raise ValueError("Content cannot be empty")
+        old_content = self.content
         self.content = new_content.strip()
+        self._touch("content", old_content, self.content)
     
     def add_tag(self, tag: str):
         tag_clean = tag.strip().lower()
@@ -21,12 +49,16 @@ class Note:
         if ' ' in tag_clean:
             raise ValueError("Tag cannot contain spaces")
         if tag_clean not in self.tags:
+            # Many notes share a few tags, interning keeps one string per tag
+            tag_clean = sys.intern(tag_clean)
             self.tags.append(tag_clean)
+            self._touch("tag", None, tag_clean)
     
     def remove_tag(self, tag: str):
         tag_lower = tag.strip().lower()
         if tag_lower in self.tags:
             self.tags.remove(tag_lower)
+            self._touch("tag", tag_lower, None)
             return True
         return False
     
@@ -1,7 +1,32 @@
 from classes.field import Field
 
 class Phone(Field):
-    def __init__(self, value):
-     if len(value) != 10 or not value.isdigit():
-         raise ValueError("Phone number must be 10 digits")
-     super().__init__(value)
\ No newline at end of file
+    __slots__ = ()
+    # The value slot holds the number as an int, half the size of the 10 digit string
+    _number = Field.value
+
+    @property
+    def value(self):
+        number = self._number
+        return number if isinstance(number, str) else f"{number:010d}"
+
+    @value.setter
+    def value(self, value):
+        if len(value) != 10 or not value.isascii() or not value.isdigit():
+            raise ValueError("Phone number must be 10 digits")
+        self._number = int(value)
+
+    def __setstate__(self, state):
+        value = state["value"]
+        if value.isdigit() and not value.isascii():
+            # Older versions accepted any Unicode digits (١٢٣..., ²²²...), such numbers stay text
+            self._number = value
+        else:
+            self.value = value
+
+    @classmethod
+    def stored(cls, value):
+        """A phone number read back from storage, which may predate the ASCII digits check."""
+        phone = cls.__new__(cls)
+        phone.__setstate__({"value": value})
+        return phone
@@ -0,0 +1,47 @@
+from bisect import bisect_left, insort
+
+# Sorts after every character a key can contain
+_MAX_CHAR = "\U0010ffff"
+
+
+class PrefixIndex:
+    """
+    Sorted array of distinct keys answering prefix queries.
+
+    Keys starting with a prefix form one contiguous slice of the array,
+    found with two binary searches, so a query costs O(log n) plus the
+    keys it returns.
+    """
+
+    def __init__(self, keys=()):
+        self._keys = sorted(set(keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        position = bisect_left(self._keys, key)
+        return position < len(self._keys) and self._keys[position] == key
+
+    def add(self, key):
+        if key not in self:
+            insort(self._keys, key)
+
+    def remove(self, key):
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def _bounds(self, prefix):
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + _MAX_CHAR)
+
+    def count(self, prefix: str) -> int:
+        start, end = self._bounds(prefix)
+        return end - start
+
+    def keys(self, prefix: str, limit=None) -> list:
+        """Keys starting with prefix in sorted order, at most limit of them."""
+        start, end = self._bounds(prefix)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._keys[start:end]
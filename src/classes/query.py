@@ -0,0 +1,155 @@
+"""
+Compound contact queries such as `name:jo AND address:london AND birthday:12`.
+
+Each predicate is a substring match on one field. The planner starts from
+the indexed predicate with the fewest estimated matches, intersects the
+other indexed predicates when that is cheaper than checking the
+candidates one by one, and checks everything else as a filter on the
+remaining candidates. Only a query without any usable index scans the
+whole book.
+"""
+
+from collections import namedtuple
+
+FIELDS = ("name", "phone", "address", "birthday", "email")
+
+# How an index answers a predicate: index name, estimated matches, function returning the matching names
+IndexLookup = namedtuple("IndexLookup", "index estimate fetch")
+# Checking one contact against a predicate costs about as much as reading this many index entries
+FILTER_COST = 4
+
+
+class Predicate:
+    """field:value, matching contacts whose field contains value (ignoring case)."""
+
+    def __init__(self, field: str, value: str):
+        field = field.lower()
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field: {field}. Expected fields to search are: {', '.join(FIELDS)}.")
+        value = value.strip().lower()
+        if not value:
+            raise ValueError(f"Nothing to search for in {field}")
+        self.field = field
+        self.value = value
+        # "067*" matches phones starting with 067
+        self.prefix = value[:-1] if field == "phone" and value.endswith("*") else None
+        self.matches = self._matcher()
+
+    def _matcher(self):
+        value = self.value
+        if self.field == "name":
+            return lambda record: value in record.name.value.lower()
+        if self.field == "phone":
+            if self.prefix is not None:
+                return lambda record: any(p.value.startswith(self.prefix) for p in record.phones)
+            return lambda record: any(value in p.value for p in record.phones)
+        if self.field == "address":
+            return lambda record: any(value in a.value.lower() for a in record.addresses)
+        if self.field == "birthday":
+            return lambda record: bool(record.birthday) and value in record.birthday.value.strftime("%d.%m.%Y")
+        return lambda record: bool(record.email) and value in record.email.value.lower()
+
+    def __str__(self):
+        return f"{self.field}:{self.value}"
+
+
+def parse_query(args) -> list[Predicate]:
+    """
+    Predicates of `field:value AND field:value ...`. Words without a field
+    continue the value before them, so `address:baker street` works.
+    The old `<field> <string>` form is accepted as a single predicate.
+    """
+    args = list(args)
+    if len(args) >= 2 and ":" not in args[0]:
+        return [Predicate(args[0], " ".join(args[1:]))]
+
+    parts = []
+    for token in args:
+        if token.upper() == "AND":
+            continue
+        if token.upper() == "OR":
+            raise ValueError("Only AND is supported between conditions")
+        field, separator, value = token.partition(":")
+        if separator and field.lower() in FIELDS:
+            parts.append([field, value])
+        elif parts:
+            parts[-1][1] += " " + token
+        else:
+            raise ValueError(f"Expected <field>:<value>, got '{token}'. Fields are: {', '.join(FIELDS)}.")
+    if not parts:
+        raise ValueError("Usage: find <field>:<value> [AND <field>:<value> ...]")
+    return [Predicate(field, value) for field, value in parts]
+
+
+class Plan:
+    """Steps chosen for a query, each with the estimated number of contacts it touches."""
+
+    def __init__(self):
+        self.steps = []
+        self.cost = 0
+
+    def add(self, description: str, cost: int):
+        self.steps.append(description)
+        self.cost += cost
+
+    def lines(self) -> list[str]:
+        lines = [f"Plan, estimated cost {self.cost}:"]
+        lines.extend(f"  {number}. {step}" for number, step in enumerate(self.steps, 1))
+        return lines
+
+
+def _plan(book, predicates):
+    """Returns (plan, start lookup or None, lookups to intersect, predicates to filter)."""
+    plan = Plan()
+    lookups = []
+    filters = []
+    for predicate in predicates:
+        lookup = book._index_lookup(predicate)
+        if lookup is None:
+            filters.append(predicate)
+        else:
+            lookups.append((predicate, lookup))
+    lookups.sort(key=lambda item: item[1].estimate)
+
+    total = len(book)
+    start = None
+    intersect = []
+    if lookups:
+        predicate, start = lookups[0]
+        size = start.estimate
+        plan.add(f"{start.index} lookup {predicate}: ~{size} contacts", size)
+        for predicate, lookup in lookups[1:]:
+            # Reading the other index result is cheaper than checking every candidate
+            if lookup.estimate < FILTER_COST * size:
+                intersect.append(lookup)
+                # Conditions are assumed independent
+                size = min(size, -(-size * lookup.estimate // max(total, 1)))
+                plan.add(f"intersect with {lookup.index} lookup {predicate}: ~{size} contacts", lookup.estimate)
+            else:
+                filters.append(predicate)
+    else:
+        size = total
+        plan.add(f"scan all {size} contacts", size)
+    for predicate in filters:
+        plan.add(f"filter {predicate} on ~{size} contacts", FILTER_COST * size)
+    return plan, start, intersect, filters
+
+
+def describe_plan(book, predicates) -> list[str]:
+    return _plan(book, predicates)[0].lines()
+
+
+def execute(book, predicates):
+    """Yield the contacts matching every predicate, following the plan."""
+    _, start, intersect, filters = _plan(book, predicates)
+    if start is None:
+        records = book.data.values()
+    else:
+        names = list(start.fetch())
+        for lookup in intersect:
+            found = set(lookup.fetch())
+            names = [name for name in names if name in found]
+        records = (book.data[name] for name in names)
+    for record in records:
+        if all(p.matches(record) for p in filters):
+            yield record
@@ -10,6 +10,9 @@ class EmailFieldError(Exception):
     pass
 
 class Record:
+    # __weakref__ lets lazily loaded books share decoded records without keeping them alive
+    __slots__ = ("name", "phones", "birthday", "notes", "addresses", "email", "_book", "__weakref__")
+
     def __init__(self, name):
         self.name = Name(name)
         self.phones = []
@@ -17,20 +20,48 @@ class Record:
         self.notes = []
         self.addresses = []
         self.email = None
+        # AddressBook that owns the record, told about every change
+        self._book = None
+
+    def __getstate__(self):
+        # A dict like the one records had before slots, without the owning book
+        return {attribute: getattr(self, attribute) for attribute in self.__slots__ if attribute not in ("_book", "__weakref__")}
+
+    def __setstate__(self, state):
+        # Records pickled by older versions may miss newer fields
+        state.setdefault("notes", [])
+        state.setdefault("addresses", [])
+        state.setdefault("email", None)
+        for attribute, value in state.items():
+            setattr(self, attribute, value)
+        self._book = None
+        for note in self.notes:
+            note._owner = self
+
+    def _touch(self, field=None, old=None, new=None, note=None):
+        """Tell the address book the record changed, field/old/new let it update its indexes."""
+        if self._book is not None:
+            self._book._record_changed(self, field, old, new, note)
 
     def add_phone(self, phone):
-        self.phones.append(Phone(phone))
+        phone = Phone(phone)
+        self.phones.append(phone)
+        self._touch("phone", None, phone.value)
 
     def add_address(self, address):
         self.addresses.append(Address(address))
+        self._touch("address")
 
     def add_birthday(self, birthday):
+        old = self.birthday.value if self.birthday else None
         self.birthday = Birthday(birthday)
+        self._touch("birthday", old, self.birthday.value)
 
     def remove_phone(self, phone):
         for phone_number in self.phones:
          if phone_number.value == phone:
             self.phones.remove(phone_number)
+            self._touch("phone", phone, None)
             return True
         return False
     
@@ -38,12 +69,15 @@ class Record:
         for addr in self.addresses:
          if addr.value.lower() == address.lower():
             self.addresses.remove(addr)
+            self._touch("address")
             return True
         return False
     
     def remove_birthday(self, name):
         if self.name and self.birthday:
+            old = self.birthday.value
             self.birthday=None
+            self._touch("birthday", old, None)
             return True
         return False
 
@@ -51,6 +85,7 @@ class Record:
         for phone_number in self.phones:
             if phone_number.value == phone:
              phone_number.value = Phone(new_phone).value
+             self._touch("phone", phone, phone_number.value)
              return True
         return False
     
@@ -58,12 +93,15 @@ class Record:
         for ad in self.addresses:
             if ad.value.lower() == addr.lower():
              ad.value = Address(new_addr).value
+             self._touch("address")
              return True
         return False
     
     def edit_birthday(self, bday):
         if self.birthday:
+            old = self.birthday.value
             self.birthday = Birthday(bday)
+            self._touch("birthday", old, self.birthday.value)
             return True
         else:
             return False
@@ -77,27 +115,49 @@ class Record:
     def add_email(self, email):
         if not self.email:
             self.email = Email(email)
+            self._touch("email", None, self.email.value)
             return True
         else:
             raise EmailFieldError("There is already an email for this contact. Please use change-email command to update it.")
 
     def edit_email(self, new_email):
         if self.email:
+            old_email = self.email.value
             self.email = Email(new_email)
+            self._touch("email", old_email, self.email.value)
             return True
         else:
             raise EmailFieldError("There is no email for this contact. Please use add-email command to add one.")
 
     def delete_email(self):
         if self.email:
+            old_email = self.email.value
             self.email = None
+            self._touch("email", old_email, None)
             return True
         else:
             raise EmailFieldError("There is no email for this contact. Please use add-email command to add one.")
 
+    def merge(self, other: "Record"):
+        """Copy phones, addresses, birthday and email this record does not have yet from another record."""
+        for phone in other.phones:
+            if not self.find_phone(phone.value):
+                self.add_phone(phone.value)
+        known = {a.value.lower() for a in self.addresses}
+        for address in other.addresses:
+            if address.value.lower() not in known:
+                self.add_address(address.value)
+        if other.birthday and not self.birthday:
+            self.add_birthday(other.birthday.value.strftime("%d.%m.%Y"))
+        if other.email and not self.email:
+            self.add_email(other.email.value)
+
     def add_note(self, content: str):
-        note = Note(content)
+        note_id = self._book.new_note_id() if self._book is not None else None
+        note = Note(content, note_id)
+        note._owner = self
         self.notes.append(note)
+        self._touch("note", None, note)
         return note
 
     def find_note_by_id(self, note_id: str):
@@ -120,6 +180,8 @@ class Record:
         note = self.find_note_by_id(note_id)
         if note:
             self.notes.remove(note)
+            note._owner = None
+            self._touch("note", note, None)
             return True
         return False
 
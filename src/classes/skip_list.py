@@ -0,0 +1,127 @@
+import random
+
+MAX_LEVELS = 24
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        # Number of level 0 steps to the next node on each level
+        self.width = [0] * levels
+
+
+class SkipList:
+    """
+    Sorted collection of unique keys with O(log n) insertion, removal,
+    lookup by value and lookup by position (an indexable skip list).
+
+    Every node keeps, for each of its levels, how many keys the link skips,
+    so the n-th key is found by the same top-down walk as a key is.
+    """
+
+    def __init__(self, keys=()):
+        self._head = _Node(None, MAX_LEVELS)
+        # None marks the end of a level, its width counts up to one past the last key
+        self._head.width = [1] * MAX_LEVELS
+        self._link_sorted(sorted(set(keys)))
+
+    @staticmethod
+    def _random_levels():
+        levels = 1
+        while levels < MAX_LEVELS and random.getrandbits(1):
+            levels += 1
+        return levels
+
+    def _link_sorted(self, keys):
+        """Build the levels over sorted distinct keys in one pass instead of adding them one by one."""
+        last = [self._head] * MAX_LEVELS
+        last_positions = [-1] * MAX_LEVELS
+        for position, key in enumerate(keys):
+            node = _Node(key, self._random_levels())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_positions[level]
+                last[level] = node
+                last_positions[level] = position
+        for level in range(MAX_LEVELS):
+            last[level].width[level] = len(keys) - last_positions[level]
+        self._size = len(keys)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+    def _path(self, key):
+        """Last node before key on every level and its position (head is position -1)."""
+        chain = [None] * MAX_LEVELS
+        positions = [0] * MAX_LEVELS
+        node = self._head
+        position = -1
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            positions[level] = position
+        return chain, positions
+
+    def __contains__(self, key):
+        following = self._path(key)[0][0].next[0]
+        return following is not None and following.key == key
+
+    def add(self, key):
+        chain, positions = self._path(key)
+        following = chain[0].next[0]
+        if following is not None and following.key == key:
+            return
+        levels = self._random_levels()
+        node = _Node(key, levels)
+        position = positions[0] + 1
+        for level in range(levels):
+            previous = chain[level]
+            node.next[level] = previous.next[level]
+            previous.next[level] = node
+            distance = position - positions[level]
+            node.width[level] = previous.width[level] - distance + 1
+            previous.width[level] = distance
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            return
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+        for level in range(len(node.next), MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def bisect_left(self, key) -> int:
+        """Position of the first key not less than key."""
+        return self._path(key)[1][0] + 1
+
+    def iter_from(self, index: int, stop=None):
+        """Keys from position index on, in order, ending before the first key greater than stop."""
+        if index >= self._size:
+            return
+        node = self._head
+        remaining = index + 1
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        while node is not None:
+            if stop is not None and node.key > stop:
+                return
+            yield node.key
+            node = node.next[0]
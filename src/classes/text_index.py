@@ -0,0 +1,89 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+# BM25 parameters: term frequency saturation and document length normalization
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class TextIndex:
+    """
+    Inverted index from words to the notes that contain them.
+
+    Each note is tokenized once when it is added, queries only read the
+    postings of their terms and rank the matching notes with BM25.
+    """
+
+    def __init__(self):
+        # term -> {note: count of the term in the note}
+        self._postings = {}
+        # note -> Counter of its terms, kept to remove the note without its old text
+        self._terms = {}
+        # note -> number of words in it
+        self._lengths = {}
+        self._total_length = 0
+
+    def add(self, note):
+        if note in self._terms:
+            self.remove(note)
+        terms = Counter(tokenize(note.content))
+        self._terms[note] = terms
+        self._lengths[note] = sum(terms.values())
+        self._total_length += self._lengths[note]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[note] = count
+
+    def remove(self, note):
+        terms = self._terms.pop(note, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(note)
+        for term in terms:
+            notes = self._postings[term]
+            del notes[note]
+            if not notes:
+                del self._postings[term]
+
+    def search(self, query: str, match_all=True, limit=None) -> list[tuple]:
+        """
+        Notes matching the words of the query as (note, score), best first.
+        match_all requires every word (AND), otherwise any word is enough (OR).
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._terms:
+            return []
+        postings = [self._postings.get(term, {}) for term in terms]
+        if match_all:
+            if not all(postings):
+                return []
+            # Intersect starting from the rarest term
+            smallest = min(postings, key=len)
+            candidates = [note for note in smallest if all(note in p for p in postings)]
+        else:
+            candidates = list(dict.fromkeys(note for p in postings for note in p))
+
+        count = len(self._terms)
+        average_length = self._total_length / count or 1
+        idf = [math.log(1 + (count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+
+        def score(note):
+            norm = K1 * (1 - B + B * self._lengths[note] / average_length)
+            total = 0.0
+            for weight, p in zip(idf, postings):
+                frequency = p.get(note)
+                if frequency:
+                    total += weight * frequency * (K1 + 1) / (frequency + norm)
+            return total
+
+        scored = ((note, score(note)) for note in candidates)
+        if limit is None:
+            return sorted(scored, key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, scored, key=lambda item: item[1])
@@ -0,0 +1,60 @@
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """
+    Substring index from three-letter sequences to the contacts whose texts contain them.
+
+    Every contact has one or more lowercased texts (its name, its addresses).
+    A query of three or more letters only checks the contacts that have all
+    of its trigrams, shorter queries check the stored texts without
+    lowercasing them again.
+    """
+
+    def __init__(self):
+        # trigram -> ordered set (dict) of contact names
+        self._postings = {}
+        # contact name -> its lowercased texts
+        self._texts = {}
+
+    def set(self, name: str, texts):
+        """Index the texts of a contact, replacing the ones it had."""
+        self.remove(name)
+        texts = tuple(text.lower() for text in texts)
+        if not texts:
+            return
+        self._texts[name] = texts
+        for trigram in set().union(*(trigrams(text) for text in texts)):
+            self._postings.setdefault(trigram, {})[name] = None
+
+    def remove(self, name: str):
+        texts = self._texts.pop(name, None)
+        if texts is None:
+            return
+        for trigram in set().union(*(trigrams(text) for text in texts)):
+            names = self._postings[trigram]
+            del names[name]
+            if not names:
+                del self._postings[trigram]
+
+    def estimate(self, string: str) -> int:
+        """Upper bound of the number of contacts search(string) returns, without running it."""
+        query = trigrams(string.lower())
+        if not query:
+            return len(self._texts)
+        return min(len(self._postings.get(trigram, ())) for trigram in query)
+
+    def search(self, string: str) -> list[str]:
+        """Names of the contacts with a text containing string, ignoring case."""
+        string = string.lower()
+        query = trigrams(string)
+        if query:
+            postings = [self._postings.get(trigram) for trigram in query]
+            if not all(postings):
+                return []
+            smallest = min(postings, key=len)
+            candidates = [name for name in smallest if all(name in p for p in postings)]
+        else:
+            candidates = self._texts
+        return [name for name in candidates if any(string in text for text in self._texts[name])]
@@ -1,31 +1,51 @@
-from difflib import get_close_matches
-from typing import Optional
+from functools import lru_cache
+
+from classes.fuzzy_index import FuzzyIndex
+from commands.registry import get_all_commands
+
+# Distinct mistyped commands remembered with their suggestions
+CACHE_SIZE = 256
 
 
 class CommandSuggester:
     """
-    Suggests commands based on user input using fuzzy matching.
+    Suggests commands based on user input, from the command names of the registry.
+
+    The names go into a symmetric delete index (classes.fuzzy_index) that
+    stores every deletion of up to max_distance letters of a whole name,
+    so a typo is answered with a few dict lookups and edit distances to
+    the handful of names found. The index is built on the first typo,
+    and suggestions for a typo are remembered for the next time.
     """
-    
-    def __init__(self):
-        self.commands = [
-            "add", "delete", "all", "hello", "help", "close", "exit",
-            "add-birthday", "add-address", "add-email", "add-note", "add-tag",
-            "change-phone", "change-birthday", "change-address", "change-email",
-            "show-phone", "show-birthday", "show-address", "show-email", "show-notes", "show-notes-sorted",
-            "show-birthdays-in", "show-celebration-day",
-            "delete-phone", "delete-birthday", "delete-address", "delete-email", "delete-note",
-            "find", "find-notes", "find-by-tag", "find-all-by-tag",
-            "edit-note", "remove-tag", "birthdays"
+
+    def __init__(self, commands=None, max_distance=2):
+        self.commands = list(commands if commands is not None else get_all_commands())
+        self.max_distance = max_distance
+        self._index = None
+        self._suggest = lru_cache(maxsize=CACHE_SIZE)(self._search)
+
+    def _fuzzy(self) -> FuzzyIndex:
+        if self._index is None:
+            # Command names are few and short enough to store with all their deletions
+            self._index = FuzzyIndex(self.commands, self.max_distance, stored_deletes=self.max_distance)
+        return self._index
+
+    def _search(self, word: str) -> tuple:
+        # One typo is all a very short command can take before everything matches
+        max_distance = 1 if len(word) <= 4 else self.max_distance
+        scored = [
+            (command, round(1 - distance / max(len(word), len(command)), 2))
+            for distance, command in self._fuzzy().search(word, max_distance)
         ]
-    
-    def suggest_command(self, user_input: str) -> Optional[str]:
+        return tuple(sorted(scored, key=lambda item: (-item[1], item[0])))
+
+    def suggest(self, user_input: str, limit=3) -> list[tuple[str, float]]:
+        """Up to limit (command, score) pairs, best first. Scores run from 0 to 1 for an exact match."""
         if not user_input or not user_input.strip():
-            return None
-        
-        # get_close_matches returns a list of closest matches
-        # n=1 - return only the best variant
-        # cutoff=0.6 - minimum similarity (from 0 to 1)
-        matches = get_close_matches(user_input.lower(), self.commands, n=1, cutoff=0.6)
-        
-        return matches[0] if matches else None
+            return []
+        return list(self._suggest(user_input.strip().lower())[:limit])
+
+    def suggest_command(self, user_input: str):
+        """The closest command, or None if no command is close enough."""
+        suggestions = self.suggest(user_input, limit=1)
+        return suggestions[0][0] if suggestions else None
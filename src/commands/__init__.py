@@ -1,26 +1,86 @@
-from commands.contact_commands import add_contact, delete_contact, find, get_all_contacts
-from commands.phone_commands import update_contact, get_contact, delete_phone
-from commands.address_commands import add_address, get_address, update_address, delete_address
-from commands.birthday_commands import add_birthday, get_birthday, update_birthday, delete_birthday, birthdays, birthdays_in_range
-from commands.note_commands import add_note, show_notes, find_notes, edit_note, delete_note, add_tag, remove_tag, find_by_tag, find_all_by_tag, show_notes_sorted
-from commands.email_commands import add_email, update_email, show_email, delete_email
-from commands.general_commands import help_command, hello_command, exit_command
+"""
+Command handlers, imported from their modules on first access (PEP 562)
+so that importing the package or the registry stays cheap.
+"""
+
+from importlib import import_module
+
+# Handler name -> module that defines it
+_MODULES = {
+    "add_contact": "contact_commands",
+    "delete_contact": "contact_commands",
+    "find": "contact_commands",
+    "find_by_phone": "contact_commands",
+    "find_phone_prefix": "contact_commands",
+    "find_by_email": "contact_commands",
+    "get_all_contacts": "contact_commands",
+    "update_contact": "phone_commands",
+    "get_contact": "phone_commands",
+    "delete_phone": "phone_commands",
+    "add_address": "address_commands",
+    "get_address": "address_commands",
+    "update_address": "address_commands",
+    "delete_address": "address_commands",
+    "add_birthday": "birthday_commands",
+    "get_birthday": "birthday_commands",
+    "update_birthday": "birthday_commands",
+    "delete_birthday": "birthday_commands",
+    "birthdays": "birthday_commands",
+    "birthdays_in_range": "birthday_commands",
+    "birthday_stats": "birthday_commands",
+    "add_note": "note_commands",
+    "show_notes": "note_commands",
+    "find_notes": "note_commands",
+    "search_notes": "note_commands",
+    "edit_note": "note_commands",
+    "delete_note": "note_commands",
+    "add_tag": "note_commands",
+    "remove_tag": "note_commands",
+    "find_by_tag": "note_commands",
+    "find_all_by_tag": "note_commands",
+    "show_notes_sorted": "note_commands",
+    "list_tags": "note_commands",
+    "add_email": "email_commands",
+    "update_email": "email_commands",
+    "show_email": "email_commands",
+    "delete_email": "email_commands",
+    "import_file": "io_commands",
+    "export_file": "io_commands",
+    "help_command": "general_commands",
+    "hello_command": "general_commands",
+    "exit_command": "general_commands",
+}
 
 __all__ = [
     # Contact commands
-    'add_contact', 'delete_contact', 'find', 'get_all_contacts',
+    'add_contact', 'delete_contact', 'find', 'find_by_phone', 'find_phone_prefix', 'find_by_email', 'get_all_contacts',
     # Phone commands
     'update_contact', 'get_contact', 'delete_phone',
     # Address commands
     'add_address', 'get_address', 'update_address', 'delete_address',
     # Birthday commands
-    'add_birthday', 'get_birthday', 'update_birthday', 'delete_birthday', 'birthdays', 'birthdays_in_range',
+    'add_birthday', 'get_birthday', 'update_birthday', 'delete_birthday', 'birthdays', 'birthdays_in_range', 'birthday_stats',
     # Note commands
-    'add_note', 'show_notes', 'find_notes', 'edit_note', 'delete_note', 
-    'add_tag', 'remove_tag', 'find_by_tag', 'find_all_by_tag', 'show_notes_sorted',
+    'add_note', 'show_notes', 'find_notes', 'search_notes', 'edit_note', 'delete_note', 
+    'add_tag', 'remove_tag', 'find_by_tag', 'find_all_by_tag', 'show_notes_sorted', 'list_tags',
     # Email commands
     'add_email', 'update_email', 'show_email', 'delete_email',
+    # Import/export commands
+    'import_file', 'export_file',
     # General commands
     'help_command', 'hello_command', 'exit_command',
 ]
 
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"commands.{module}"), name)
+    # Cache it so later lookups do not come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
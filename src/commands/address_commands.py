@@ -3,11 +3,10 @@
 from colorama import Fore
 from classes.address_book import AddressBook
 from exceptions import (
-    ContactNotFoundError,
     AddressNotFoundError,
     InsufficientArgumentsError,
 )
-from commands.decorators import input_error
+from commands.decorators import input_error, contact_not_found
 
 
 @input_error
@@ -20,7 +19,7 @@ def add_address(args, book: AddressBook):
     address = " ".join(args[1:])
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     record.add_address(address)
     return f"{Fore.GREEN}Address added"
@@ -35,7 +34,7 @@ def get_address(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     address_str = "; ".join(a.value for a in record.addresses) if record.addresses else "N/A"
     lines = [
@@ -63,7 +62,7 @@ def update_address(args, book: AddressBook):
     
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     if old_addr.lower() not in [a.value.lower() for a in record.addresses]:
         raise AddressNotFoundError(f"Contact {name} has no address {old_addr}")
@@ -84,7 +83,7 @@ def delete_address(args, book: AddressBook):
     address = " ".join(args[1:])
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     if not record.remove_address(address):
         raise AddressNotFoundError(f"Address '{address}' not found")
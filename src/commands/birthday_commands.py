@@ -7,7 +7,8 @@ from exceptions import (
     BirthdayNotFoundError,
     InsufficientArgumentsError,
 )
-from commands.decorators import input_error
+from commands.decorators import input_error, contact_not_found
+from commands.options import pop_option
 
 
 @input_error
@@ -19,7 +20,7 @@ def add_birthday(args, book: AddressBook):
     name, birthday = args
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     record.add_birthday(birthday)
     return f"{Fore.GREEN}Birthday added"
@@ -34,7 +35,7 @@ def get_birthday(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     birthday_str = record.birthday.value.strftime("%d.%m.%Y") if record.birthday else "N/A"
     lines = [
@@ -54,7 +55,7 @@ def update_birthday(args, book: AddressBook):
     name, new_bday = args
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     if not record.edit_birthday(new_bday):
         raise BirthdayNotFoundError(f"Contact '{name}' has no birthday to update")
@@ -71,7 +72,7 @@ def delete_birthday(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     if not record.remove_birthday(name):
         raise BirthdayNotFoundError(f"Contact '{name}' has no birthday date")
@@ -120,3 +121,23 @@ def birthdays_in_range(args, book: AddressBook):
         )
     return "\n".join(lines)
 
+
+@input_error
+def birthday_stats(args, book: AddressBook):
+    """Show how many birthdays fall into each week or month of the next days."""
+    args = list(args)
+    by = pop_option(args, "--by", ("week", "month")) or "week"
+    try:
+        days = int(args[0]) if args else 90
+    except ValueError:
+        raise ValueError("Days must be an integer number")
+    if days < 0:
+        raise ValueError("Days must not be negative")
+
+    buckets = book.birthday_stats(days, by)
+    total = sum(count for _, _, count in buckets)
+    lines = [f"{Fore.MAGENTA}Birthdays in the next {days} days by {by}:"]
+    for first, last, count in buckets:
+        lines.append(f"{first.strftime('%d.%m.%Y')} - {last.strftime('%d.%m.%Y')}: {count}")
+    lines.append(f"Total: {total}")
+    return "\n".join(lines)
@@ -0,0 +1,17 @@
+"""Yes/no questions asked in the middle of a command, answered automatically in batch mode."""
+
+# None asks the user, True or False answers every question without asking
+_auto_answer = None
+
+
+def set_auto_answer(answer):
+    """Answer every confirmation with answer (True/False) from now on, None to ask again."""
+    global _auto_answer
+    _auto_answer = answer
+
+
+def confirm(prompt: str) -> bool:
+    """True if the user answers yes to prompt."""
+    if _auto_answer is not None:
+        return _auto_answer
+    return input(prompt).strip().lower() == "yes"
@@ -1,14 +1,19 @@
 """Commands for managing contacts."""
 
+from itertools import chain
 from colorama import Fore
 from classes.address_book import AddressBook
 from classes.record import Record
+from classes.query import parse_query
 from exceptions import (
     ContactNotFoundError,
     InsufficientArgumentsError,
     PhoneAlreadyExistsError,
 )
-from commands.decorators import input_error
+from commands.confirmation import confirm
+from commands.decorators import input_error, contact_not_found
+from commands.options import pop_flag, pop_number, pop_option
+from commands.pagination import PAGING_USAGE, paginate, peek, pop_paging
 
 
 @input_error
@@ -19,13 +24,17 @@ def add_contact(args, book: AddressBook):
     
     name, phone = args
     record = book.find(name)
+    # Checked before a new contact is added, so a refused number leaves no contact behind
+    owners = book.find_by_phone(phone) if phone else []
+    if record is not None and record in owners:
+        raise PhoneAlreadyExistsError("This phone number already exists.")
+    if owners:
+        raise PhoneAlreadyExistsError(f"This phone number already belongs to {owners[0].name.value}.")
     if record is None:
         record = Record(name)
         book.add_record(record)
         message = f"{Fore.GREEN}Contact added"
     if phone:
-        if any(phone == p.value for p in record.phones):
-            raise PhoneAlreadyExistsError("This phone number already exists.")
         record.add_phone(phone)
         message = f"{Fore.GREEN}Contact updated"
     return message
@@ -40,10 +49,10 @@ def delete_contact(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
-    confirmation = input(f"{Fore.YELLOW}Are you sure? You are going to delete the entire contact '{name}'? (yes/no):")
-    if confirmation.strip().lower() != "yes":
+    name = record.name.value
+    if not confirm(f"{Fore.YELLOW}Are you sure? You are going to delete the entire contact '{name}'? (yes/no):"):
         return f"{Fore.CYAN} Deletion cancelled."
     
     if book.delete(name):
@@ -54,44 +63,120 @@ def delete_contact(args, book: AddressBook):
 
 @input_error
 def find(args, book: AddressBook):
-    """Find contacts by field and string."""
-    if len(args) < 2:
-        raise InsufficientArgumentsError("Usage: find <field> <string>")
-    
-    field = args[0]
-    string = args[1]
-    lines = []
-    records = book.find_by_any_arg(field, string)
+    """Find contacts by one field, or by several joined with AND."""
+    args, offset, limit = pop_paging(args)
+    explain = pop_flag(args, "--explain")
+    if len(args) < 1:
+        raise InsufficientArgumentsError(
+            "Usage: find <field> <string> or find <field>:<string> [AND <field>:<string> ...] "
+            f"[--explain] {PAGING_USAGE}"
+        )
 
-    if len(records) == 0:
-        raise ContactNotFoundError(f"Contacts with the field {field} that contain {string} not found.")
-    
-    for r in records:
-        lines.append(str(r))
-    return "\n".join(lines)
+    predicates = parse_query(args)
+    lines = book.explain_query(predicates) if explain else []
+    # Matches are found and formatted while they are printed
+    records = peek(paginate(book.iter_query(predicates), offset, limit))
+
+    if records is None:
+        if offset:
+            message = "No contacts on this page."
+        elif len(predicates) == 1:
+            message = f"Contacts with the field {predicates[0].field} that contain {predicates[0].value} not found."
+        else:
+            message = f"No contacts match {' AND '.join(str(p) for p in predicates)}."
+        if explain:
+            return "\n".join(lines + [f"{Fore.RED}{message}"])
+        raise ContactNotFoundError(message)
+
+    return chain(lines, (str(r) for r in records))
+
+
+@input_error
+def find_by_phone(args, book: AddressBook):
+    """Find contacts with exactly this phone number."""
+    if len(args) < 1:
+        raise InsufficientArgumentsError("Usage: find-by-phone <phone>")
+
+    phone = args[0]
+    records = book.find_by_phone(phone)
+    if not records:
+        raise ContactNotFoundError(f"No contact with phone {phone}")
+    return "\n".join(str(r) for r in records)
+
+
+@input_error
+def find_phone_prefix(args, book: AddressBook):
+    """Find contacts with a phone number starting with a prefix."""
+    args = list(args)
+    count_only = pop_flag(args, "--count")
+    limit = pop_number(args, "--limit", 1)
+
+    if len(args) < 1:
+        raise InsufficientArgumentsError("Usage: find-phone-prefix <prefix> [--count] [--limit N]")
+
+    prefix = args[0]
+    if not prefix.isdigit():
+        raise ValueError("Phone prefix must contain only digits")
+    if count_only:
+        return f"{Fore.GREEN}{book.count_phone_prefix(prefix)} phone number(s) start with {prefix}"
+
+    records = book.find_by_phone_prefix(prefix, limit)
+    if not records:
+        raise ContactNotFoundError(f"No contact with a phone starting with {prefix}")
+    return "\n".join(str(r) for r in records)
+
+
+@input_error
+def find_by_email(args, book: AddressBook):
+    """Find contacts with exactly this email."""
+    if len(args) < 1:
+        raise InsufficientArgumentsError("Usage: find-by-email <email>")
+
+    email = args[0]
+    records = book.find_by_email(email)
+    if not records:
+        raise ContactNotFoundError(f"No contact with email {email}")
+    return "\n".join(str(r) for r in records)
+
+
+def format_contact(record) -> str:
+    phones_str = "; ".join(p.value for p in record.phones) if record.phones else "N/A"
+    birthday_str = record.birthday.value.strftime("%d.%m.%Y") if record.birthday else "N/A"
+    address_str = "; ".join(a.value for a in record.addresses) if record.addresses else "N/A"
+    email_str = f"{record.email.value}" if record.email else "N/A"
+    notes_count = f"{len(record.notes)}" if record.notes else "N/A"
+
+    return (
+        f"{Fore.MAGENTA}Contact name: {record.name.value}\n"
+        f"Phones: {phones_str}\n"
+        f"Birthday: {birthday_str}\n"
+        f"Address: {address_str}\n"
+        f"Email: {email_str}\n"
+        f"Notes: {notes_count}\n"
+        "-----------------------"
+    )
 
 
 @input_error
-def get_all_contacts(book: AddressBook):
-    """Get all contacts from the address book."""
+def get_all_contacts(args, book: AddressBook):
+    """Get all contacts from the address book, formatted one at a time as they are printed."""
+    args, offset, limit = pop_paging(args)
+    order = pop_option(args, "--sort")
+    start = pop_option(args, "--from")
+    end = pop_option(args, "--to")
+    if args:
+        raise InsufficientArgumentsError(
+            f"Usage: all [--sort name|birthday|notes] [--from <name>] [--to <name>] {PAGING_USAGE}"
+        )
     if not book:
         return f"{Fore.YELLOW}Address book is empty"
-    lines = []
-    for record in book.data.values():
-        phones_str = "; ".join(p.value for p in record.phones) if record.phones else "N/A"
-        birthday_str = record.birthday.value.strftime("%d.%m.%Y") if record.birthday else "N/A"
-        address_str = "; ".join(a.value for a in record.addresses) if record.addresses else "N/A"
-        email_str = f"{record.email.value}" if record.email else "N/A"
-        notes_count = f"{len(record.notes)}" if record.notes else "N/A"
-
-        lines.append(
-            f"{Fore.MAGENTA}Contact name: {record.name.value}\n"
-            f"Phones: {phones_str}\n"
-            f"Birthday: {birthday_str}\n"
-            f"Address: {address_str}\n"
-            f"Email: {email_str}\n"
-            f"Notes: {notes_count}\n"
-            "-----------------------"
-        )
-    return "\n".join(lines)
-
+    # Page over the names so that skipped contacts are never decoded
+    if order is None and start is None and end is None:
+        names = paginate(book.data, offset, limit)
+    else:
+        # Sorted views skip to the offset without walking the contacts before it
+        names = paginate(book.iter_sorted(order or "name", start, end, offset), 0, limit)
+    names = peek(names)
+    if names is None:
+        return f"{Fore.YELLOW}No contacts on this page"
+    return (format_contact(book.data[name]) for name in names)
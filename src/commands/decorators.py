@@ -1,4 +1,4 @@
-"""Decorator for error handling in commands."""
+"""Decorator and helpers for error handling in commands."""
 
 from colorama import Fore
 from exceptions import (
@@ -10,10 +10,20 @@ from exceptions import (
     InsufficientArgumentsError,
     MinimumPhoneRequiredError,
     PhoneAlreadyExistsError,
+    AmbiguousContactError,
 )
 from classes.record import EmailFieldError
 
 
+def contact_not_found(book, name) -> ContactNotFoundError:
+    """ContactNotFoundError for a name, suggesting the closest contact names."""
+    message = f"Contact '{name}' not found"
+    suggestions = book.suggest_names(name)
+    if suggestions:
+        message += f". Did you mean: {', '.join(suggestions)}?"
+    return ContactNotFoundError(message)
+
+
 def input_error(func):
     """Decorator to handle common exceptions in command functions."""
     def inner(*args, **kwargs):
@@ -21,6 +31,8 @@ def input_error(func):
             return func(*args, **kwargs)
         except ContactNotFoundError as e:
             return f"{Fore.RED}{str(e) if str(e) else 'Contact not found'}"
+        except AmbiguousContactError as e:
+            return f"{Fore.RED}{str(e)}"
         except PhoneNotFoundError as e:
             return f"{Fore.RED}{str(e) if str(e) else 'Phone number not found'}"
         except PhoneAlreadyExistsError as e:
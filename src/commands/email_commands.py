@@ -3,10 +3,9 @@
 from colorama import Fore
 from classes.address_book import AddressBook
 from exceptions import (
-    ContactNotFoundError,
     InsufficientArgumentsError,
 )
-from commands.decorators import input_error
+from commands.decorators import input_error, contact_not_found
 
 
 @input_error
@@ -18,7 +17,7 @@ def add_email(args, book: AddressBook):
     name, email = args
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
 
     record.add_email(email)
     return f"{Fore.GREEN}Email is added"
@@ -33,7 +32,7 @@ def update_email(args, book: AddressBook):
     name, new_email = args
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     record.edit_email(new_email)
     return f"{Fore.GREEN}Email is updated"
@@ -48,7 +47,7 @@ def show_email(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     lines = [
         f"{Fore.MAGENTA}Contact name: {record.name.value}",
@@ -67,7 +66,7 @@ def delete_email(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     record.delete_email()
     return f"{Fore.GREEN}Email is removed"
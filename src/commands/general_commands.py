@@ -14,7 +14,8 @@ def help_command():
         f"{Fore.YELLOW}add-email <name> <email> {Fore.RESET}- Add email for a contact\n"
         f"{Fore.YELLOW}add-note <name> <note> {Fore.RESET}- Add note for a contact\n"
         f"{Fore.YELLOW}add-tag <name> <note_ID> <tag> {Fore.RESET}- Add tag for a note of a contact\n"
-        f"{Fore.YELLOW}all {Fore.RESET}- Shows all contacts in the book\n"
+        f"{Fore.YELLOW}all [--page N] [--limit N] [--offset N] {Fore.RESET}- Shows all contacts in the book, or one page of them\n"
+        f"{Fore.YELLOW}all --sort name|birthday|notes [--from <name>] [--to <name>] {Fore.RESET}- Shows contacts by name, next birthday or number of notes\n"
         f"{Fore.YELLOW}change-phone <name> <old_phone> <new_phone> {Fore.RESET}- Change a phone number of contact\n"
         f"{Fore.YELLOW}change-birthday <name> <birthday> {Fore.RESET}- Change birthday of contact\n"
         f"{Fore.YELLOW}change-address <name> <old_address> -> <new_address> {Fore.RESET}- Change address of contact\n"
@@ -24,20 +25,29 @@ def help_command():
         f"{Fore.YELLOW}show-birthdays-in <days> {Fore.RESET}- Show birthdays in the next <days> days\n"
         f"{Fore.YELLOW}show-address <name> {Fore.RESET}- Show address of contact\n"
         f"{Fore.YELLOW}show-email <name> {Fore.RESET}- Show email of contact\n"
-        f"{Fore.YELLOW}show-notes <name> {Fore.RESET}- Show notes of contact\n"
+        f"{Fore.YELLOW}show-notes <name> [--page N] [--limit N] [--offset N] {Fore.RESET}- Show notes of contact\n"
         f"{Fore.YELLOW}show-notes-sorted <name> {Fore.RESET}- Show notes sorted by tags\n"
         f"{Fore.YELLOW}show-celebration-day {Fore.RESET}- Show contacts with birthdays for the next week\n"
         f"{Fore.YELLOW}show-birthdays-in <days> {Fore.RESET}- Show contacts with birthdays for the next amount of days\n"
+        f"{Fore.YELLOW}birthday-stats [days] [--by week|month] {Fore.RESET}- Count birthdays per week or month of the next days (90 by default)\n"
         f"{Fore.YELLOW}find-notes <name> <search_text> {Fore.RESET}- Show note with specific text of contact\n"
+        f"{Fore.YELLOW}search-notes <word> [AND|OR <word> ...] [--limit N] {Fore.RESET}- Search notes of all contacts, best matches first\n"
         f"{Fore.YELLOW}find <field> <string> {Fore.RESET}- Search contacts by specific fields\n"
+        f"{Fore.YELLOW}find <field>:<string> AND <field>:<string> [--explain] [--page N] [--limit N] [--offset N] {Fore.RESET}- Search by several fields, optionally showing the query plan\n"
+        f"{Fore.YELLOW}find-by-phone <phone> {Fore.RESET}- Find contacts with exactly this phone number\n"
+        f"{Fore.YELLOW}find-phone-prefix <prefix> [--count] [--limit N] {Fore.RESET}- Find contacts with a phone starting with a prefix\n"
+        f"{Fore.YELLOW}find-by-email <email> {Fore.RESET}- Find contacts with exactly this email\n"
         f"{Fore.YELLOW}find-by-tag <name> <tag> {Fore.RESET}- Find notes of a contact by tag\n"
-        f"{Fore.YELLOW}find-all-by-tag <tag> {Fore.RESET}- Find notes of all contacts by tag\n"
+        f"{Fore.YELLOW}find-all-by-tag <tag> [--page N] [--limit N] [--offset N] {Fore.RESET}- Find notes of all contacts by tag\n"
+        f"{Fore.YELLOW}tags {Fore.RESET}- List all tags with their note counts\n"
         f"{Fore.YELLOW}delete-phone <name> <phone> {Fore.RESET}- Delete phone number of contact\n"
         f"{Fore.YELLOW}delete-birthday <name> {Fore.RESET}- Delete birthday of contact\n"
         f"{Fore.YELLOW}delete-address <name> <address> {Fore.RESET}- Delete address of contact\n"
         f"{Fore.YELLOW}delete-note <name> <note_ID> {Fore.RESET}- Delete note with specific ID of contact\n"
         f"{Fore.YELLOW}delete-email <name> {Fore.RESET}- Delete email of contact\n"
         f"{Fore.YELLOW}remove-tag <name> <note_ID> <tag> {Fore.RESET}- Remove tag from a note\n"
+        f"{Fore.YELLOW}import <file> [csv|jsonl|vcard] [--workers N] {Fore.RESET}- Import contacts from a file\n"
+        f"{Fore.YELLOW}export <file> [csv|jsonl|vcard] {Fore.RESET}- Export all contacts to a file\n"
     )
 
 
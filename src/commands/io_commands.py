@@ -0,0 +1,52 @@
+"""Commands for bulk import and export of contacts."""
+
+from colorama import Fore
+from classes.address_book import AddressBook
+from exceptions import InsufficientArgumentsError
+from commands.decorators import input_error
+from commands.options import pop_number
+import bulk_io
+
+
+@input_error
+def import_file(args, book: AddressBook):
+    """Import contacts from a CSV, JSONL or vCard file."""
+    args = list(args)
+    # 0 uses every CPU
+    workers = pop_number(args, "--workers", 0)
+    if workers is None:
+        workers = 1
+
+    if len(args) < 1:
+        raise InsufficientArgumentsError("Usage: import <file> [csv|jsonl|vcard] [--workers N]")
+
+    path = args[0]
+    fmt = args[1] if len(args) > 1 else None
+    try:
+        report = bulk_io.import_contacts(book, path, fmt, workers=workers)
+    except OSError as e:
+        raise ValueError(f"Cannot read {path}: {e.strerror}")
+
+    lines = [f"{Fore.GREEN}Imported {report.imported} of {report.rows} contacts from {path}"]
+    if report.failed:
+        lines.append(f"{Fore.YELLOW}{report.failed} row(s) skipped, see {report.error_file}:")
+        for line, message in report.errors:
+            lines.append(f"{Fore.YELLOW}  line {line}: {message}")
+        if report.failed > len(report.errors):
+            lines.append(f"{Fore.YELLOW}  ...")
+    return "\n".join(lines)
+
+
+@input_error
+def export_file(args, book: AddressBook):
+    """Export all contacts to a CSV, JSONL or vCard file."""
+    if len(args) < 1:
+        raise InsufficientArgumentsError("Usage: export <file> [csv|jsonl|vcard]")
+
+    path = args[0]
+    fmt = args[1] if len(args) > 1 else None
+    try:
+        count = bulk_io.export_contacts(book, path, fmt)
+    except OSError as e:
+        raise ValueError(f"Cannot write {path}: {e.strerror}")
+    return f"{Fore.GREEN}Exported {count} contacts to {path}"
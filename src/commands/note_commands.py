@@ -1,13 +1,15 @@
 """Commands for managing notes."""
 
+from itertools import chain
 from colorama import Fore
 from classes.address_book import AddressBook
 from exceptions import (
-    ContactNotFoundError,
     NoteNotFoundError,
     InsufficientArgumentsError,
 )
-from commands.decorators import input_error
+from commands.decorators import input_error, contact_not_found
+from commands.options import pop_number
+from commands.pagination import PAGING_USAGE, paginate, peek, pop_paging
 
 
 @input_error
@@ -21,7 +23,7 @@ def add_note(args, book: AddressBook):
 
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
 
     note = record.add_note(content)
     return f"{Fore.GREEN}Note added successfully! ID: {note.id}"
@@ -30,23 +32,25 @@ def add_note(args, book: AddressBook):
 @input_error
 def show_notes(args, book: AddressBook):
     """Show all notes for a contact."""
+    args, offset, limit = pop_paging(args)
     if len(args) < 1:
-        raise InsufficientArgumentsError("Usage: show-notes <name>")
+        raise InsufficientArgumentsError(f"Usage: show-notes <name> {PAGING_USAGE}")
 
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
 
     notes = record.show_all_notes()
     if not notes:
         return f"{Fore.YELLOW}No notes for {name}"
 
-    result = [f"{Fore.WHITE}Notes for {name}:"]
-    for idx, note in enumerate(notes, 1):
-        result.append(f"{Fore.CYAN}[{idx}] {note}")
+    page = peek(paginate(enumerate(notes, 1), offset, limit))
+    if page is None:
+        return f"{Fore.YELLOW}No notes on this page"
 
-    return "\n".join(result)
+    header = f"{Fore.WHITE}Notes for {name}:"
+    return chain([header], (f"{Fore.CYAN}[{idx}] {note}" for idx, note in page))
 
 
 @input_error
@@ -60,7 +64,7 @@ def find_notes(args, book: AddressBook):
 
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
 
     notes = record.find_notes(search_text)
     if not notes:
@@ -73,6 +77,30 @@ def find_notes(args, book: AddressBook):
     return "\n".join(result)
 
 
+@input_error
+def search_notes(args, book: AddressBook):
+    """Search notes of all contacts by words, best matches first."""
+    args = list(args)
+    limit = pop_number(args, "--limit", 1)
+
+    # Words are joined with AND unless the query contains OR, in any case like in parse_query
+    match_all = "OR" not in (word.upper() for word in args)
+    words = [word for word in args if word.upper() not in ("AND", "OR")]
+    if not words:
+        raise InsufficientArgumentsError("Usage: search-notes <word> [AND|OR <word> ...] [--limit N]")
+
+    query = " ".join(words)
+    results = book.search_notes(query, match_all, limit)
+    if not results:
+        return f"{Fore.YELLOW}No notes found for '{query}'"
+
+    result = [f"{Fore.WHITE}Found {len(results)} note(s) for '{' '.join(args)}':"]
+    for idx, (record, note, score) in enumerate(results, 1):
+        result.append(f"{Fore.CYAN}[{idx}] {record.name.value}: {note} {Fore.RESET}(score {score:.2f})")
+
+    return "\n".join(result)
+
+
 @input_error
 def edit_note(args, book: AddressBook):
     """Edit a note."""
@@ -85,7 +113,7 @@ def edit_note(args, book: AddressBook):
 
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
 
     if not record.edit_note(note_id, new_content):
         raise NoteNotFoundError(f"Note with ID '{note_id}' not found")
@@ -104,7 +132,7 @@ def delete_note(args, book: AddressBook):
 
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
 
     if not record.delete_note(note_id):
         raise NoteNotFoundError(f"Note with ID '{note_id}' not found")
@@ -159,7 +187,7 @@ def find_by_tag(args, book: AddressBook):
     
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     notes = record.find_notes_by_tag(tag)
     if not notes:
@@ -175,8 +203,9 @@ def find_by_tag(args, book: AddressBook):
 @input_error
 def find_all_by_tag(args, book: AddressBook):
     """Find notes by tag across all contacts."""
+    args, offset, limit = pop_paging(args)
     if len(args) < 1:
-        raise InsufficientArgumentsError("Usage: find-all-by-tag <tag>")
+        raise InsufficientArgumentsError(f"Usage: find-all-by-tag <tag> {PAGING_USAGE}")
     
     tag = args[0]
     results = book.find_all_notes_by_tag(tag)
@@ -184,12 +213,39 @@ def find_all_by_tag(args, book: AddressBook):
     if not results:
         return f"{Fore.YELLOW}No notes found with tag '{tag}'"
     
-    output = [f"{Fore.WHITE}All notes with tag '#{tag}':"]
-    for result in results:
-        output.append(f"{Fore.WHITE}Contact: {result['contact']}")
-        for idx, note in enumerate(result['notes'], 1):
-            output.append(f"{Fore.BLUE}[{idx}] {note}")
-    
+    # Pages count notes, a contact's header is repeated at the top of a page
+    notes = (
+        (result['contact'], idx, note)
+        for result in results
+        for idx, note in enumerate(result['notes'], 1)
+    )
+    page = peek(paginate(notes, offset, limit))
+    if page is None:
+        return f"{Fore.YELLOW}No notes on this page"
+
+    def lines():
+        yield f"{Fore.WHITE}All notes with tag '#{tag}':"
+        contact = None
+        for name, idx, note in page:
+            if name != contact:
+                contact = name
+                yield f"{Fore.WHITE}Contact: {name}"
+            yield f"{Fore.BLUE}[{idx}] {note}"
+
+    return lines()
+
+
+@input_error
+def list_tags(book: AddressBook):
+    """List every tag with the number of notes that have it."""
+    counts = book.tag_counts()
+    if not counts:
+        return f"{Fore.YELLOW}No tags yet"
+
+    output = [f"{Fore.WHITE}Tags:"]
+    for tag, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        output.append(f"{Fore.BLUE}#{tag} {Fore.RESET}- {count} note(s)")
+
     return "\n".join(output)
 
 
@@ -202,7 +258,7 @@ def show_notes_sorted(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     notes = record.show_all_notes()
     if not notes:
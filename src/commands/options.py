@@ -0,0 +1,42 @@
+"""Options of command arguments (--name value and --flag), shared by the command modules."""
+
+from exceptions import InsufficientArgumentsError
+
+
+def pop_flag(args, flag) -> bool:
+    """Remove flag from args, returns whether it was there."""
+    if flag not in args:
+        return False
+    args.remove(flag)
+    return True
+
+
+def pop_option(args, option, choices=None):
+    """Remove option and its value from args, returns the value or None. choices limits the value, ignoring case."""
+    if option not in args:
+        return None
+    position = args.index(option)
+    if position + 1 >= len(args):
+        raise InsufficientArgumentsError(f"{option} expects a value")
+    value = args[position + 1]
+    if choices is not None:
+        value = value.lower()
+        if value not in choices:
+            raise ValueError(f"{option} expects {' or '.join(choices)}")
+    del args[position:position + 2]
+    return value
+
+
+def pop_number(args, option, minimum):
+    """Remove option and its integer value of at least minimum from args, returns the value or None."""
+    if option not in args:
+        return None
+    position = args.index(option)
+    try:
+        value = int(args[position + 1])
+    except (IndexError, ValueError):
+        raise ValueError(f"{option} expects a number")
+    if value < minimum:
+        raise ValueError(f"{option} must be at least {minimum}")
+    del args[position:position + 2]
+    return value
@@ -0,0 +1,40 @@
+"""Paging options for commands that list many results, and lazy output of those results."""
+
+from itertools import chain, islice
+
+from commands.options import pop_number
+
+PAGE_SIZE = 20
+PAGING_USAGE = "[--page N] [--limit N] [--offset N]"
+
+
+def pop_paging(args):
+    """
+    Remove --page, --limit and --offset from the arguments.
+
+    Returns (remaining args, offset, limit). --page counts pages of --limit
+    results (PAGE_SIZE by default). Without any of them everything is listed.
+    """
+    args = list(args)
+    page = pop_number(args, "--page", 1)
+    limit = pop_number(args, "--limit", 1)
+    offset = pop_number(args, "--offset", 0)
+    if page is not None and offset is not None:
+        raise ValueError("Use either --page or --offset, not both")
+    if page is not None:
+        limit = limit or PAGE_SIZE
+        offset = (page - 1) * limit
+    return args, offset or 0, limit
+
+
+def paginate(items, offset=0, limit=None):
+    """The requested slice of an iterable, without materializing the rest."""
+    return islice(items, offset, None if limit is None else offset + limit)
+
+
+def peek(items):
+    """None if the iterable is empty, otherwise an iterator over all of its items."""
+    iterator = iter(items)
+    for first in iterator:
+        return chain((first,), iterator)
+    return None
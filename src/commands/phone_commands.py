@@ -3,12 +3,12 @@
 from colorama import Fore
 from classes.address_book import AddressBook
 from exceptions import (
-    ContactNotFoundError,
     PhoneNotFoundError,
     InsufficientArgumentsError,
     MinimumPhoneRequiredError,
+    PhoneAlreadyExistsError,
 )
-from commands.decorators import input_error
+from commands.decorators import input_error, contact_not_found
 
 
 @input_error
@@ -20,7 +20,14 @@ def update_contact(args, book: AddressBook):
     name, old_phone, new_phone = args
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
+    
+    owners = book.find_by_phone(new_phone)
+    if record in owners and new_phone != old_phone:
+        raise PhoneAlreadyExistsError("This phone number already exists.")
+    others = [owner for owner in owners if owner is not record]
+    if others:
+        raise PhoneAlreadyExistsError(f"This phone number already belongs to {others[0].name.value}.")
     
     if not record.edit_phone(old_phone, new_phone):
         raise PhoneNotFoundError(f"Phone number '{old_phone}' not found for contact '{name}'")
@@ -37,7 +44,7 @@ def get_contact(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     phones_str = "; ".join(p.value for p in record.phones) if record.phones else "N/A"
     lines = [
@@ -58,7 +65,7 @@ def delete_phone(args, book: AddressBook):
     phone = args[1]
     record = book.find(name)
     if not record:
-        raise ContactNotFoundError(f"Contact '{name}' not found")
+        raise contact_not_found(book, name)
     
     if len(record.phones) <= 1:
         raise MinimumPhoneRequiredError("Contact must have at least one phone number.")
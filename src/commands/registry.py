@@ -1,88 +1,150 @@
 """Command registry - single entry point for all commands."""
 
-from colorama import Fore
-from commands.contact_commands import add_contact, delete_contact, find, get_all_contacts
-from commands.phone_commands import update_contact, get_contact, delete_phone
-from commands.address_commands import add_address, get_address, update_address, delete_address
-from commands.birthday_commands import (
-    add_birthday, get_birthday, update_birthday, 
-    delete_birthday, birthdays, birthdays_in_range
-)
-from commands.note_commands import (
-    add_note, show_notes, find_notes, edit_note, delete_note,
-    add_tag, remove_tag, find_by_tag, find_all_by_tag, show_notes_sorted
-)
-from commands.email_commands import add_email, update_email, show_email, delete_email
-from commands.general_commands import help_command, hello_command, exit_command
-
-
-# Command mapping dictionary - single source of truth for all commands
+from importlib import import_module
+
+# How a handler is called
+ARGS_AND_BOOK = "args, book"
+BOOK_ONLY = "book"
+NO_ARGUMENTS = ""
+
+# Command mapping dictionary - single source of truth for all commands.
+# Command name -> (module in the commands package, handler name, how it is called).
+# Modules are imported the first time one of their commands runs, so startup
+# does not pay for commands the session never uses.
 COMMANDS = {
     # General commands
-    "close": lambda args, book: exit_command(),
-    "exit": lambda args, book: exit_command(),
-    "hello": lambda args, book: hello_command(),
-    "help": lambda args, book: help_command(),
-    
+    "close": ("general_commands", "exit_command", NO_ARGUMENTS),
+    "exit": ("general_commands", "exit_command", NO_ARGUMENTS),
+    "hello": ("general_commands", "hello_command", NO_ARGUMENTS),
+    "help": ("general_commands", "help_command", NO_ARGUMENTS),
+
     # Contact commands
-    "add": add_contact,
-    "delete": delete_contact,
-    "find": find,
-    "all": lambda args, book: get_all_contacts(book),
-    
+    "add": ("contact_commands", "add_contact", ARGS_AND_BOOK),
+    "delete": ("contact_commands", "delete_contact", ARGS_AND_BOOK),
+    "find": ("contact_commands", "find", ARGS_AND_BOOK),
+    "find-by-phone": ("contact_commands", "find_by_phone", ARGS_AND_BOOK),
+    "find-phone-prefix": ("contact_commands", "find_phone_prefix", ARGS_AND_BOOK),
+    "find-by-email": ("contact_commands", "find_by_email", ARGS_AND_BOOK),
+    "all": ("contact_commands", "get_all_contacts", ARGS_AND_BOOK),
+
     # Phone commands
-    "change-phone": update_contact,
-    "show-phone": get_contact,
-    "delete-phone": delete_phone,
-    
+    "change-phone": ("phone_commands", "update_contact", ARGS_AND_BOOK),
+    "show-phone": ("phone_commands", "get_contact", ARGS_AND_BOOK),
+    "delete-phone": ("phone_commands", "delete_phone", ARGS_AND_BOOK),
+
     # Address commands
-    "add-address": add_address,
-    "show-address": get_address,
-    "change-address": update_address,
-    "delete-address": delete_address,
-    
+    "add-address": ("address_commands", "add_address", ARGS_AND_BOOK),
+    "show-address": ("address_commands", "get_address", ARGS_AND_BOOK),
+    "change-address": ("address_commands", "update_address", ARGS_AND_BOOK),
+    "delete-address": ("address_commands", "delete_address", ARGS_AND_BOOK),
+
     # Birthday commands
-    "add-birthday": add_birthday,
-    "show-birthday": get_birthday,
-    "change-birthday": update_birthday,
-    "delete-birthday": delete_birthday,
-    "birthdays": lambda args, book: birthdays(book),
-    "show-birthdays-in": birthdays_in_range,
-    "show-celebration-day": lambda args, book: birthdays(book),
-    
+    "add-birthday": ("birthday_commands", "add_birthday", ARGS_AND_BOOK),
+    "show-birthday": ("birthday_commands", "get_birthday", ARGS_AND_BOOK),
+    "change-birthday": ("birthday_commands", "update_birthday", ARGS_AND_BOOK),
+    "delete-birthday": ("birthday_commands", "delete_birthday", ARGS_AND_BOOK),
+    "birthdays": ("birthday_commands", "birthdays", BOOK_ONLY),
+    "show-birthdays-in": ("birthday_commands", "birthdays_in_range", ARGS_AND_BOOK),
+    "birthday-stats": ("birthday_commands", "birthday_stats", ARGS_AND_BOOK),
+    "show-celebration-day": ("birthday_commands", "birthdays", BOOK_ONLY),
+
     # Note commands
-    "add-note": add_note,
-    "show-notes": show_notes,
-    "find-notes": find_notes,
-    "edit-note": edit_note,
-    "delete-note": delete_note,
-    "add-tag": add_tag,
-    "remove-tag": remove_tag,
-    "find-by-tag": find_by_tag,
-    "find-all-by-tag": find_all_by_tag,
-    "show-notes-sorted": show_notes_sorted,
-    
+    "add-note": ("note_commands", "add_note", ARGS_AND_BOOK),
+    "show-notes": ("note_commands", "show_notes", ARGS_AND_BOOK),
+    "find-notes": ("note_commands", "find_notes", ARGS_AND_BOOK),
+    "search-notes": ("note_commands", "search_notes", ARGS_AND_BOOK),
+    "edit-note": ("note_commands", "edit_note", ARGS_AND_BOOK),
+    "delete-note": ("note_commands", "delete_note", ARGS_AND_BOOK),
+    "add-tag": ("note_commands", "add_tag", ARGS_AND_BOOK),
+    "remove-tag": ("note_commands", "remove_tag", ARGS_AND_BOOK),
+    "find-by-tag": ("note_commands", "find_by_tag", ARGS_AND_BOOK),
+    "find-all-by-tag": ("note_commands", "find_all_by_tag", ARGS_AND_BOOK),
+    "tags": ("note_commands", "list_tags", BOOK_ONLY),
+    "show-notes-sorted": ("note_commands", "show_notes_sorted", ARGS_AND_BOOK),
+
     # Email commands
-    "add-email": add_email,
-    "change-email": update_email,
-    "show-email": show_email,
-    "delete-email": delete_email,
+    "add-email": ("email_commands", "add_email", ARGS_AND_BOOK),
+    "change-email": ("email_commands", "update_email", ARGS_AND_BOOK),
+    "show-email": ("email_commands", "show_email", ARGS_AND_BOOK),
+    "delete-email": ("email_commands", "delete_email", ARGS_AND_BOOK),
+
+    # Import/export commands
+    "import": ("io_commands", "import_file", ARGS_AND_BOOK),
+    "export": ("io_commands", "export_file", ARGS_AND_BOOK),
 }
 
+# What the leading arguments of a command are, for tab completion
+NAME = "name"
+NOTE_ID = "note ID"
+TAG = "tag"
+ARGUMENTS = {
+    "add": (NAME,),
+    "delete": (NAME,),
+    "change-phone": (NAME,),
+    "show-phone": (NAME,),
+    "delete-phone": (NAME,),
+    "add-address": (NAME,),
+    "show-address": (NAME,),
+    "change-address": (NAME,),
+    "delete-address": (NAME,),
+    "add-birthday": (NAME,),
+    "show-birthday": (NAME,),
+    "change-birthday": (NAME,),
+    "delete-birthday": (NAME,),
+    "add-note": (NAME,),
+    "show-notes": (NAME,),
+    "find-notes": (NAME,),
+    "edit-note": (NAME, NOTE_ID),
+    "delete-note": (NAME, NOTE_ID),
+    "add-tag": (NOTE_ID, TAG),
+    "remove-tag": (NOTE_ID, TAG),
+    "find-by-tag": (NAME, TAG),
+    "find-all-by-tag": (TAG,),
+    "show-notes-sorted": (NAME,),
+    "add-email": (NAME,),
+    "change-email": (NAME,),
+    "show-email": (NAME,),
+    "delete-email": (NAME,),
+}
+
+# Command name -> handler taking (args, book), filled on first use
+_handlers = {}
+
+
+def _adapt(function, arguments):
+    if arguments == BOOK_ONLY:
+        return lambda args, book: function(book)
+    if arguments == NO_ARGUMENTS:
+        return lambda args, book: function()
+    return function
+
+
+def get_handler(command):
+    """The handler of a command taking (args, book), importing its module if needed. None if unknown."""
+    handler = _handlers.get(command)
+    if handler is None:
+        spec = COMMANDS.get(command)
+        if spec is None:
+            return None
+        module, name, arguments = spec
+        function = getattr(import_module(f"commands.{module}"), name)
+        handler = _handlers[command] = _adapt(function, arguments)
+    return handler
+
 
 def execute_command(command, args, book):
     """
     Execute a command based on the command name.
-    
+
     Args:
         command: The command name
         args: Arguments for the command
         book: The AddressBook instance
-        
+
     Returns:
         The result of the command execution or None if command not found
     """
-    handler = COMMANDS.get(command)
+    handler = get_handler(command)
     if handler:
         return handler(args, book)
     return None
@@ -91,4 +153,3 @@ def execute_command(command, args, book):
 def get_all_commands():
     """Return a list of all available command names."""
     return list(COMMANDS.keys())
-
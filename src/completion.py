@@ -0,0 +1,94 @@
+"""
+Tab completion of commands, contact names, note IDs and tags at the prompt.
+
+Every kind of word is completed from a sorted index of its values
+(classes.prefix_index, or SQLite's B-tree indexes for SQLite books)
+that the address book keeps up to date as contacts change, so a
+keystroke costs two binary searches instead of a pass over the book.
+readline is optional, without it the prompt works as before.
+"""
+
+from classes.prefix_index import PrefixIndex
+from commands.registry import ARGUMENTS, NAME, NOTE_ID, TAG, get_all_commands
+from exceptions import AmbiguousContactError
+
+# Matches offered for one Tab press
+COMPLETION_LIMIT = 50
+
+
+class Completer:
+    """readline completer, get_book returns the AddressBook (waiting for it if it is still loading)."""
+
+    def __init__(self, get_book, limit=COMPLETION_LIMIT):
+        self._get_book = get_book
+        self.limit = limit
+        self._commands = PrefixIndex(get_all_commands())
+        self._matches = []
+
+    def candidates(self, line: str, begidx: int, text: str) -> list[str]:
+        """Completions of text, the word starting at begidx of line."""
+        words = line[:begidx].split()
+        if not words:
+            return self._commands.keys(text.lower(), self.limit)
+        kinds = ARGUMENTS.get(words[0].lower(), ())
+        position = len(words) - 1
+        if position >= len(kinds):
+            return []
+        book = self._get_book()
+        kind = kinds[position]
+        if kind == NAME:
+            return self._names(book, text)
+        if kind == NOTE_ID and kinds[0] == NAME:
+            return self._contact_note_ids(book, words[1], text)
+        if kind == NOTE_ID:
+            return book.complete_note_ids(text, self.limit)
+        if kind == TAG:
+            return book.complete_tags(text, self.limit)
+        return []
+
+    def _names(self, book, text: str) -> list[str]:
+        # Arguments are split on whitespace, names containing it cannot be typed as one,
+        # so more names are fetched until they do not take the place of the others
+        fetched = self.limit
+        while True:
+            names = book.complete_names(text, fetched)
+            typable = [name for name in names if len(name.split()) == 1]
+            if len(typable) >= self.limit or len(names) < fetched:
+                return typable[:self.limit]
+            fetched *= 2
+
+    def _contact_note_ids(self, book, name: str, text: str) -> list[str]:
+        # The command names the contact, only its notes make sense
+        try:
+            record = book.find(name)
+        except AmbiguousContactError:
+            return []
+        if record is None:
+            return []
+        return sorted(note.id for note in record.notes if note.id.startswith(text))[:self.limit]
+
+    def complete(self, text: str, state: int):
+        """The readline completer protocol: the state-th match of text, None after the last one."""
+        if state == 0:
+            import readline
+
+            line = readline.get_line_buffer()
+            # Python's readline does not add the space after a completed word itself
+            self._matches = [match + " " for match in self.candidates(line, readline.get_begidx(), text)]
+        return self._matches[state] if state < len(self._matches) else None
+
+
+def install(completer: Completer) -> bool:
+    """Complete with completer on Tab at input() prompts. False if readline is not available."""
+    try:
+        import readline
+    except ImportError:
+        return False
+    readline.set_completer(completer.complete)
+    # Only whitespace separates words, note IDs and names may contain other characters
+    readline.set_completer_delims(" \t\n")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    return True
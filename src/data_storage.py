@@ -1,14 +1,48 @@
-import pickle
+from autosave import AutoSaver
+from journal import Journal
 
-from classes.address_book import AddressBook
+DEFAULT_FILENAME = "../addressbook.pkl"
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+SNAPSHOT_EXTENSIONS = (".snap",)
 
-def save_data(book, filename="../addressbook.pkl"):
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
 
-def load_data(filename="../addressbook.pkl"):
+def save_data(book, filename=DEFAULT_FILENAME):
+    Journal(filename).save(book)
+
+
+def load_data(filename=DEFAULT_FILENAME):
+    return Journal(filename).read()
+
+
+def open_storage(filename=DEFAULT_FILENAME):
+    """
+    Pick the storage backend by file extension:
+    SQLite for .db/.sqlite files, memory-mapped snapshots for .snap files,
+    pickle snapshot with a journal otherwise.
+
+    Journaled backends are written by a background AutoSaver. SQLite
+    commits are atomic already and its lookups read the database, so it
+    is written directly to keep query results up to date.
+    """
+    lower = filename.lower()
+    # Backends other than the default one are imported only when a file needs them
+    if lower.endswith(SQLITE_EXTENSIONS):
+        from sqlite_storage import SqliteStorage
+
+        return SqliteStorage(filename)
+    if lower.endswith(SNAPSHOT_EXTENSIONS):
+        from snapshot_storage import SnapshotStorage
+
+        return AutoSaver(SnapshotStorage(filename))
+    return AutoSaver(Journal(filename))
+
+
+def migrate_pickle(pickle_filename, filename):
+    """Copy every contact of a pickle address book (with its journal) into another storage file."""
+    book = load_data(pickle_filename)
+    storage = open_storage(filename)
     try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
-    except FileNotFoundError:
-        return AddressBook()
\ No newline at end of file
+        storage.save(book)
+    finally:
+        storage.close()
+    return len(book)
@@ -7,6 +7,7 @@ from exceptions.insufficient_arguments import InsufficientArgumentsError
 from exceptions.minimum_phone_required import MinimumPhoneRequiredError
 from exceptions.email_already_exists import EmailAlreadyExistsError
 from exceptions.phone_already_exists import PhoneAlreadyExistsError
+from exceptions.ambiguous_contact import AmbiguousContactError
 
 __all__ = [
     'ContactNotFoundError',
@@ -18,5 +19,6 @@ __all__ = [
     'MinimumPhoneRequiredError',
     'EmailAlreadyExistsError',
     'PhoneAlreadyExistsError',
+    'AmbiguousContactError',
 ]
 
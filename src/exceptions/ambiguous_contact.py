@@ -0,0 +1,3 @@
+class AmbiguousContactError(Exception):
+    """Raised when a name matches several contacts"""
+    pass
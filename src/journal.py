@@ -0,0 +1,189 @@
+import os
+import pickle
+import threading
+
+from classes.address_book import AddressBook
+
+JOURNAL_SUFFIX = ".journal"
+SEGMENT_SIZE = 500
+COMPACT_SEGMENTS = 4
+
+
+def write_atomically(filename, write):
+    """
+    Write a file through a temporary copy that is fsynced and renamed over it,
+    so a crash leaves either the old or the new file, never a half-written one.
+    """
+    tmp_path = filename + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filename)
+    # Make the rename itself durable where directories can be fsynced
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def load_pickle(filename):
+    try:
+        with open(filename, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return AddressBook()
+
+
+def read_journal(path):
+    """Yield (name, record) entries from a journal file, record is None for deleted contacts."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+            except pickle.UnpicklingError:
+                # A crash can leave a half-written entry at the end of the journal
+                return
+
+
+def replay_journal(book, path):
+    for name, record in read_journal(path):
+        if record is None:
+            book.delete(name)
+        else:
+            book.add_record(record)
+
+
+class Journal:
+    """
+    Append-only log of contact changes on top of the pickle snapshot.
+
+    Every entry stores the current state of one changed contact, so saving
+    costs as much as the number of changes, not the size of the book.
+    The log is split into numbered segment files of segment_size entries.
+    Once compact_segments segments are full they are folded into a new
+    snapshot by a background thread and removed.
+    """
+
+    def __init__(self, filename, segment_size=SEGMENT_SIZE, compact_segments=COMPACT_SEGMENTS):
+        self.filename = filename
+        self.segment_size = segment_size
+        self.compact_segments = compact_segments
+        self._active = None
+        self._file = None
+        self._entries = 0
+        self._worker = None
+
+    def _segment_path(self, number):
+        return f"{self.filename}{JOURNAL_SUFFIX}.{number:06d}"
+
+    def _segments(self):
+        """Numbers of the journal segments on disk, oldest first."""
+        directory, base = os.path.split(self.filename)
+        prefix = base + JOURNAL_SUFFIX + "."
+        numbers = []
+        for entry in os.listdir(directory or "."):
+            if entry.startswith(prefix) and entry[len(prefix):].isdigit():
+                numbers.append(int(entry[len(prefix):]))
+        return sorted(numbers)
+
+    def _sealed_segments(self):
+        if self._active is None:
+            return self._segments()
+        return [number for number in self._segments() if number < self._active]
+
+    def read(self):
+        """Load the snapshot and replay the journal segments on top of it."""
+        book = self._load_snapshot()
+        for number in self._segments():
+            replay_journal(book, self._segment_path(number))
+        # Replayed contacts are already on disk
+        book.pop_changes()
+        return book
+
+    def load(self):
+        book = self.read()
+        # Segments left from the previous session are loaded now, fold them away
+        self.compact()
+        return book
+
+    def save(self, book):
+        """Write a full snapshot of the book, dropping the journal it replaces."""
+        self._close_file()
+        if self._worker is not None:
+            self._worker.join()
+        self._write_snapshot(book)
+        for number in self._segments():
+            os.remove(self._segment_path(number))
+        self._active = None
+        book.pop_changes()
+
+    def write(self, changes: dict):
+        """Append changed contacts (name -> Record, or None if the contact was deleted)."""
+        if not changes:
+            return
+        if self._file is None:
+            if self._active is None:
+                segments = self._segments()
+                self._active = segments[-1] + 1 if segments else 1
+            self._file = open(self._segment_path(self._active), "ab")
+        for name, record in changes.items():
+            pickle.dump((name, record), self._file)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self._entries += len(changes)
+        if self._entries >= self.segment_size:
+            self._seal()
+
+    def _seal(self):
+        """Close the active segment, the next write starts a new one."""
+        self._close_file()
+        self._active += 1
+        self._entries = 0
+        if len(self._sealed_segments()) >= self.compact_segments:
+            self.compact()
+
+    def compact(self):
+        """Start folding the full segments into the snapshot unless a compaction is already running."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        segments = self._sealed_segments()
+        if not segments:
+            return
+        self._worker = threading.Thread(target=self._fold, args=(segments,), daemon=True)
+        self._worker.start()
+
+    def _load_snapshot(self):
+        return load_pickle(self.filename)
+
+    def _write_snapshot(self, book):
+        write_atomically(self.filename, lambda f: pickle.dump(book, f))
+
+    def _fold(self, segments):
+        book = load_pickle(self.filename)
+        for number in segments:
+            replay_journal(book, self._segment_path(number))
+        self._write_snapshot(book)
+        # Segments are removed only after the new snapshot is in place,
+        # replaying them again after a crash is harmless
+        for number in segments:
+            os.remove(self._segment_path(number))
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        self._close_file()
+        if self._worker is not None:
+            self._worker.join()
@@ -1,7 +1,17 @@
+# Imported first, so that profiled runs measure from the start of main.py
+from startup_profile import mark_phase, profile_startup
+
+import argparse
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
 from colorama import Fore, init
-from data_storage import save_data, load_data
+from data_storage import DEFAULT_FILENAME, open_storage, migrate_pickle
 from command_suggester import CommandSuggester
-from commands.registry import execute_command
+from commands.confirmation import set_auto_answer
+from commands.registry import execute_command, get_handler
 
 init(autoreset=True)
 
@@ -16,41 +26,221 @@ def parse_input(user_input):
     return cmd, *args
 
 
-def main():
+def display(result, paged=True):
+    """
+    Print a command result. Long listings come as iterables of lines that are
+    printed as they are produced, a screen at a time when run in a terminal
+    unless paged is False.
+    """
+    if isinstance(result, str):
+        print(result)
+        return
+    # Only listings need the terminal size, shutil stays out of startup
+    import shutil
+
+    interactive = paged and sys.stdin.isatty() and sys.stdout.isatty()
+    screen = shutil.get_terminal_size().lines - 1
+    shown = 0
+    for line in result:
+        height = line.count("\n") + 1
+        if interactive and shown and shown + height > screen:
+            try:
+                answer = input(f"{Fore.CYAN}-- More -- (Enter to continue, q to stop) ")
+            except (EOFError, KeyboardInterrupt):
+                # Ctrl+D or Ctrl+C stop the listing like q
+                print()
+                break
+            if answer.strip().lower() == "q":
+                break
+            shown = 0
+        print(line)
+        shown += height
+
+
+def parse_arguments(argv=None):
+    """Parse command line options of the assistant bot."""
+    parser = argparse.ArgumentParser(description="Personal assistant bot")
+    parser.add_argument(
+        "--file", default=DEFAULT_FILENAME,
+        help="address book file, .db/.sqlite files use SQLite, .snap files use memory-mapped snapshots",
+    )
+    parser.add_argument(
+        "--migrate-from", metavar="PICKLE_FILE",
+        help="copy contacts from a pickle address book into --file and exit",
+    )
+    parser.add_argument(
+        "--script", metavar="FILE",
+        help="run the commands of FILE (- for stdin) one per line without prompts, save once at the end and exit",
+    )
+    parser.add_argument(
+        "--confirm", choices=("yes", "no"),
+        help="answer every confirmation (such as delete) with yes or no instead of asking; --script answers no by default",
+    )
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="time a cold start on --file that only runs exit, with its slowest imports, and exit",
+    )
+    return parser.parse_args(argv)
+
+
+def load_in_background(storage):
+    """
+    Start loading the book on a thread and return a function that waits for it.
+
+    The welcome message, the first prompt, reading the first command and
+    importing its module happen while the book is read.
+    """
+    loaded = {}
+
+    def load():
+        try:
+            loaded["book"] = storage.load()
+        except BaseException as e:
+            loaded["error"] = e
+        mark_phase("book loaded")
+
+    thread = threading.Thread(target=load, name="book-loader", daemon=True)
+    thread.start()
+
+    def wait():
+        thread.join()
+        if "error" in loaded:
+            raise loaded["error"]
+        return loaded["book"]
+
+    return wait
+
+
+def unknown_command(command, suggester):
+    """Message for a command that does not exist, with the closest ones if there are any."""
+    suggestions = suggester.suggest(command)
+    if suggestions:
+        names = f"{Fore.YELLOW}', '".join(f"{Fore.CYAN}{name}" for name, _ in suggestions)
+        return f"{Fore.YELLOW}Command '{command}' not found. Maybe you meant '{names}{Fore.YELLOW}'?"
+    return f"{Fore.RED}Invalid command. Type 'help' to see available commands."
+
+
+def run_script(lines, filename=DEFAULT_FILENAME):
+    """
+    Run commands one per line back to back, without prompts, until exit or the end of lines.
+    Empty lines and lines starting with # are skipped.
+
+    Changes are saved once at the end (SQLite, whose lookups read the
+    database, writes as it goes inside one transaction committed at the
+    end). Returns the number of commands run.
+    """
+    storage = open_storage(filename)
+    book = storage.load()
+    suggester = CommandSuggester()
+    count = 0
+    failure = None
+    transaction = storage.single_transaction() if storage.write_through else nullcontext()
+    try:
+        with transaction:
+            try:
+                for line in lines:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    command, *args = parse_input(line)
+                    result = execute_command(command, args, book)
+                    count += 1
+                    if storage.write_through:
+                        storage.write(book.pop_changes())
+                    if result == "EXIT":
+                        break
+                    elif result is not None:
+                        # Nobody is there to press Enter
+                        display(result, paged=False)
+                    else:
+                        print(unknown_command(command, suggester))
+            except BaseException as e:
+                # Raised again once the transaction is committed, so the commands before it keep their changes
+                failure = e
+            storage.write(book.pop_changes())
+    finally:
+        storage.close()
+    if failure is not None:
+        raise failure
+    return count
+
+
+def main(filename=DEFAULT_FILENAME):
     """Main function to run the assistant bot."""
-    book = load_data()
+    mark_phase("imports done")
+    storage = open_storage(filename)
+    wait_for_book = load_in_background(storage)
     suggester = CommandSuggester()
+    if sys.stdin.isatty():
+        # Tab completes commands, contact names, note IDs and tags
+        from completion import Completer, install
+
+        install(Completer(wait_for_book))
     
     print(f"{Fore.BLUE}Welcome to the assistant bot!")
+    mark_phase("first prompt")
     
-    while True:
-        user_input = input("Enter a command: ").strip()
+    # The changes queued for the autosave thread are written however the loop ends
+    try:
+        while True:
+            try:
+                user_input = input("Enter a command: ").strip()
+            except (EOFError, KeyboardInterrupt):
+                # Ctrl+D or Ctrl+C at the prompt close the bot like "exit"
+                print(f"\n{Fore.BLUE}Good bye!")
+                break
+        
+            if not user_input:
+                continue
+        
+            command, *args = parse_input(user_input)
         
-        if not user_input:
-            continue
+            # Import the command's module while the book may still be loading
+            get_handler(command)
+            book = wait_for_book()
         
-        command, *args = parse_input(user_input)
+            # Try to execute the command
+            result = execute_command(command, args, book)
+            mark_phase(f"'{command}' done")
         
-        # Try to execute the command
-        result = execute_command(command, args, book)
+            # Persist only the contacts changed by this command
+            storage.write(book.pop_changes())
         
-        if result == "EXIT":
-            print(f"{Fore.BLUE}Good bye!")
-            save_data(book)
-            break
-        elif result is not None:
-            # Command executed successfully
-            print(result)
-        else:
-            # Command not recognized, so try to suggest the closest command
-            suggestion = suggester.suggest_command(command)
-            
-            if suggestion:
-                print(f"{Fore.YELLOW}Command '{command}' not found. Maybe you meant '{Fore.CYAN}{suggestion}{Fore.YELLOW}'?")
-            # If no suggestion is found, print an error message
+            if result == "EXIT":
+                print(f"{Fore.BLUE}Good bye!")
+                break
+            elif result is not None:
+                # Command executed successfully
+                display(result)
             else:
-                print(f"{Fore.RED}Invalid command. Type 'help' to see available commands.")
+                # Command not recognized, so try to suggest the closest command
+                print(unknown_command(command, suggester))
+    finally:
+        try:
+            storage.close()
+        except OSError as e:
+            print(f"{Fore.RED}Could not save the address book: {e}")
 
 
 if __name__ == "__main__":
-    main()
+    arguments = parse_arguments()
+    if arguments.confirm:
+        set_auto_answer(arguments.confirm == "yes")
+    if arguments.startup_profile:
+        print("\n".join(profile_startup(arguments.file)))
+    elif arguments.migrate_from:
+        count = migrate_pickle(arguments.migrate_from, arguments.file)
+        print(f"{Fore.GREEN}Migrated {count} contacts to {arguments.file}")
+    elif arguments.script:
+        # Nothing is there to answer questions in the middle of a script
+        if not arguments.confirm:
+            set_auto_answer(False)
+        script = sys.stdin if arguments.script == "-" else open(arguments.script, encoding="utf-8")
+        started = time.perf_counter()
+        with script:
+            count = run_script(script, arguments.file)
+        elapsed = time.perf_counter() - started
+        # On stderr, so that the output of the commands can be piped on its own
+        print(f"{count} commands in {elapsed:.3f} s ({count / max(elapsed, 1e-9):.0f} commands/s)", file=sys.stderr)
+    else:
+        main(arguments.file)
@@ -0,0 +1,356 @@
+"""
+Memory-mapped binary snapshot format with lazy per-record decoding.
+
+Layout of a .snap file:
+    header   magic, record count, offsets of the three indexes
+    records  one blob per contact: name length, keys length, data length,
+             name, keys (phone numbers and note IDs), pickled Record
+    index    one blob offset per contact, sorted by name
+    phones   (blob offset, position in the keys) per phone number, sorted by number
+    notes    the same per note ID, sorted by ID
+
+Records are written in address book order, so iterating over names is
+a sequential walk over the blobs, and a name is found by binary search
+over the index. Phone numbers and note IDs are found by binary search
+too, so only the Record that is asked for gets unpickled.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+
+from classes.address_book import AddressBook
+from classes.lazy_records import LazyRecords
+from classes.note import new_note_id
+from classes.record import Record
+from journal import Journal, read_journal, write_atomically
+
+MAGIC = b"ABSNAP02"
+HEADER = struct.Struct("<8sQQQQ")
+BLOB_HEADER = struct.Struct("<III")
+INDEX_ENTRY = struct.Struct("<Q")
+KEY_ENTRY = struct.Struct("<QI")
+# Snapshots written before the phone and note ID indexes, read without them
+MAGIC_V1 = b"ABSNAP01"
+HEADER_V1 = struct.Struct("<8sQQ")
+BLOB_HEADER_V1 = struct.Struct("<II")
+
+PHONES, NOTE_IDS = 0, 1
+# Changed records SnapshotAddressBook checks one by one before it builds the full phone index
+SCANNED_CHANGES = 1000
+
+
+def record_keys(record: Record) -> tuple:
+    """The phone numbers and note IDs of a record, stored next to it in the snapshot."""
+    return [phone.value for phone in record.phones], [note.id for note in record.notes]
+
+
+def _encode_keys(keys) -> bytes:
+    phones, note_ids = keys
+    return (" ".join(phones) + "\0" + " ".join(note_ids)).encode("utf-8")
+
+
+def _decode_keys(data) -> tuple:
+    phones, note_ids = data.decode("utf-8").split("\0")
+    return phones.split(), note_ids.split()
+
+
+def _write_key_index(f, entries):
+    entries.sort()
+    offset = f.tell()
+    for _, blob_offset, position in entries:
+        f.write(KEY_ENTRY.pack(blob_offset, position))
+    return offset
+
+
+def write_snapshot(f, blobs):
+    """
+    Write a snapshot to a binary file from (name, keys, pickled record) triples in book order,
+    keys as returned by record_keys.
+
+    Returns the number of records written.
+    """
+    index = []
+    keys_index = ([], [])
+    f.write(HEADER.pack(MAGIC, 0, 0, 0, 0))
+    for name, keys, data in blobs:
+        key = name.encode("utf-8")
+        offset = f.tell()
+        index.append((key, offset))
+        for kind in (PHONES, NOTE_IDS):
+            keys_index[kind].extend((value, offset, position) for position, value in enumerate(keys[kind]))
+        encoded = _encode_keys(keys)
+        f.write(BLOB_HEADER.pack(len(key), len(encoded), len(data)))
+        f.write(key)
+        f.write(encoded)
+        f.write(data)
+
+    index.sort()
+    index_offset = f.tell()
+    for _, offset in index:
+        f.write(INDEX_ENTRY.pack(offset))
+    phones_offset = _write_key_index(f, keys_index[PHONES])
+    notes_offset = _write_key_index(f, keys_index[NOTE_IDS])
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, len(index), index_offset, phones_offset, notes_offset))
+    f.seek(0, os.SEEK_END)
+    return len(index)
+
+
+class SnapshotRecords(LazyRecords):
+    """Records of a .snap file, unpickled from the memory map on first access."""
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = self._map[:len(MAGIC)]
+        if magic == MAGIC:
+            _, self._count, self._index_offset, phones_offset, notes_offset = HEADER.unpack_from(self._map, 0)
+            self._records_offset = HEADER.size
+            # Where the phone and note ID indexes start and end
+            self._key_indexes = ((phones_offset, notes_offset), (notes_offset, len(self._map)))
+        elif magic == MAGIC_V1:
+            _, self._count, self._index_offset = HEADER_V1.unpack_from(self._map, 0)
+            self._records_offset = HEADER_V1.size
+            self._key_indexes = None
+        else:
+            self._map.close()
+            raise ValueError(f"{path} is not an address book snapshot")
+
+    @property
+    def has_keys(self) -> bool:
+        """True if the snapshot stores phone numbers and note IDs (it was not written by an older version)."""
+        return self._key_indexes is not None
+
+    def _blob_bounds(self, offset):
+        """Where the name, keys and data of the blob at offset start, and where the blob ends."""
+        if self.has_keys:
+            name_len, keys_len, data_len = BLOB_HEADER.unpack_from(self._map, offset)
+            name_start = offset + BLOB_HEADER.size
+        else:
+            name_len, data_len = BLOB_HEADER_V1.unpack_from(self._map, offset)
+            keys_len = 0
+            name_start = offset + BLOB_HEADER_V1.size
+        keys_start = name_start + name_len
+        data_start = keys_start + keys_len
+        return name_start, keys_start, data_start, data_start + data_len
+
+    def _blobs(self):
+        offset = self._records_offset
+        while offset < self._index_offset:
+            bounds = self._blob_bounds(offset)
+            yield bounds
+            offset = bounds[3]
+
+    def _key_at(self, offset) -> bytes:
+        name_start, keys_start, _, _ = self._blob_bounds(offset)
+        return self._map[name_start:keys_start]
+
+    def _keys_at(self, offset) -> tuple:
+        _, keys_start, data_start, _ = self._blob_bounds(offset)
+        return _decode_keys(self._map[keys_start:data_start])
+
+    def _find_offset(self, name):
+        key = name.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (offset,) = INDEX_ENTRY.unpack_from(self._map, self._index_offset + mid * INDEX_ENTRY.size)
+            mid_key = self._key_at(offset)
+            if mid_key == key:
+                return offset
+            if mid_key < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def _key_entry(self, kind, number):
+        """(value, blob offset) of entry number of the phone or note ID index."""
+        entry = self._key_indexes[kind][0] + number * KEY_ENTRY.size
+        offset, position = KEY_ENTRY.unpack_from(self._map, entry)
+        return self._keys_at(offset)[kind][position], offset
+
+    def _key_owners(self, kind, value) -> list[str]:
+        start, end = self._key_indexes[kind]
+        count = (end - start) // KEY_ENTRY.size
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_entry(kind, mid)[0] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        names = []
+        while lo < count:
+            key, offset = self._key_entry(kind, lo)
+            if key != value:
+                break
+            names.append(self._key_at(offset).decode("utf-8"))
+            lo += 1
+        return names
+
+    def phone_owners(self, phone: str) -> list[str]:
+        """Names of the stored records with this phone number, in book order."""
+        return self._key_owners(PHONES, phone)
+
+    def note_owners(self, note_id: str) -> list[str]:
+        """Names of the stored records with a note of this ID."""
+        return self._key_owners(NOTE_IDS, note_id)
+
+    def iter_keys(self):
+        """Yield (name, phone numbers, note IDs) of the stored records in book order."""
+        for name_start, keys_start, data_start, _ in self._blobs():
+            name = self._map[name_start:keys_start].decode("utf-8")
+            yield (name, *_decode_keys(self._map[keys_start:data_start]))
+
+    def iter_blobs(self):
+        """
+        Yield (name, keys, pickled record) triples in book order without unpickling them.
+        keys is None in snapshots written before keys were stored.
+        """
+        for name_start, keys_start, data_start, end in self._blobs():
+            name = self._map[name_start:keys_start].decode("utf-8")
+            keys = _decode_keys(self._map[keys_start:data_start]) if self.has_keys else None
+            yield name, keys, self._map[data_start:end]
+
+    def _load(self, name):
+        offset = self._find_offset(name)
+        if offset is None:
+            raise KeyError(name)
+        _, _, data_start, end = self._blob_bounds(offset)
+        return pickle.loads(self._map[data_start:end])
+
+    def _stored_entries(self):
+        for name_start, keys_start, data_start, end in self._blobs():
+            yield self._map[name_start:keys_start].decode("utf-8"), self._map[data_start:end]
+
+    def _decode(self, entry):
+        return pickle.loads(entry)
+
+    def _stored_names(self):
+        for name_start, keys_start, _, _ in self._blobs():
+            yield self._map[name_start:keys_start].decode("utf-8")
+
+    def _stored_contains(self, name) -> bool:
+        return self._find_offset(name) is not None
+
+    def _stored_len(self) -> int:
+        return self._count
+
+    def close(self):
+        self._map.close()
+
+
+class SnapshotAddressBook(AddressBook):
+    """
+    AddressBook over SnapshotRecords that looks up phone numbers and note IDs
+    in the snapshot's indexes instead of unpickling every contact.
+    """
+
+    def __init__(self, records: SnapshotRecords):
+        super().__init__()
+        self.set_records(records)
+
+    def _owners(self, stored_names, has_key) -> list[str]:
+        """Stored owners of a key that are still current, then the changed records for which has_key is true."""
+        records = self.data
+        names = [name for name in stored_names if not records.is_changed(name)]
+        names.extend(record.name.value for record in records.changed_records() if has_key(record))
+        return names
+
+    def _phones(self) -> dict:
+        if self._phone_index is None and self.data.has_keys:
+            records = self.data
+            owners = [(name, phones) for name, phones, _ in records.iter_keys() if not records.is_changed(name)]
+            owners.extend((record.name.value, [p.value for p in record.phones]) for record in records.changed_records())
+            index = {}
+            for name, phones in owners:
+                for phone in phones:
+                    index.setdefault(phone, {})[name] = None
+            self._phone_index = index
+        return super()._phones()
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        # After many changes (an import) the index built from the stored keys is cheaper than scanning them
+        many_changes = len(self.data.changed_records()) > SCANNED_CHANGES
+        if self._phone_index is not None or not self.data.has_keys or many_changes:
+            return super().find_by_phone(phone)
+        names = self._owners(self.data.phone_owners(phone), lambda record: record.find_phone(phone))
+        return [self.data[name] for name in names]
+
+    def _note_owner(self, note_id: str):
+        names = self._owners(self.data.note_owners(note_id), lambda record: record.find_note_by_id(note_id))
+        return names[0] if names else None
+
+    def new_note_id(self) -> str:
+        if self._note_index is not None or not self.data.has_keys:
+            return super().new_note_id()
+        while True:
+            note_id = new_note_id()
+            if self._note_owner(note_id) is None:
+                return note_id
+
+    def find_note_by_id(self, note_id: str):
+        if self._note_index is not None or not self.data.has_keys:
+            return super().find_note_by_id(note_id)
+        name = self._note_owner(note_id)
+        record = self.data.get(name) if name else None
+        if record:
+            note = record.find_note_by_id(note_id)
+            if note:
+                return record, note
+        return None, None
+
+
+class SnapshotStorage(Journal):
+    """
+    Journaled storage whose snapshot is a memory-mapped .snap file.
+
+    Startup only maps the file, so its cost does not depend on the size
+    of the book. Compaction copies untouched records blob by blob
+    instead of unpickling the whole book.
+    """
+
+    def _load_snapshot(self):
+        if os.path.exists(self.filename):
+            return SnapshotAddressBook(SnapshotRecords(self.filename))
+        return AddressBook()
+
+    def _write_snapshot(self, book):
+        blobs = ((name, record_keys(record), pickle.dumps(record)) for name, record in book.data.items())
+        write_atomically(self.filename, lambda f: write_snapshot(f, blobs))
+
+    def _fold(self, segments):
+        changes = {}
+        for number in segments:
+            for name, record in read_journal(self._segment_path(number)):
+                changes[name] = record
+
+        blobs = self._merged_blobs(changes)
+        write_atomically(self.filename, lambda f: write_snapshot(f, blobs))
+        for number in segments:
+            os.remove(self._segment_path(number))
+
+    def _merged_blobs(self, changes):
+        if os.path.exists(self.filename):
+            old = SnapshotRecords(self.filename)
+            try:
+                for name, keys, data in old.iter_blobs():
+                    if name not in changes:
+                        if keys is None:
+                            # Only once, the snapshot is written with keys from now on
+                            keys = record_keys(pickle.loads(data))
+                        yield name, keys, data
+                    else:
+                        record = changes.pop(name)
+                        if record is not None:
+                            yield name, record_keys(record), pickle.dumps(record)
+            finally:
+                old.close()
+        # Contacts that were not in the old snapshot go to the end
+        for name, record in changes.items():
+            if record is not None:
+                yield name, record_keys(record), pickle.dumps(record)
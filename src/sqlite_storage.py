@@ -0,0 +1,417 @@
+"""SQLite storage backend that keeps the AddressBook API with indexed tables."""
+
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+from classes.address_book import AddressBook
+from classes.lazy_records import LazyRecords
+from classes.note import new_note_id
+from classes.phone import Phone
+from classes.record import Record
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    birthday TEXT,
+    email TEXT
+);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    phone TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS addresses (
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    address TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    note_id TEXT NOT NULL,
+    contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    note_row INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_email_nocase ON contacts(email COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_phones_contact ON phones(contact_id);
+CREATE INDEX IF NOT EXISTS idx_phones_phone ON phones(phone);
+CREATE INDEX IF NOT EXISTS idx_addresses_contact ON addresses(contact_id);
+CREATE INDEX IF NOT EXISTS idx_notes_contact ON notes(contact_id);
+CREATE INDEX IF NOT EXISTS idx_notes_note_id ON notes(note_id);
+CREATE INDEX IF NOT EXISTS idx_tags_note ON tags(note_row);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
+"""
+
+# SQL condition on a contacts row for every query field,
+# mirroring the substring rules of classes.query.Predicate.
+# py_lower is Python's str.lower, SQLite's lower() leaves non-ASCII letters (Іван, Київ) as they are
+SEARCH_CONDITIONS = {
+    "name": "instr(py_lower(name), ?) > 0",
+    "phone": "id IN (SELECT contact_id FROM phones WHERE instr(phone, ?) > 0)",
+    "address": "id IN (SELECT contact_id FROM addresses WHERE instr(py_lower(address), ?) > 0)",
+    "birthday": "instr(birthday, ?) > 0",
+    "email": "instr(py_lower(email), ?) > 0",
+}
+PHONE_CONDITION = "id IN (SELECT contact_id FROM phones WHERE phone = ?)"
+PHONE_PREFIX_CONDITION = "id IN (SELECT contact_id FROM phones WHERE phone >= ? AND phone < ?)"
+# Appended to a prefix, sorts after every text starting with it
+PREFIX_END = "\U0010ffff"
+
+
+def _lower(value):
+    return value.lower() if value is not None else None
+
+
+class SqliteStorage:
+    """
+    Stores contacts, phones, addresses, emails, notes and tags in SQLite tables.
+
+    Only changed contacts are written, and records are decoded one by one
+    when the address book touches them.
+    """
+
+    # Lookups of SqliteAddressBook read the tables, so changes are written before the next command
+    write_through = True
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._in_transaction = False
+        # The book may be loaded on a background thread (see main.load_in_background),
+        # the connection is handed over and never used by two threads at once
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        # SQLite commits are atomic on their own, WAL keeps them cheap enough for the REPL
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.create_function("py_lower", 1, _lower, deterministic=True)
+        self._conn.executescript(SCHEMA)
+
+    def load(self):
+        return SqliteAddressBook(self)
+
+    def load_names(self) -> dict:
+        rows = self._conn.execute("SELECT name FROM contacts ORDER BY id")
+        return {name: None for (name,) in rows}
+
+    def load_birthdays(self):
+        """(name, birthday) of every contact with a birthday, without loading the records."""
+        rows = self._conn.execute(
+            "SELECT name, birthday FROM contacts WHERE birthday IS NOT NULL ORDER BY id"
+        )
+        return [(name, datetime.strptime(birthday, "%d.%m.%Y").date()) for name, birthday in rows]
+
+    def load_record(self, name) -> Record:
+        row = self._conn.execute(
+            "SELECT id, birthday, email FROM contacts WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(name)
+        contact_id, birthday, email = row
+
+        record = Record(name)
+        for (phone,) in self._conn.execute(
+            "SELECT phone FROM phones WHERE contact_id = ? ORDER BY position", (contact_id,)
+        ):
+            record.phones.append(Phone.stored(phone))
+        for (address,) in self._conn.execute(
+            "SELECT address FROM addresses WHERE contact_id = ? ORDER BY position", (contact_id,)
+        ):
+            record.add_address(address)
+        if birthday:
+            record.add_birthday(birthday)
+        if email:
+            record.add_email(email)
+
+        notes = self._conn.execute(
+            "SELECT id, note_id, content FROM notes WHERE contact_id = ? ORDER BY position",
+            (contact_id,),
+        ).fetchall()
+        for note_row, note_id, content in notes:
+            note = record.add_note(content)
+            note.id = note_id
+            note.tags = [sys.intern(tag) for (tag,) in self._conn.execute(
+                "SELECT tag FROM tags WHERE note_row = ? ORDER BY position", (note_row,)
+            )]
+        return record
+
+    def save(self, book):
+        """Write every contact of the book."""
+        self.write(dict(book.data))
+
+    def write(self, changes: dict):
+        """Write changed contacts (name -> Record, or None if the contact was deleted)."""
+        if not changes:
+            return
+        if self._in_transaction:
+            self._write_changes(changes)
+        else:
+            with self._conn:
+                self._write_changes(changes)
+
+    def _write_changes(self, changes: dict):
+        for name, record in changes.items():
+            if record is None:
+                self._conn.execute("DELETE FROM contacts WHERE name = ?", (name,))
+            else:
+                self._write_record(record)
+
+    @contextmanager
+    def single_transaction(self):
+        """Commit the writes made inside the block once at its end, or none of them if it fails."""
+        self._in_transaction = True
+        try:
+            with self._conn:
+                yield
+        finally:
+            self._in_transaction = False
+
+    def _write_record(self, record: Record):
+        birthday = record.birthday.value.strftime("%d.%m.%Y") if record.birthday else None
+        email = record.email.value if record.email else None
+        # Upsert keeps the contact id, so the contact keeps its position in the book
+        self._conn.execute(
+            "INSERT INTO contacts (name, birthday, email) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET birthday = excluded.birthday, email = excluded.email",
+            (record.name.value, birthday, email),
+        )
+        (contact_id,) = self._conn.execute(
+            "SELECT id FROM contacts WHERE name = ?", (record.name.value,)
+        ).fetchone()
+
+        for table in ("phones", "addresses", "notes"):
+            self._conn.execute(f"DELETE FROM {table} WHERE contact_id = ?", (contact_id,))
+        self._conn.executemany(
+            "INSERT INTO phones (contact_id, position, phone) VALUES (?, ?, ?)",
+            [(contact_id, pos, p.value) for pos, p in enumerate(record.phones)],
+        )
+        self._conn.executemany(
+            "INSERT INTO addresses (contact_id, position, address) VALUES (?, ?, ?)",
+            [(contact_id, pos, a.value) for pos, a in enumerate(record.addresses)],
+        )
+        for pos, note in enumerate(record.notes):
+            cursor = self._conn.execute(
+                "INSERT INTO notes (note_id, contact_id, position, content) VALUES (?, ?, ?, ?)",
+                (note.id, contact_id, pos, note.content),
+            )
+            self._conn.executemany(
+                "INSERT INTO tags (note_row, position, tag) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, tag_pos, tag) for tag_pos, tag in enumerate(note.tags)],
+            )
+
+    def _search_sql(self, predicates):
+        conditions = []
+        params = []
+        for predicate in predicates:
+            if predicate.prefix is not None:
+                conditions.append(PHONE_PREFIX_CONDITION)
+                params.extend((predicate.prefix, predicate.prefix + PREFIX_END))
+            elif predicate.field == "phone" and len(predicate.value) == 10 and predicate.value.isdigit():
+                # A full number can only match itself, which the phones index finds
+                conditions.append(PHONE_CONDITION)
+                params.append(predicate.value)
+            else:
+                conditions.append(SEARCH_CONDITIONS[predicate.field])
+                params.append(predicate.value)
+        sql = f"SELECT name FROM contacts WHERE {' AND '.join(conditions)} ORDER BY id"
+        return sql, params
+
+    def search(self, predicates) -> list[str]:
+        """Names of contacts matching every query predicate, SQLite plans the indexes."""
+        return [name for (name,) in self._conn.execute(*self._search_sql(predicates))]
+
+    def explain_search(self, predicates) -> list[str]:
+        sql, params = self._search_sql(predicates)
+        return [detail for *_, detail in self._conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    def find_phone_owners(self, phone: str) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT name FROM contacts WHERE id IN "
+            "(SELECT contact_id FROM phones WHERE phone = ?) ORDER BY id",
+            (phone,),
+        )
+        return [name for (name,) in rows]
+
+    def find_phone_prefix_owners(self, prefix: str, limit=None) -> list[str]:
+        # The phones index answers the range of phones starting with prefix
+        rows = self._conn.execute(
+            "SELECT c.name FROM phones p JOIN contacts c ON c.id = p.contact_id "
+            "WHERE p.phone >= ? AND p.phone < ? ORDER BY p.phone",
+            (prefix, prefix + PREFIX_END),
+        )
+        names = {}
+        for (name,) in rows:
+            names[name] = None
+            if limit is not None and len(names) >= limit:
+                break
+        return list(names)
+
+    def _prefix_values(self, table: str, column: str, prefix: str, limit=None) -> list[str]:
+        # The index on column answers the range of values starting with prefix
+        rows = self._conn.execute(
+            f"SELECT DISTINCT {column} FROM {table} WHERE {column} >= ? AND {column} < ? "
+            f"ORDER BY {column} LIMIT ?",
+            (prefix, prefix + PREFIX_END, -1 if limit is None else limit),
+        )
+        return [value for (value,) in rows]
+
+    def note_ids_with_prefix(self, prefix: str, limit=None) -> list[str]:
+        return self._prefix_values("notes", "note_id", prefix, limit)
+
+    def tags_with_prefix(self, prefix: str, limit=None) -> list[str]:
+        return self._prefix_values("tags", "tag", prefix, limit)
+
+    def count_phone_prefix(self, prefix: str) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(DISTINCT phone) FROM phones WHERE phone >= ? AND phone < ?",
+            (prefix, prefix + PREFIX_END),
+        ).fetchone()
+        return row[0]
+
+    def find_email_owners(self, email: str) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT name FROM contacts WHERE email = ? COLLATE NOCASE ORDER BY id", (email,)
+        )
+        return [name for (name,) in rows]
+
+    def find_note_owners(self) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT name FROM contacts WHERE id IN (SELECT contact_id FROM notes) ORDER BY id"
+        )
+        return [name for (name,) in rows]
+
+    def note_counts(self) -> list[tuple]:
+        rows = self._conn.execute(
+            "SELECT c.name, COUNT(n.id) FROM contacts c LEFT JOIN notes n ON n.contact_id = c.id "
+            "GROUP BY c.id"
+        )
+        return rows.fetchall()
+
+    def find_note_owner(self, note_id: str):
+        row = self._conn.execute(
+            "SELECT c.name FROM notes n JOIN contacts c ON c.id = n.contact_id "
+            "WHERE n.note_id = ? ORDER BY c.id LIMIT 1",
+            (note_id,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def tag_counts(self) -> dict:
+        rows = self._conn.execute("SELECT tag, COUNT(DISTINCT note_row) FROM tags GROUP BY tag")
+        return dict(rows)
+
+    def find_tag_owners(self, tag: str) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT name FROM contacts WHERE id IN "
+            "(SELECT n.contact_id FROM tags t JOIN notes n ON n.id = t.note_row WHERE t.tag = ?) "
+            "ORDER BY id",
+            (tag,),
+        )
+        return [name for (name,) in rows]
+
+    def close(self):
+        self._conn.close()
+
+
+class SqliteRecords(LazyRecords):
+    """Records of a SQLite address book, decoded on first access."""
+
+    def __init__(self, storage: SqliteStorage):
+        super().__init__()
+        self._storage = storage
+        self._names = storage.load_names()
+
+    def _load(self, name):
+        return self._storage.load_record(name)
+
+    def _stored_names(self):
+        return iter(list(self._names))
+
+    def _stored_contains(self, name) -> bool:
+        return name in self._names
+
+    def _stored_len(self) -> int:
+        return len(self._names)
+
+
+class SqliteAddressBook(AddressBook):
+    """AddressBook whose lookups run as indexed queries against SqliteStorage."""
+
+    def __init__(self, storage: SqliteStorage):
+        super().__init__()
+        self.storage = storage
+        self.set_records(SqliteRecords(storage))
+
+    def _records(self, names):
+        return [self.data[name] for name in names if name in self.data]
+
+    def iter_query(self, predicates):
+        # Records are decoded only when the caller gets to them
+        return (self.data[name] for name in self.storage.search(predicates) if name in self.data)
+
+    def explain_query(self, predicates) -> list[str]:
+        lines = ["Plan chosen by SQLite:"]
+        lines.extend(f"  {number}. {step}" for number, step in enumerate(self.storage.explain_search(predicates), 1))
+        return lines
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        return self._records(self.storage.find_phone_owners(phone))
+
+    def find_by_phone_prefix(self, prefix: str, limit=None) -> list[Record]:
+        return self._records(self.storage.find_phone_prefix_owners(prefix, limit))
+
+    def count_phone_prefix(self, prefix: str) -> int:
+        return self.storage.count_phone_prefix(prefix)
+
+    def find_by_email(self, email: str) -> list[Record]:
+        return self._records(self.storage.find_email_owners(email))
+
+    def _records_with_notes(self):
+        return self._records(self.storage.find_note_owners())
+
+    def _note_counts(self):
+        return ((name, count) for name, count in self.storage.note_counts() if name in self.data)
+
+    def _birthday_rows(self):
+        return self.storage.load_birthdays()
+
+    def new_note_id(self) -> str:
+        while True:
+            note_id = new_note_id()
+            if self.storage.find_note_owner(note_id) is None:
+                return note_id
+
+    def find_note_by_id(self, note_id: str):
+        name = self.storage.find_note_owner(note_id)
+        record = self.data.get(name) if name else None
+        if record:
+            note = record.find_note_by_id(note_id)
+            if note:
+                return record, note
+        return None, None
+
+    def tag_counts(self) -> dict:
+        return self.storage.tag_counts()
+
+    def complete_note_ids(self, prefix: str, limit=None) -> list[str]:
+        return self.storage.note_ids_with_prefix(prefix, limit)
+
+    def complete_tags(self, prefix: str, limit=None) -> list[str]:
+        return self.storage.tags_with_prefix(prefix.lower(), limit)
+
+    def find_all_notes_by_tag(self, tag: str):
+        results = []
+        for record in self._records(self.storage.find_tag_owners(tag.lower())):
+            notes = record.find_notes_by_tag(tag)
+            if notes:
+                results.append({
+                    'contact': record.name.value,
+                    'notes': notes
+                })
+        return results
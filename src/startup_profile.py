@@ -0,0 +1,69 @@
+"""
+Cold start profile for --startup-profile.
+
+Runs the bot once the way a script would (`python -X importtime main.py`
+with "exit" on stdin) and summarizes where the time went: the phases the
+child reports and its slowest imports. Only os, sys and time are
+imported here, they are loaded at interpreter startup anyway.
+"""
+
+import os
+import sys
+import time
+
+# Set in the profiled child, makes mark_phase report to stderr
+PHASES_VARIABLE = "ASSISTANT_STARTUP_PHASES"
+TOP_IMPORTS = 15
+
+_STARTED = time.perf_counter()
+
+
+def mark_phase(name: str):
+    """Report how long after main.py started a startup phase ended, in a profiled run."""
+    if os.environ.get(PHASES_VARIABLE):
+        elapsed = (time.perf_counter() - _STARTED) * 1000
+        # One write per line, print() would let the book loader thread cut in before the newline
+        sys.stderr.write(f"startup-phase\t{name}\t{elapsed:.1f}\n")
+        sys.stderr.flush()
+
+
+def _parse(stderr: str):
+    """(imports as (cumulative us, self us, module), phases as (name, ms)) from the child's stderr."""
+    imports = []
+    phases = []
+    for line in stderr.splitlines():
+        if line.startswith("startup-phase\t"):
+            _, name, elapsed = line.split("\t")
+            phases.append((name, float(elapsed)))
+        elif line.startswith("import time:"):
+            own, cumulative, module = line[len("import time:"):].split("|")
+            if own.strip().isdigit():
+                imports.append((int(cumulative), int(own), module.strip()))
+    return imports, phases
+
+
+def profile_startup(filename: str, top=TOP_IMPORTS) -> list[str]:
+    """Lines describing a cold start of the bot on filename that runs only `exit`."""
+    import subprocess
+
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    env = dict(os.environ, **{PHASES_VARIABLE: "1"})
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", main_path, "--file", filename],
+        input="exit\n", capture_output=True, text=True, env=env,
+    )
+    wall = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        return [f"Profiled run failed with exit code {completed.returncode}:", completed.stderr.strip()]
+
+    imports, phases = _parse(completed.stderr)
+    lines = [f"Cold start running 'exit' on {filename}: {wall:.1f} ms wall time"]
+    lines.append("Phases, ms after main.py started:")
+    lines.extend(f"  {elapsed:8.1f}  {name}" for name, elapsed in phases)
+    total = sum(own for _, own, _ in imports) / 1000
+    lines.append(f"Imports: {len(imports)} modules, {total:.1f} ms")
+    lines.append(f"Slowest {top} imports (cumulative ms, self ms):")
+    for cumulative, own, module in sorted(imports, reverse=True)[:top]:
+        lines.append(f"  {cumulative / 1000:8.1f} {own / 1000:8.1f}  {module}")
+    return lines
@@ -0,0 +1,170 @@
+import pickle
+import random
+
+import pytest
+
+from classes.address_book import AddressBook
+from classes.query import Predicate
+from classes.record import Record
+
+TAGS = ["work", "home", "family", "urgent"]
+
+
+def ties_sorted(items, key):
+    """items in their order, but sorted among neighbours with the same key, whose order is arbitrary."""
+    result = []
+    for item in items:
+        if result and key(result[-1][-1]) == key(item):
+            result[-1].append(item)
+        else:
+            result.append([item])
+    return [sorted(group, key=repr) for group in result]
+
+
+def birthday_key(book, name):
+    birthday = book.data[name].birthday
+    return birthday.value.strftime("%d.%m") if birthday else None
+
+
+def snapshot_of(book):
+    """Answers of every index of the book, in a comparable form."""
+    names = lambda records: sorted(r.name.value for r in records)
+    phones = {p.value for r in book.data.values() for p in r.phones} | {"0000000000"}
+    emails = {r.email.value for r in book.data.values() if r.email} | {"nobody@example.com"}
+    note_ids = [n.id for r in book.data.values() for n in r.notes] + ["ffffffff"]
+    return {
+        "phones": {phone: names(book.find_by_phone(phone)) for phone in phones},
+        "emails": {email: names(book.find_by_email(email.upper())) for email in emails},
+        "prefixes": {p: names(book.find_by_phone_prefix(p)) for p in ["05", "050", "0501", "09"]},
+        "prefix counts": {p: book.count_phone_prefix(p) for p in ["05", "050", "09"]},
+        "notes": {i: (lambda found: (found[0] and found[0].name.value, found[1] and found[1].content))(
+            book.find_note_by_id(i)) for i in note_ids},
+        "tags": book.tag_counts(),
+        "notes by tag": {t: sorted((e["contact"], len(e["notes"])) for e in book.find_all_notes_by_tag(t))
+                         for t in TAGS},
+        "search": ties_sorted(
+            [(r.name.value, n.id, round(score, 9)) for r, n, score in book.search_notes("meeting again", False)],
+            key=lambda item: item[2],
+        ),
+        "trigram name": names(book.query([Predicate("name", "ont")])),
+        "trigram address": names(book.query([Predicate("address", "street 1")])),
+        "case": {n.lower(): book.find(n.lower()).name.value for n in book.data},
+        "suggest": {n: book.suggest_names(n[:-1] + "x") for n in list(book.data)[:10]},
+        "complete names": book.complete_names("contact 1"),
+        "complete ids": book.complete_note_ids(""),
+        "complete tags": book.complete_tags(""),
+        "by name": list(book.iter_sorted("name")),
+        "name range": list(book.iter_sorted("name", "contact 2", "contact 3")),
+        "by notes": list(book.iter_sorted("notes")),
+        "by birthday": ties_sorted(book.iter_sorted("birthday"), key=lambda name: birthday_key(book, name)),
+        "birthdays": ties_sorted(book.get_birthdays_in_range(366), key=lambda item: item["birthday"][:5]),
+        "stats": book.birthday_stats(366, "month"),
+    }
+
+
+def new_record(rng, name):
+    record = Record(name)
+    record.add_phone(f"05{rng.randrange(10 ** 8):08d}")
+    if rng.random() < 0.5:
+        record.add_email(f"{name.replace(' ', '.').lower()}@example.com")
+    if rng.random() < 0.7:
+        record.add_birthday(f"{rng.randrange(1, 29):02d}.{rng.randrange(1, 13):02d}.19{rng.randrange(50, 99)}")
+    if rng.random() < 0.5:
+        record.add_address(f"Street {rng.randrange(100)}")
+    for _ in range(rng.randrange(3)):
+        note = record.add_note(rng.choice(["meeting tomorrow", "call back", "buy milk", "meeting notes"]))
+        note.add_tag(rng.choice(TAGS))
+    return record
+
+
+def mutate(rng, book, step):
+    names = list(book.data)
+    action = rng.random()
+    if action < 0.3 or not names:
+        book.add_record(new_record(rng, f"Contact {step}"))
+    elif action < 0.45:
+        book.delete(rng.choice(names))
+    elif action < 0.6:
+        # Replacing a contact with a new record under the same name
+        book.add_record(new_record(rng, rng.choice(names)))
+    else:
+        record = book.data[rng.choice(names)]
+        change = rng.randrange(6)
+        if change == 0:
+            record.edit_phone(record.phones[0].value, f"09{rng.randrange(10 ** 8):08d}")
+        elif change == 1:
+            record.add_phone(f"05{rng.randrange(10 ** 8):08d}")
+        elif change == 2:
+            record.add_note("meeting again").add_tag(rng.choice(TAGS))
+        elif change == 3 and record.notes:
+            note = rng.choice(record.notes)
+            if note.tags and rng.random() < 0.5:
+                record.remove_tag_from_note(note.id, note.tags[0])
+            else:
+                record.delete_note(note.id)
+        elif change == 4:
+            if record.birthday:
+                record.edit_birthday(f"{rng.randrange(1, 29):02d}.{rng.randrange(1, 13):02d}.1980")
+            else:
+                record.add_birthday("29.02.2000")
+        elif change == 5:
+            if record.email:
+                record.delete_email()
+            else:
+                record.add_email(f"new{step}@example.com")
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_indexes_match_a_fresh_build_after_changes(seed):
+    rng = random.Random(seed)
+    book = AddressBook()
+    for step in range(40):
+        book.add_record(new_record(rng, f"Contact {step}"))
+    # Build every index now, so that the changes below have to keep them up to date
+    snapshot_of(book)
+    for step in range(40, 400):
+        mutate(rng, book, step)
+        if step % 40 == 0:
+            # A copy built from the records alone
+            assert snapshot_of(book) == snapshot_of(pickle.loads(pickle.dumps(book)))
+    assert snapshot_of(book) == snapshot_of(pickle.loads(pickle.dumps(book)))
+
+
+def test_replaced_record_leaves_no_stale_entries():
+    book = AddressBook()
+    old = Record("Ann")
+    old.add_phone("0501111111")
+    old.add_email("ann@example.com")
+    old.add_note("meeting").add_tag("work")
+    book.add_record(old)
+    snapshot_of(book)
+
+    new = Record("Ann")
+    new.add_phone("0502222222")
+    book.add_record(new)
+    assert book.find_by_phone("0501111111") == []
+    assert book.find_by_phone("0502222222") == [new]
+    assert book.find_by_email("ann@example.com") == []
+    assert book.tag_counts() == {}
+    assert book.complete_note_ids("") == []
+    # Changes to the replaced record no longer reach the book's indexes
+    old.add_phone("0503333333")
+    assert book.find_by_phone("0503333333") == []
+
+
+def test_deleted_contact_leaves_no_stale_entries():
+    book = AddressBook()
+    record = Record("Bob")
+    record.add_phone("0501234567")
+    record.add_note("meeting").add_tag("home")
+    book.add_record(record)
+    snapshot_of(book)
+
+    assert book.delete("Bob")
+    assert book.find_by_phone("0501234567") == []
+    assert book.find_by_phone_prefix("050") == []
+    assert book.find("bob") is None
+    assert book.complete_names("b") == []
+    assert book.complete_tags("") == []
+    assert list(book.iter_sorted("notes")) == []
+    assert book.search_notes("meeting") == []
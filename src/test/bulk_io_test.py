@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from bulk_io import export_contacts, import_contacts
+from classes.address_book import AddressBook
+from classes.record import Record
+
+
+def import_text(tmp_path, filename, text, **options):
+    path = tmp_path / filename
+    path.write_text(text, encoding="utf-8")
+    book = AddressBook()
+    return book, import_contacts(book, str(path), **options)
+
+
+def test_csv_bad_rows_are_reported_and_the_rest_imported(tmp_path):
+    text = (
+        "name,phones,birthday,email,addresses\n"
+        "Ann,0501234567,01.02.1990,ann@example.com,Main St 1\n"
+        "Bob,123,,,\n"
+        f"Huge,0501234569,,,{'a' * 140000}\n"
+        "Carl,0501234568;0501234560,31.02.1990,,\n"
+        "Dan,0501234561,,,\n"
+    )
+    book, report = import_text(tmp_path, "book.csv", text)
+    assert (report.rows, report.imported, report.failed) == (5, 2, 3)
+    assert [line for line, _ in report.errors] == [3, 4, 5]
+    assert "field larger than field limit" in report.errors[1][1]
+    assert list(book.data) == ["Ann", "Dan"]
+    assert (tmp_path / "book.csv.errors.txt").read_text(encoding="utf-8").count("line ") == 3
+
+
+def test_jsonl_bad_rows_are_reported_and_the_rest_imported(tmp_path):
+    lines = [
+        '{"name": "Ann", "phones": ["0501234567"]}',
+        "{not json",
+        "[1, 2]",
+        '{"name": 5, "phones": "0501234568"}',
+        '{"name": "Bob", "birthday": 19900101}',
+        '{"name": {"first": "Carl"}}',
+        '{"name": "Dan", "phones": 501234569}',
+        "",
+        '{"name": "Eve", "phones": ["0501234560"], "email": null}',
+    ]
+    book, report = import_text(tmp_path, "book.jsonl", "\n".join(lines) + "\n")
+    assert report.imported == 3
+    assert [line for line, _ in report.errors] == [2, 3, 5, 6, 7]
+    assert report.failed == 5
+    assert list(book.data) == ["Ann", "5", "Eve"]
+
+
+def test_existing_contacts_are_merged(tmp_path):
+    book = AddressBook()
+    record = Record("Ann")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    path = tmp_path / "book.csv"
+    path.write_text("name,phones,birthday,email,addresses\nAnn,0507654321,,ann@example.com,\n", encoding="utf-8")
+    import_contacts(book, str(path))
+    assert [p.value for p in book.data["Ann"].phones] == ["0501234567", "0507654321"]
+    assert book.find_by_email("ann@example.com") == [book.data["Ann"]]
+
+
+@pytest.mark.parametrize("batch_size", [1, 1000])
+def test_phones_of_other_contacts_are_refused(tmp_path, batch_size):
+    book = AddressBook()
+    record = Record("Ann")
+    record.add_phone("0501234567")
+    book.add_record(record)
+    path = tmp_path / "book.csv"
+    path.write_text(
+        "name,phones,birthday,email,addresses\n"
+        "Ann,0501234567;0501111111,,,\n"
+        "Bob,0509999999;0501234567,,,\n"
+        "Carl,0502222222,,,\n"
+        "Dan,0502222222,,,\n"
+        "Carl,0503333333,,,\n",
+        encoding="utf-8",
+    )
+    report = import_contacts(book, str(path), batch_size=batch_size)
+    assert (report.rows, report.imported, report.failed) == (5, 3, 2)
+    assert report.errors == [
+        (3, "Phone number 0501234567 already belongs to Ann"),
+        (5, "Phone number 0502222222 already belongs to Carl"),
+    ]
+    assert list(book.data) == ["Ann", "Carl"]
+    assert [p.value for p in book.data["Carl"].phones] == ["0502222222", "0503333333"]
+    assert book.find_by_phone("0509999999") == []
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl", "vcf"])
+def test_export_and_import_round_trip(tmp_path, extension):
+    book = AddressBook()
+    for i, name in enumerate(["Ann", "Іван Петренко", "Bob"]):
+        record = Record(name)
+        record.add_phone(f"050123456{i}")
+        record.add_phone(f"099123456{i}")
+        record.add_birthday(f"0{i + 1}.03.1990")
+        record.add_address("Київ, Хрещатик 1")
+        record.add_email(f"user{i}@example.com")
+        book.add_record(record)
+    path = str(tmp_path / f"book.{extension}")
+    assert export_contacts(book, path) == 3
+
+    copy = AddressBook()
+    report = import_contacts(copy, path)
+    assert (report.imported, report.failed) == (3, 0)
+    assert [str(r) for r in copy.data.values()] == [str(r) for r in book.data.values()]
+
+
+def test_jsonl_export_writes_one_object_per_contact(tmp_path):
+    book = AddressBook()
+    book.add_record(Record("Ann"))
+    path = tmp_path / "book.jsonl"
+    export_contacts(book, str(path))
+    assert [json.loads(line)["name"] for line in path.read_text(encoding="utf-8").splitlines()] == ["Ann"]
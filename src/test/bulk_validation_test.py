@@ -0,0 +1,63 @@
+import os
+
+from bulk_io import import_contacts
+from bulk_validation import resolve_workers, validate_rows
+from classes.address_book import AddressBook
+
+
+def make_rows(count):
+    for line in range(1, count + 1):
+        if line % 7 == 0:
+            yield line, ValueError(f"Invalid JSON at {line}")
+        elif line % 5 == 0:
+            yield line, {"name": f"Bad {line}", "phones": ["123"], "birthday": "", "email": "", "addresses": []}
+        else:
+            yield line, {
+                "name": f"Contact {line}", "phones": [f"05{line:08d}"], "birthday": "01.02.1990",
+                "email": "", "addresses": [],
+            }
+
+
+def summary(results):
+    return [(line, record and str(record), error) for line, record, error in results]
+
+
+def test_process_pool_gives_the_same_results_in_order():
+    expected = summary(validate_rows(make_rows(200), workers=1))
+    assert [line for line, _, _ in expected] == list(range(1, 201))
+    assert summary(validate_rows(make_rows(200), workers=3, chunk_size=16)) == expected
+
+
+def test_process_pool_reads_the_input_a_few_chunks_ahead():
+    consumed = 0
+
+    def rows():
+        nonlocal consumed
+        for row in make_rows(10000):
+            consumed += 1
+            yield row
+
+    results = validate_rows(rows(), workers=2, chunk_size=10)
+    next(results)
+    # Two chunks per worker in flight, plus the one being submitted
+    assert consumed <= 10 * (2 * 2 + 1)
+    results.close()
+
+
+def test_zero_workers_means_one_per_cpu():
+    assert resolve_workers(0) == (os.cpu_count() or 1)
+    assert resolve_workers(3) == 3
+
+
+def test_import_with_workers(tmp_path):
+    path = tmp_path / "book.csv"
+    lines = ["name,phones,birthday,email,addresses"]
+    lines += [f"Contact {i},05{i:08d},,,Street {i}" for i in range(300)]
+    lines.insert(100, "Bad,123,,,")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    book = AddressBook()
+    report = import_contacts(book, str(path), batch_size=64, workers=2)
+    assert (report.rows, report.imported, report.failed) == (301, 300, 1)
+    assert report.errors[0][0] == 101
+    assert list(book.data) == [f"Contact {i}" for i in range(300)]
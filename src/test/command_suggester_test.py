@@ -0,0 +1,63 @@
+import pytest
+
+from command_suggester import CommandSuggester
+from commands.registry import get_all_commands
+
+
+@pytest.fixture(scope="module")
+def suggester():
+    return CommandSuggester()
+
+
+@pytest.mark.parametrize("typo, command", [
+    ("ad", "add"),
+    ("ADD-NOTE", "add-note"),
+    ("add-noet", "add-note"),
+    ("shwo-phone", "show-phone"),
+    ("birthdys", "birthdays"),
+    ("  hepl ", "help"),
+    ("delete-adress", "delete-address"),
+    ("find-by-tga", "find-by-tag"),
+])
+def test_typos_suggest_the_intended_command(suggester, typo, command):
+    assert suggester.suggest_command(typo) == command
+
+
+@pytest.mark.parametrize("word", ["", "   ", "xyzzy", "completely-unrelated", "qq"])
+def test_nothing_close_suggests_nothing(suggester, word):
+    assert suggester.suggest_command(word) is None
+
+
+def test_suggestions_are_ranked_by_score(suggester):
+    suggestions = suggester.suggest("add-nta", limit=5)
+    assert suggestions == [("add-note", 0.75), ("add-tag", 0.71)]
+    assert suggester.suggest("hell") == [("hello", 0.8), ("help", 0.75)]
+    scores = [score for _, score in suggestions]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1 for score in scores)
+    assert suggester.suggest("help") == [("help", 1.0)]
+
+
+def test_limit(suggester):
+    assert suggester.suggest("hell", limit=1) == [("hello", 0.8)]
+    assert suggester.suggest_command("hell") == "hello"
+
+
+@pytest.mark.parametrize("max_distance", [1, 2])
+def test_matches_a_brute_force_edit_distance(max_distance):
+    def distance(a, b):
+        # Edits are insertions, deletions, substitutions and swaps of neighbouring letters
+        d = [[i + j if not i or not j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+        for i in range(1, len(a) + 1):
+            for j in range(1, len(b) + 1):
+                d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+        return d[-1][-1]
+
+    commands = get_all_commands()
+    suggester = CommandSuggester(commands, max_distance=max_distance)
+    for word in ["ad", "hell", "exti", "add-nta", "shwo-phone", "remove-tga", "chnage-email", "delete-ntoes", "all-sorted"]:
+        limit = 1 if len(word) <= 4 else max_distance
+        expected = {command for command in commands if distance(word, command) <= limit}
+        assert {command for command, _ in suggester.suggest(word, limit=len(commands))} == expected
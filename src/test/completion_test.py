@@ -0,0 +1,82 @@
+import pytest
+
+from classes.address_book import AddressBook
+from classes.record import Record
+from completion import Completer
+from sqlite_storage import SqliteStorage
+
+
+def make_book():
+    book = AddressBook()
+    for name in ["Ann", "anna", "Andrew Smith", "Bob", "Іван"]:
+        book.add_record(Record(name))
+    book.data["Ann"].add_note("first").add_tag("Work")
+    book.data["Ann"].add_note("second").add_tag("weekend")
+    book.data["Bob"].add_note("third").add_tag("family")
+    return book
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def book(request, tmp_path):
+    book = make_book()
+    if request.param == "memory":
+        yield book
+        return
+    storage = SqliteStorage(str(tmp_path / "book.db"))
+    storage.save(book)
+    yield storage.load()
+    storage.close()
+
+
+def candidates(completer, line):
+    """Completions of the last word of line, as readline asks for them."""
+    begidx = line.rfind(" ") + 1
+    return completer.candidates(line, begidx, line[begidx:])
+
+
+def test_commands():
+    completer = Completer(lambda: pytest.fail("commands complete without the book"))
+    assert candidates(completer, "add-") == ["add-address", "add-birthday", "add-email", "add-note", "add-tag"]
+    assert candidates(completer, "SHOW-P") == ["show-phone"]
+    assert candidates(completer, "xyz") == []
+    # hello takes no arguments
+    assert candidates(completer, "hello ") == []
+
+
+def test_names(book):
+    completer = Completer(lambda: book)
+    # Case is ignored, and names with spaces cannot be typed as one argument
+    assert candidates(completer, "add-note an") == ["Ann", "anna"]
+    assert candidates(completer, "show-phone і") == ["Іван"]
+    assert candidates(completer, "show-phone ") == ["Ann", "anna", "Bob", "Іван"]
+    # Only the first argument of add-note is a name
+    assert candidates(completer, "add-note Ann so") == []
+
+
+def test_note_ids_and_tags(book):
+    completer = Completer(lambda: book)
+    ann_notes = sorted(note.id for note in book.find("Ann").notes)
+    all_notes = sorted(ann_notes + [note.id for note in book.find("Bob").notes])
+    assert candidates(completer, "delete-note Ann ") == ann_notes
+    assert candidates(completer, f"edit-note ann {ann_notes[0][:3]}") == [
+        note_id for note_id in ann_notes if note_id.startswith(ann_notes[0][:3])
+    ]
+    assert candidates(completer, "delete-note Nobody ") == []
+    assert candidates(completer, "add-tag ") == all_notes
+    assert candidates(completer, f"add-tag {all_notes[0]} w") == ["weekend", "work"]
+    assert candidates(completer, "find-all-by-tag F") == ["family"]
+
+
+def test_limit(book):
+    completer = Completer(lambda: book, limit=2)
+    assert candidates(completer, "show-phone ") == ["Ann", "anna"]
+    assert len(candidates(completer, "add-tag ")) == 2
+    assert len(candidates(completer, "")) == 2
+
+
+def test_readline_protocol(monkeypatch):
+    readline = pytest.importorskip("readline")
+    completer = Completer(lambda: make_book())
+    monkeypatch.setattr(readline, "get_line_buffer", lambda: "show-phone an")
+    monkeypatch.setattr(readline, "get_begidx", lambda: len("show-phone "))
+    assert [completer.complete("an", state) for state in range(3)] == ["Ann ", "anna ", None]
@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+from classes.phone import Phone
+from classes.record import Record
+
+
+@pytest.mark.parametrize("value", ["0501234567", "0000000001"])
+def test_phone_keeps_leading_zeros(value):
+    assert Phone(value).value == value
+    assert pickle.loads(pickle.dumps(Phone(value))).value == value
+
+
+@pytest.mark.parametrize("value", ["123", "05012345678", "050123456x", "١٢٣٤٥٦٧٨٩٠", "²²²²²²²²²²"])
+def test_phone_rejects_anything_but_ten_ascii_digits(value):
+    with pytest.raises(ValueError):
+        Phone(value)
+
+
+@pytest.mark.parametrize("value", ["١٢٣٤٥٦٧٨٩٠", "²²²²²²²²²²"])
+def test_phones_saved_by_older_versions_load_unchanged(value):
+    # Pickles written before fields had slots store the state as {"value": ...}
+    phone = Phone.__new__(Phone)
+    phone.__setstate__({"value": value})
+    assert phone.value == value
+    assert Phone.stored(value).value == value
+    assert pickle.loads(pickle.dumps(phone)).value == value
+
+
+def test_record_pickle_round_trip():
+    record = Record("Ann")
+    record.add_phone("0501234567")
+    record.add_birthday("29.02.2000")
+    record.add_email("ann@example.com")
+    record.add_address("Київ, Хрещатик 1")
+    record.add_note("call back").add_tag("Work")
+    copy = pickle.loads(pickle.dumps(record))
+    assert str(copy) == str(record)
+    assert [(n.id, n.content, n.tags) for n in copy.notes] == [(n.id, n.content, n.tags) for n in record.notes]
+    assert copy.notes[0]._owner is copy
@@ -0,0 +1,29 @@
+import pytest
+
+from classes.address_book import AddressBook
+from classes.record import Record
+from commands.note_commands import search_notes
+
+
+@pytest.fixture
+def book():
+    book = AddressBook()
+    for name, content in [("Ann", "buy milk"), ("Bob", "buy bread"), ("Eve", "milk and bread")]:
+        record = Record(name)
+        book.add_record(record)
+        record.add_note(content)
+    return book
+
+
+def found(result):
+    return sorted(line.split("] ")[1].split(":")[0] for line in result.splitlines()[1:])
+
+
+@pytest.mark.parametrize("operator", ["OR", "or", "Or"])
+def test_search_notes_or_in_any_case(book, operator):
+    assert found(search_notes(["milk", operator, "bread"], book)) == ["Ann", "Bob", "Eve"]
+
+
+@pytest.mark.parametrize("operator", ["AND", "and"])
+def test_search_notes_and_in_any_case(book, operator):
+    assert found(search_notes(["milk", operator, "bread"], book)) == ["Eve"]
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from classes.address_book import AddressBook
+from classes.query import parse_query
+from classes.record import Record
+
+
+def fields(predicates):
+    return [(p.field, p.value, p.prefix) for p in predicates]
+
+
+def test_parse_query():
+    assert fields(parse_query(["name:Jo", "and", "address:Baker", "Street", "AND", "phone:067*"])) == [
+        ("name", "jo", None), ("address", "baker street", None), ("phone", "067*", "067"),
+    ]
+    # The old `<field> <string>` form
+    assert fields(parse_query(["Address", "Київ,", "Хрещатик"])) == [("address", "київ, хрещатик", None)]
+    # A colon inside a value is part of it unless it follows a field name
+    assert fields(parse_query(["email:a:b"])) == [("email", "a:b", None)]
+
+
+@pytest.mark.parametrize("args", [
+    [],
+    ["name:jo", "OR", "name:ann"],
+    ["name:jo", "or", "name:ann"],
+    ["jo"],
+    ["colour:red"],
+    ["name:"],
+    ["name:jo", "AND", "email:"],
+])
+def test_parse_query_rejects(args):
+    with pytest.raises(ValueError):
+        parse_query(args)
+
+
+def make_book(size=300, seed=7):
+    rng = random.Random(seed)
+    book = AddressBook()
+    cities = ["London", "Київ", "Львів", "Paris", "Lisbon"]
+    for i in range(size):
+        record = Record(f"{rng.choice(['Ann', 'Bob', 'Олена', 'Joan', 'John'])} {i:03d}")
+        record.add_phone(f"0{rng.choice([50, 63, 67])}{rng.randrange(10 ** 7):07d}")
+        if i % 3:
+            record.add_address(f"{rng.choice(cities)}, street {rng.randrange(20)}")
+        if i % 4:
+            record.add_birthday(f"{rng.randrange(1, 29):02d}.{rng.randrange(1, 13):02d}.{rng.randrange(1950, 2010)}")
+        if i % 5:
+            record.add_email(f"user{i}@{rng.choice(['mail.com', 'example.org'])}")
+        book.add_record(record)
+    return book
+
+
+QUERIES = [
+    "name:jo",
+    "name:ол",
+    "name:олена AND address:київ",
+    "address:lisbon AND birthday:.12.",
+    "phone:067* AND name:ann",
+    "phone:067* AND phone:0671",
+    "email:example AND birthday:1980",
+    "birthday:01.",
+    "name:john AND address:street 1 AND email:mail",
+    "name:zzz AND phone:050*",
+]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_matches_a_full_scan(query):
+    book = make_book()
+    predicates = parse_query(query.split())
+    expected = sorted(r.name.value for r in book.data.values() if all(p.matches(r) for p in predicates))
+    # Results come in the order of the index the plan starts from
+    assert sorted(r.name.value for r in book.query(predicates)) == expected
+
+
+def test_exact_phone_query():
+    book = make_book()
+    phone = next(iter(book.data.values())).phones[0].value
+    found = book.query(parse_query([f"phone:{phone}"]))
+    assert [p.value for r in found for p in r.phones] == [phone]
+    assert "phone hash lookup" in book.explain_query(parse_query([f"phone:{phone}"]))[1]
+
+
+def test_plan_starts_from_the_most_selective_index():
+    book = make_book()
+    plan = book.explain_query(parse_query("name:олена AND address:lisbon".split()))
+    estimates = {
+        "trigram(name)": book._names().estimate("олена"),
+        "trigram(address)": book._addresses().estimate("lisbon"),
+    }
+    first = min(estimates, key=estimates.get)
+    assert plan[1].startswith(f"  1. {first} lookup")
+    assert len(plan) == 3
+
+
+def test_plan_scans_without_usable_index():
+    book = make_book()
+    plan = book.explain_query(parse_query(["birthday:01.", "AND", "email:mail"]))
+    assert plan[1] == f"  1. scan all {len(book)} contacts"
+    assert [line.split()[1] for line in plan[2:]] == ["filter", "filter"]
+
+
+def test_plan_filters_instead_of_intersecting_a_large_index():
+    book = make_book()
+    plan = book.explain_query(parse_query(["phone:0671", "AND", "name:oan"]))
+    # Short phone fragments have no index, they are checked on the candidates
+    assert "trigram(name) lookup" in plan[1]
+    assert plan[2].startswith("  2. filter phone:0671")
@@ -0,0 +1,58 @@
+import random
+from bisect import bisect_left, bisect_right
+
+from classes.skip_list import SkipList
+
+
+def check(skip_list, expected, rng):
+    assert len(skip_list) == len(expected)
+    assert list(skip_list) == expected
+    for _ in range(20):
+        key = rng.randrange(-5, 1005)
+        assert skip_list.bisect_left(key) == bisect_left(expected, key)
+        assert (key in skip_list) == (key in expected)
+        index = rng.randrange(0, len(expected) + 2)
+        assert list(skip_list.iter_from(index)) == expected[index:]
+        stop = rng.randrange(-5, 1005)
+        assert list(skip_list.iter_from(index, stop)) == expected[index:bisect_right(expected, stop)]
+
+
+def test_random_add_and_remove_match_a_sorted_list():
+    rng = random.Random(42)
+    initial = rng.sample(range(1000), 200)
+    skip_list = SkipList(initial)
+    expected = sorted(initial)
+    check(skip_list, expected, rng)
+    for step in range(2000):
+        key = rng.randrange(1000)
+        if rng.random() < 0.5:
+            skip_list.add(key)
+            if key not in expected:
+                expected.insert(bisect_left(expected, key), key)
+        else:
+            skip_list.remove(key)
+            if key in expected:
+                expected.remove(key)
+        if step % 50 == 0:
+            check(skip_list, expected, rng)
+    check(skip_list, expected, rng)
+
+
+def test_empty_and_duplicate_keys():
+    skip_list = SkipList([3, 1, 3, 2, 1])
+    assert list(skip_list) == [1, 2, 3]
+    skip_list.add(2)
+    assert len(skip_list) == 3
+    for key in [1, 2, 3, 4]:
+        skip_list.remove(key)
+    assert len(skip_list) == 0
+    assert list(skip_list) == []
+    assert list(skip_list.iter_from(0)) == []
+    assert skip_list.bisect_left(10) == 0
+
+
+def test_tuple_keys_as_used_by_the_sorted_views():
+    names = ["bob", "ann", "carl", "anna", "ann b"]
+    skip_list = SkipList((name, name.upper()) for name in names)
+    start = skip_list.bisect_left(("ann",))
+    assert [key[1] for key in skip_list.iter_from(start, ("ann\U0010ffff",))] == ["ANN", "ANN B", "ANNA"]
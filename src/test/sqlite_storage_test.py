@@ -0,0 +1,125 @@
+import pytest
+
+from classes.address_book import AddressBook
+from classes.query import parse_query
+from classes.record import Record
+from sqlite_storage import SqliteAddressBook, SqliteStorage
+
+CONTACTS = [
+    ("Ann Smith", ["0501234567", "0671234567"], "01.02.1990", "Ann@Example.com", ["Baker Street 221b"]),
+    ("Іван Петренко", ["0507654321"], "15.08.1985", None, ["Київ, Хрещатик 1"]),
+    ("Bob", [], None, "bob@example.com", ["Львів, Ринок 5", "London"]),
+    ("Émile", ["0679999999"], "29.02.2000", None, []),
+]
+
+
+def make_book():
+    book = AddressBook()
+    for name, phones, birthday, email, addresses in CONTACTS:
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        if birthday:
+            record.add_birthday(birthday)
+        if email:
+            record.add_email(email)
+        for address in addresses:
+            record.add_address(address)
+        book.add_record(record)
+    book.data["Ann Smith"].add_note("call back tomorrow").add_tag("Work")
+    book.data["Іван Петренко"].add_note("день народження").add_tag("сім'я")
+    return book
+
+
+def describe(book):
+    return [
+        (str(record), [(note.id, note.content, note.tags) for note in record.notes])
+        for record in book.data.values()
+    ]
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """An in-memory book and the same contacts saved to SQLite and opened again."""
+    book = make_book()
+    filename = str(tmp_path / "book.db")
+    storage = SqliteStorage(filename)
+    storage.save(book)
+    storage.close()
+    storage = SqliteStorage(filename)
+    yield book, storage, storage.load()
+    storage.close()
+
+
+def test_round_trip(stored):
+    book, _, loaded = stored
+    assert isinstance(loaded, SqliteAddressBook)
+    assert describe(loaded) == describe(book)
+
+
+def test_changes_are_written_incrementally(stored):
+    _, storage, loaded = stored
+    loaded.find("Bob").add_phone("0631112233")
+    loaded.find("Ann Smith").notes[0].edit("call back on Monday")
+    loaded.delete("Émile")
+    new = Record("Zoe")
+    new.add_phone("0501111111")
+    loaded.add_record(new)
+    storage.write(loaded.pop_changes())
+    expected = describe(loaded)
+    storage.close()
+
+    reopened_storage = SqliteStorage(storage.filename)
+    reopened = reopened_storage.load()
+    assert list(reopened.data) == ["Ann Smith", "Іван Петренко", "Bob", "Zoe"]
+    assert describe(reopened) == expected
+    reopened_storage.close()
+
+
+def test_failed_transaction_writes_nothing(stored):
+    _, storage, loaded = stored
+    loaded.find("Bob").add_phone("0631112233")
+    with pytest.raises(RuntimeError):
+        with storage.single_transaction():
+            storage.write(loaded.pop_changes())
+            raise RuntimeError("command failed")
+    assert storage.find_phone_owners("0631112233") == []
+
+
+@pytest.mark.parametrize("query", [
+    ["name:іван"],
+    ["name:ІВАН"],
+    ["address:київ"],
+    ["address:ЛЬВІВ"],
+    ["name:émile"],
+    ["email:EXAMPLE.COM"],
+    ["phone:067*"],
+    ["phone:0507654321"],
+    ["phone:1234"],
+    ["birthday:02."],
+    ["address:baker", "street", "AND", "phone:050*"],
+    ["name:o", "AND", "email:example"],
+    ["name", "ann"],
+])
+def test_search_matches_the_in_memory_book(stored, query):
+    book, _, loaded = stored
+    predicates = parse_query(query)
+    expected = [record.name.value for record in book.query(predicates)]
+    assert expected
+    assert [record.name.value for record in loaded.query(predicates)] == expected
+
+
+def test_lookups(stored):
+    book, _, loaded = stored
+    assert [r.name.value for r in loaded.find_by_phone("0507654321")] == ["Іван Петренко"]
+    assert [r.name.value for r in loaded.find_by_phone_prefix("067")] == ["Ann Smith", "Émile"]
+    assert loaded.count_phone_prefix("05") == 2
+    assert [r.name.value for r in loaded.find_by_email("ann@example.COM")] == ["Ann Smith"]
+
+    note = book.data["Іван Петренко"].notes[0]
+    record, found = loaded.find_note_by_id(note.id)
+    assert (record.name.value, found.content) == ("Іван Петренко", "день народження")
+    assert loaded.find_note_by_id("00000000") == (None, None)
+    assert loaded.new_note_id() not in {n.id for r in book.data.values() for n in r.notes}
+    assert loaded.tag_counts() == {"work": 1, "сім'я": 1}
+    assert [found["contact"] for found in loaded.find_all_notes_by_tag("WORK")] == ["Ann Smith"]
@@ -0,0 +1,281 @@
+import gc
+import os
+import pickle
+
+import pytest
+
+from classes.address_book import AddressBook
+from classes.record import Record
+from journal import Journal, read_journal
+from snapshot_storage import (
+    BLOB_HEADER_V1, HEADER_V1, INDEX_ENTRY, MAGIC_V1, SnapshotAddressBook, SnapshotRecords, SnapshotStorage,
+    record_keys, write_snapshot,
+)
+
+
+def make_record(name, phone, note=None):
+    record = Record(name)
+    record.add_phone(phone)
+    if note:
+        record.add_note(note).add_tag("work")
+    return record
+
+
+def describe(book):
+    """Everything saved about the contacts, in book order."""
+    return [
+        (name, [p.value for p in record.phones], [(n.id, n.content, n.tags) for n in record.notes])
+        for name, record in book.data.items()
+    ]
+
+
+@pytest.fixture(params=[Journal, SnapshotStorage], ids=["pickle", "snapshot"])
+def storage_class(request):
+    return request.param
+
+
+def path_for(tmp_path, storage_class):
+    return str(tmp_path / ("book.snap" if storage_class is SnapshotStorage else "book.pkl"))
+
+
+def test_round_trip_through_journal_and_compaction(tmp_path, storage_class):
+    filename = path_for(tmp_path, storage_class)
+    storage = storage_class(filename, segment_size=3, compact_segments=2)
+    book = storage.load()
+    for i in range(10):
+        book.add_record(make_record(f"Contact {i}", f"050000000{i}", note=f"note {i}"))
+        storage.write(book.pop_changes())
+    book.delete("Contact 3")
+    book.find("Contact 5").edit_phone("0500000005", "0991234567")
+    storage.write(book.pop_changes())
+    storage.close()
+
+    reopened = storage_class(filename)
+    loaded = reopened.load()
+    reopened.close()
+    assert describe(loaded) == describe(book)
+    assert loaded.find_by_phone("0991234567")[0].name.value == "Contact 5"
+
+
+def test_full_save_drops_the_journal(tmp_path, storage_class):
+    filename = path_for(tmp_path, storage_class)
+    storage = storage_class(filename)
+    book = storage.load()
+    book.add_record(make_record("Ann", "0501234567"))
+    storage.write(book.pop_changes())
+    storage.save(book)
+    storage.close()
+
+    assert [name for name in os.listdir(tmp_path) if ".journal." in name] == []
+    reopened = storage_class(filename)
+    assert describe(reopened.load()) == describe(book)
+    reopened.close()
+
+
+@pytest.mark.parametrize("cut", [1, 5, 20])
+def test_truncated_last_journal_entry_is_skipped(tmp_path, storage_class, cut):
+    filename = path_for(tmp_path, storage_class)
+    storage = storage_class(filename)
+    book = storage.load()
+    for i in range(3):
+        book.add_record(make_record(f"Contact {i}", f"050000000{i}"))
+        storage.write(book.pop_changes())
+    storage.close()
+
+    segment = filename + ".journal.000001"
+    with open(segment, "r+b") as f:
+        f.truncate(os.path.getsize(segment) - cut)
+    assert [name for name, _ in read_journal(segment)] == ["Contact 0", "Contact 1"]
+
+    # read() leaves the journal alone, load() would fold it into the snapshot
+    loaded = storage_class(filename).read()
+    assert list(loaded.data) == ["Contact 0", "Contact 1"]
+
+
+def test_missing_files_load_an_empty_book(tmp_path, storage_class):
+    storage = storage_class(path_for(tmp_path, storage_class))
+    assert len(storage.load()) == 0
+    storage.close()
+
+
+def write_snap(path, book):
+    with open(path, "wb") as f:
+        return write_snapshot(f, ((name, record_keys(record), pickle.dumps(record)) for name, record in book.data.items()))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    book = AddressBook()
+    # Not in sorted order, the index has to sort them and iteration must not
+    for name in ["Zoe", "Ann", "Іван", "Bob", "Émile", "Carl"]:
+        book.add_record(make_record(name, "0501234567"))
+    path = str(tmp_path / "book.snap")
+    assert write_snap(path, book) == 6
+    records = SnapshotRecords(path)
+    yield book, records
+    records.close()
+
+
+def test_snapshot_records_iterate_in_book_order(snapshot):
+    book, records = snapshot
+    assert list(records) == list(book.data)
+    assert len(records) == 6
+    assert [name for name, _, _ in records.iter_blobs()] == list(book.data)
+    assert records.loaded_count() == 0
+
+
+def test_snapshot_records_look_up_by_name(snapshot):
+    book, records = snapshot
+    for name in book.data:
+        assert name in records
+        assert records[name].name.value == name
+    assert records.loaded_count() == 0
+    for missing in ["", "Aaron", "Zzz", "ann", "Carla"]:
+        assert missing not in records
+        with pytest.raises(KeyError):
+            records[missing]
+
+
+def test_snapshot_records_overlay_changes(snapshot):
+    _, records = snapshot
+    records["Dan"] = make_record("Dan", "0507654321")
+    del records["Bob"]
+    assert "Bob" not in records and "Dan" in records
+    assert len(records) == 6
+    assert list(records)[-1] == "Dan"
+    assert [name for name, _ in records.items()] == list(records)
+    assert [record.name.value for record in records.values()] == list(records)
+    with pytest.raises(KeyError):
+        records["Bob"]
+
+
+def test_snapshot_book_keeps_only_changed_records(snapshot):
+    _, records = snapshot
+    book = AddressBook()
+    book.set_records(records)
+    assert len(list(book.data.values())) == 6
+    assert records.loaded_count() == 0
+
+    ann = book.find("Ann")
+    # Records still in use are shared, not decoded twice
+    assert book.find("Ann") is ann and book.find_by_phone("0501234567")[0] is book.data["Zoe"]
+    ann.add_phone("0991234567")
+    del ann
+    gc.collect()
+    assert records.loaded_count() == 1
+    assert [p.value for p in book.find("Ann").phones] == ["0501234567", "0991234567"]
+
+
+def snapshot_book(tmp_path):
+    storage = SnapshotStorage(str(tmp_path / "book.snap"))
+    book = storage.load()
+    for i in range(20):
+        book.add_record(make_record(f"Contact {i}", f"05000000{i:02d}", note=f"note {i}"))
+    storage.save(book)
+    storage.close()
+    storage = SnapshotStorage(str(tmp_path / "book.snap"))
+    return storage, storage.load()
+
+
+def test_snapshot_book_finds_phones_and_notes_without_unpickling(tmp_path, monkeypatch):
+    storage, book = snapshot_book(tmp_path)
+    assert isinstance(book, SnapshotAddressBook)
+    note_ids = {name: record.notes[0].id for name, record in SnapshotRecords(storage.filename).items()}
+    decoded = []
+    monkeypatch.setattr(book.data, "_decode", decoded.append)
+    load = book.data._load
+    monkeypatch.setattr(book.data, "_load", lambda name: decoded.append(name) or load(name))
+
+    assert [r.name.value for r in book.find_by_phone("0500000007")] == ["Contact 7"]
+    assert book.find_by_phone("0999999999") == []
+    record, note = book.find_note_by_id(note_ids["Contact 3"])
+    assert (record.name.value, note.content) == ("Contact 3", "note 3")
+    assert book.find_note_by_id("00000000") == (None, None)
+    assert book.new_note_id() not in note_ids.values()
+    assert decoded == ["Contact 7", "Contact 3"]
+    storage.close()
+
+
+def test_snapshot_book_lookups_see_changes(tmp_path):
+    storage, book = snapshot_book(tmp_path)
+    note_ids = {name: record.notes[0].id for name, record in SnapshotRecords(storage.filename).items()}
+    book.find("Contact 1").edit_phone("0500000001", "0991111111")
+    book.find("Contact 2").delete_note(note_ids["Contact 2"])
+    book.delete("Contact 3")
+    book.add_record(make_record("New", "0500000001"))
+    new_note = book.find("New").add_note("new note")
+
+    assert [r.name.value for r in book.find_by_phone("0500000001")] == ["New"]
+    assert [r.name.value for r in book.find_by_phone("0991111111")] == ["Contact 1"]
+    assert book.find_by_phone("0500000003") == []
+    assert book.find_note_by_id(note_ids["Contact 2"]) == (None, None)
+    assert book.find_note_by_id(note_ids["Contact 3"]) == (None, None)
+    assert book.find_note_by_id(new_note.id)[0].name.value == "New"
+    assert book.find_note_by_id(note_ids["Contact 4"])[0].name.value == "Contact 4"
+    # The full phone index is built from the snapshot too
+    assert {phone: list(names) for phone, names in book._phones().items()} == {
+        phone.value: [name] for name, record in book.data.items() for phone in record.phones
+    }
+    storage.write(book.pop_changes())
+    storage.close()
+
+    # Compaction writes the keys of the changed contacts to the snapshot
+    reopened = SnapshotStorage(storage.filename)
+    reopened.load()
+    reopened.close()
+    records = SnapshotRecords(storage.filename)
+    assert records.phone_owners("0500000001") == ["New"] and records.phone_owners("0500000003") == []
+    assert records.note_owners(new_note.id) == ["New"] and records.note_owners(note_ids["Contact 2"]) == []
+    records.close()
+
+
+def test_snapshot_without_keys_is_read_and_upgraded(tmp_path):
+    # The layout of snapshots written before phone numbers and note IDs were stored
+    book = AddressBook()
+    for name in ["Ann", "Bob"]:
+        book.add_record(make_record(name, "0501234567" if name == "Ann" else "0507654321", note="hi"))
+    path = str(tmp_path / "book.snap")
+    with open(path, "wb") as f:
+        f.write(HEADER_V1.pack(MAGIC_V1, 0, 0))
+        offsets = []
+        for name, record in book.data.items():
+            offsets.append(f.tell())
+            data = pickle.dumps(record)
+            f.write(BLOB_HEADER_V1.pack(len(name), len(data)) + name.encode() + data)
+        index_offset = f.tell()
+        for offset in offsets:
+            f.write(INDEX_ENTRY.pack(offset))
+        f.seek(0)
+        f.write(HEADER_V1.pack(MAGIC_V1, len(offsets), index_offset))
+
+    storage = SnapshotStorage(path)
+    loaded = storage.load()
+    assert not loaded.data.has_keys
+    assert describe(loaded) == describe(book)
+    assert loaded.find_by_phone("0507654321")[0].name.value == "Bob"
+    loaded.find("Ann").add_phone("0991234567")
+    storage.write(loaded.pop_changes())
+    storage.close()
+
+    reopened = SnapshotStorage(path)
+    reopened.load()
+    reopened.close()
+    records = SnapshotRecords(path)
+    assert records.has_keys
+    assert records.phone_owners("0507654321") == ["Bob"] and records.phone_owners("0991234567") == ["Ann"]
+    records.close()
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    assert write_snap(path, AddressBook()) == 0
+    records = SnapshotRecords(path)
+    assert list(records) == [] and "Ann" not in records
+    records.close()
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "book.snap"
+    path.write_bytes(b"not a snapshot at all, just some bytes")
+    with pytest.raises(ValueError):
+        SnapshotRecords(str(path))